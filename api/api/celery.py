@@ -0,0 +1,44 @@
+"""Celery app for the ingest and maintenance tasks.
+
+Run a worker and beat with ``celery -A api worker`` and ``celery -A api beat``.
+The web processes never enqueue tasks, so they don't import this module.
+"""
+
+import os
+
+from celery import Celery
+from celery.schedules import crontab
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "api.settings")
+
+app = Celery("api")
+app.config_from_object("django.conf:settings", namespace="CELERY")
+app.autodiscover_tasks()
+
+# Imported once settings are configured, it reads them.
+from apps.carbon_intensity.schedules import settlement_period  # noqa: E402
+
+app.conf.beat_schedule = {
+    # Each settlement period is ingested once upstream publishes it.
+    "update-intensity": {
+        "task": "apps.carbon_intensity.tasks.update_intensity_data",
+        "schedule": settlement_period(),
+    },
+    "update-generation-mix": {
+        "task": "apps.carbon_intensity.tasks.update_generation_mix",
+        "schedule": settlement_period(),
+    },
+    # Catches up from the last stored period, so needn't be aligned.
+    "update-regional-generation-mix-hourly": {
+        "task": "apps.carbon_intensity.tasks.update_regional_generation_mix",
+        "schedule": 3600,
+    },
+    "ensure-intensity-partitions-daily": {
+        "task": "apps.carbon_intensity.tasks.ensure_intensity_partitions",
+        "schedule": crontab(hour=1, minute=15),
+    },
+    "apply-retention-daily": {
+        "task": "apps.carbon_intensity.tasks.apply_retention",
+        "schedule": crontab(hour=2, minute=15),
+    },
+}
@@ -1,11 +1,225 @@
-from django.http import HttpResponse
+import gzip
+import hashlib
 
+import brotli
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import patch_vary_headers
+
+from apps.core import warmup
+from apps.core.db_router import recently_written, replica_reads
+from apps.core.utils.data_versions import get_data_version
+
+
+class HybridMiddleware:
+    """
+    Base for middleware that runs natively under both WSGI and ASGI.
+
+    Any sync-only middleware would make Django hop every ASGI request onto a
+    thread, so subclasses implement ``__acall__`` alongside ``__call__``.
+    """
+
+    sync_capable = True
+    async_capable = True
 
-class HealthCheckMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
 
     def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.handle(request)
+
+    def handle(self, request):
+        raise NotImplementedError
+
+    async def __acall__(self, request):
+        raise NotImplementedError
+
+
+class HealthCheckMiddleware(HybridMiddleware):
+    """
+    ``/health`` is liveness: the process is up and serving. ``/ready`` is
+    readiness: 503 until the warm-up (``apps.core.warmup``) has succeeded.
+    """
+
+    def probe(self, request):
         if request.path == "/health":
             return HttpResponse("ok")
-        return self.get_response(request)
+        if request.path == "/ready":
+            if warmup.is_ready():
+                return HttpResponse("ready")
+            warmup.start_warm_up()
+            return JsonResponse(warmup.get_state(), status=503)
+        return None
+
+    def handle(self, request):
+        return self.probe(request) or self.get_response(request)
+
+    async def __acall__(self, request):
+        return self.probe(request) or await self.get_response(request)
+
+
+class ReplicaRoutingMiddleware(HybridMiddleware):
+    """
+    Lets GET/HEAD requests read from replicas, see ``apps.core.db_router``.
+    Streamed bodies are read under the same decision as the view.
+    """
+
+    def use_replicas(self, request) -> bool:
+        return (
+            bool(settings.DATABASE_REPLICAS)
+            and request.method in ("GET", "HEAD")
+            and not recently_written()
+        )
+
+    def _stream(self, content):
+        with replica_reads():
+            yield from content
+
+    def handle(self, request):
+        enabled = self.use_replicas(request)
+        with replica_reads(enabled):
+            response = self.get_response(request)
+        if enabled and response.streaming and not response.is_async:
+            response.streaming_content = self._stream(response.streaming_content)
+        return response
+
+    async def __acall__(self, request):
+        enabled = await sync_to_async(self.use_replicas)(request)
+        with replica_reads(enabled):
+            return await self.get_response(request)
+
+
+class RenderedResponseCacheMiddleware(HybridMiddleware):
+    """
+    Serve list endpoints from cached, already rendered response bytes.
+
+    Responses for the paths in ``settings.RESPONSE_CACHE_ROUTES`` are stored
+    once rendered, together with gzip and brotli encodings of the body. The
+    cache key covers the host, normalised path, query parameters and
+    ``Accept`` header plus the current version of every dataset the route
+    reads, so an ingest that bumps a version makes older entries unreachable.
+    Hits are returned before sessions, auth or the view run.
+    """
+
+    CACHED_HEADERS = ("Content-Type", "Vary", "Allow", "Link")
+
+    def handle(self, request):
+        versions = self._route_versions(request)
+        if versions is None:
+            return self.get_response(request)
+
+        cache_key = self._cache_key(request, versions)
+        entry = cache.get(cache_key)
+        if entry is not None:
+            return self._build_response(request, entry)
+
+        response = self.get_response(request)
+        if self._is_cacheable(response):
+            cache.set(
+                cache_key,
+                self._build_entry(response),
+                settings.RESPONSE_CACHE_TIMEOUT,
+            )
+        return response
+
+    async def __acall__(self, request):
+        versions = await sync_to_async(self._route_versions)(request)
+        if versions is None:
+            return await self.get_response(request)
+
+        cache_key = self._cache_key(request, versions)
+        entry = await cache.aget(cache_key)
+        if entry is not None:
+            return self._build_response(request, entry)
+
+        response = await self.get_response(request)
+        if self._is_cacheable(response):
+            await cache.aset(
+                cache_key,
+                self._build_entry(response),
+                settings.RESPONSE_CACHE_TIMEOUT,
+            )
+        return response
+
+    def _route_versions(self, request):
+        """Data versions for a cacheable request, or ``None`` to skip the cache."""
+        if request.method not in ("GET", "HEAD"):
+            return None
+        datasets = settings.RESPONSE_CACHE_ROUTES.get(request.path.rstrip("/") + "/")
+        if datasets is None:
+            return None
+        # The browsable API renders per user, leave it to the view.
+        if "text/html" in request.headers.get("Accept", "") and not request.GET.get(
+            "format"
+        ):
+            return None
+        return [get_data_version(name) for name in datasets]
+
+    def _cache_key(self, request, versions):
+        params = sorted(
+            (key, value)
+            for key, values in request.GET.lists()
+            for value in values
+            if value != ""
+        )
+        raw = repr(
+            (
+                request.get_host(),
+                request.path.rstrip("/") + "/",
+                params,
+                request.headers.get("Accept", ""),
+                versions,
+            )
+        )
+        return f"rendered_response_{hashlib.sha256(raw.encode()).hexdigest()}"
+
+    def _is_cacheable(self, response):
+        return (
+            response.status_code == 200
+            and not response.streaming
+            and not response.has_header("Content-Encoding")
+            and not response.cookies
+            and "private" not in response.get("Cache-Control", "")
+        )
+
+    def _build_entry(self, response):
+        body = response.content
+        bodies = {
+            "identity": body,
+            "gzip": gzip.compress(body, mtime=0),
+            "br": brotli.compress(body),
+        }
+        return {
+            "headers": {
+                header: response[header]
+                for header in self.CACHED_HEADERS
+                if response.has_header(header)
+            },
+            "bodies": bodies,
+        }
+
+    def _build_response(self, request, entry):
+        accepted = request.headers.get("Accept-Encoding", "")
+        encoding = next(
+            (
+                encoding
+                for encoding in ("br", "gzip")
+                if encoding in entry["bodies"] and encoding in accepted
+            ),
+            "identity",
+        )
+        response = HttpResponse(entry["bodies"][encoding])
+        for header, value in entry["headers"].items():
+            response[header] = value
+        if encoding != "identity":
+            response["Content-Encoding"] = encoding
+        response["Content-Length"] = str(len(response.content))
+        patch_vary_headers(response, ("Accept-Encoding",))
+        return response
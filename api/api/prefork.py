@@ -0,0 +1,237 @@
+"""Pre-fork worker management for the Bjoern server started by run.py.
+
+The master process loads Django, the static datasets and the region registry,
+opens the listening socket and then forks the workers, so they share those
+pages copy-on-write and accept from the same socket. The master only
+supervises:
+
+* a worker that exits (crashed, or recycled after too many requests or too
+  much memory growth) is replaced,
+* SIGHUP replaces the workers one at a time without dropping the socket,
+* SIGTERM/SIGINT stop the workers and exit.
+
+Workers are stopped with SIGINT, on which Bjoern leaves its event loop.
+"""
+
+import os
+import random
+import signal
+import sys
+import time
+import traceback
+from typing import Callable, Dict
+
+# How long a stopping worker may take to finish its request.
+GRACEFUL_TIMEOUT = 30
+# Workers exiting quicker than this after being started are failing to boot.
+MIN_WORKER_LIFETIME = 1
+
+
+def get_rss_mb() -> float:
+    """Resident set size of this process in MiB."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except (OSError, ValueError, IndexError):
+        import resource
+
+        # Peak rather than current RSS, KiB on Linux.
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def stop_worker():
+    os.kill(os.getpid(), signal.SIGINT)
+
+
+class _CloseHook:
+    """Response iterable calling ``callback`` once the server has closed it."""
+
+    def __init__(self, iterable, callback: Callable[[], None]):
+        self.iterable = iterable
+        self.callback = callback
+
+    def __iter__(self):
+        return iter(self.iterable)
+
+    def close(self):
+        try:
+            close = getattr(self.iterable, "close", None)
+            if close is not None:
+                close()
+        finally:
+            self.callback()
+
+
+class RecyclingApplication:
+    """
+    WSGI wrapper stopping its worker after the response that takes it past
+    ``max_requests`` (plus a random jitter) requests, or that grows its RSS by
+    more than ``max_rss_growth_mb``.
+
+    RSS growth is measured from the worker's first request, after warm-up:
+    a forked worker's RSS starts out at the size of the preloaded app, pages
+    it still shares with the master included.
+    """
+
+    def __init__(
+        self,
+        application,
+        max_requests: int = 0,
+        max_requests_jitter: int = 0,
+        max_rss_growth_mb: int = 0,
+        on_recycle: Callable[[], None] = stop_worker,
+    ):
+        self.application = application
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.max_rss_growth_mb = max_rss_growth_mb
+        self.on_recycle = on_recycle
+        self.requests = 0
+        self.limit = None
+        self.baseline_rss_mb = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.max_requests or self.max_rss_growth_mb)
+
+    def should_recycle(self) -> bool:
+        if self.max_requests:
+            if self.limit is None:
+                # Drawn in the worker so workers forked together don't all
+                # restart together.
+                self.limit = self.max_requests + random.randint(
+                    0, self.max_requests_jitter
+                )
+            if self.requests >= self.limit:
+                return True
+        if not self.max_rss_growth_mb:
+            return False
+        if self.baseline_rss_mb is None:
+            # Recorded in the worker, not the master it was forked from.
+            self.baseline_rss_mb = get_rss_mb()
+            return False
+        return get_rss_mb() - self.baseline_rss_mb > self.max_rss_growth_mb
+
+    def __call__(self, environ, start_response):
+        self.requests += 1
+        result = self.application(environ, start_response)
+        if self.should_recycle():
+            return _CloseHook(result, self.on_recycle)
+        return result
+
+
+class PreforkServer:
+    """Keeps ``workers`` forked processes running ``run_worker()``."""
+
+    def __init__(self, run_worker: Callable[[], None], workers: int):
+        self.run_worker = run_worker
+        self.count = max(workers, 1)
+        # pid -> monotonic start time
+        self.workers: Dict[int, float] = {}
+        self.reloading = False
+        self.stopping = False
+
+    def log(self, message: str):
+        print(f"[master {os.getpid()}] {message}", flush=True)
+
+    def spawn(self) -> int:
+        pid = os.fork()
+        if pid == 0:
+            self._worker()
+        self.workers[pid] = time.monotonic()
+        self.log(f"Started worker {pid}")
+        return pid
+
+    def _worker(self):
+        for signum in (signal.SIGHUP, signal.SIGTERM):
+            signal.signal(signum, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        random.seed()
+        status = 0
+        try:
+            self.run_worker()
+        except KeyboardInterrupt:
+            pass
+        except BaseException:
+            traceback.print_exc()
+            status = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        os._exit(status)
+
+    def reap(self):
+        """Forget exited workers, backing off if they die straight away."""
+        while self.workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.workers.clear()
+                return
+            if pid == 0:
+                return
+            started = self.workers.pop(pid, None)
+            if started is None:
+                continue
+            code = os.waitstatus_to_exitcode(status)
+            self.log(f"Worker {pid} exited with {code}")
+            if code != 0 and time.monotonic() - started < MIN_WORKER_LIFETIME:
+                time.sleep(MIN_WORKER_LIFETIME)
+
+    def stop_workers(self, pids, timeout: float = GRACEFUL_TIMEOUT):
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGINT)
+            except ProcessLookupError:
+                pass
+        deadline = time.monotonic() + timeout
+        pending = set(pids)
+        while pending and time.monotonic() < deadline:
+            for pid in list(pending):
+                try:
+                    if os.waitpid(pid, os.WNOHANG)[0] == 0:
+                        continue
+                except ChildProcessError:
+                    pass
+                pending.discard(pid)
+                self.workers.pop(pid, None)
+            time.sleep(0.05)
+        for pid in pending:
+            self.log(f"Killing worker {pid}")
+            try:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+            self.workers.pop(pid, None)
+
+    def reload(self):
+        """Replace every worker, starting each replacement before stopping."""
+        self.log("Reloading workers")
+        for pid in list(self.workers):
+            if self.stopping:
+                return
+            self.spawn()
+            self.stop_workers([pid])
+
+    def _on_reload(self, signum, frame):
+        self.reloading = True
+
+    def _on_stop(self, signum, frame):
+        self.stopping = True
+
+    def run(self):
+        signal.signal(signal.SIGHUP, self._on_reload)
+        signal.signal(signal.SIGTERM, self._on_stop)
+        signal.signal(signal.SIGINT, self._on_stop)
+        while not self.stopping:
+            self.reap()
+            if self.reloading:
+                self.reloading = False
+                self.reload()
+            while len(self.workers) < self.count and not self.stopping:
+                self.spawn()
+            time.sleep(0.5)
+        self.log("Stopping workers")
+        self.stop_workers(list(self.workers))
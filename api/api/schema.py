@@ -0,0 +1,60 @@
+"""OpenAPI schema and docs views, importing drf_yasg on first request.
+
+drf_yasg and its codecs take longer to import than the rest of the URLconf,
+and only the docs pages use them.
+"""
+
+from functools import lru_cache
+
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import permissions
+
+
+@lru_cache(maxsize=None)
+def get_api_info():
+    from drf_yasg import openapi
+
+    return openapi.Info(
+        title="Energy Dashboard API",
+        default_version="v1",
+        description="This is the documentation for the Energy Dashboard API",
+        license=openapi.License(name="MIT License"),
+    )
+
+
+def __getattr__(name):
+    # SWAGGER_SETTINGS["DEFAULT_INFO"] names ``api.schema.api_info``.
+    if name == "api_info":
+        return get_api_info()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@lru_cache(maxsize=None)
+def get_schema_view():
+    from drf_yasg.views import get_schema_view
+
+    return get_schema_view(
+        get_api_info(),
+        public=True,
+        permission_classes=[permissions.AllowAny],
+    )
+
+
+@lru_cache(maxsize=None)
+def _schema_json_view():
+    return get_schema_view().without_ui(cache_timeout=0)
+
+
+@lru_cache(maxsize=None)
+def _schema_redoc_view():
+    return get_schema_view().with_ui("redoc", cache_timeout=0)
+
+
+@csrf_exempt
+def schema_json(request, *args, **kwargs):
+    return _schema_json_view()(request, *args, **kwargs)
+
+
+@csrf_exempt
+def schema_redoc(request, *args, **kwargs):
+    return _schema_redoc_view()(request, *args, **kwargs)
@@ -32,6 +32,8 @@ else:
 DEBUG = DEVELOPMENT and os.environ.get("APP_DEBUG", "true").lower() != "false"
 
 CORS_ALLOW_CREDENTIALS = True
+# Let browser clients follow keyset pagination links.
+CORS_EXPOSE_HEADERS = ["Link"]
 CSRF_COOKIE_SECURE = not DEVELOPMENT
 
 if DEVELOPMENT:
@@ -76,6 +78,8 @@ MIDDLEWARE = [
     "api.middleware.HealthCheckMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "api.middleware.RenderedResponseCacheMiddleware",
+    "api.middleware.ReplicaRoutingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -103,11 +107,51 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "api.wsgi.application"
+ASGI_APPLICATION = "api.asgi.application"
+
+# Set by run_asgi.py. Serves the upstream proxy endpoints from async views so
+# calls in flight don't hold a worker.
+ASGI = os.environ.get("APP_ASGI", "false").lower() == "true"
+ASYNC_PROXY_VIEWS = os.environ.get("APP_ASYNC_PROXY_VIEWS", str(ASGI)).lower() == "true"
+
+# Pre-forked Bjoern workers started by run.py. Workers are replaced after
+# WORKER_MAX_REQUESTS requests (plus up to WORKER_MAX_REQUESTS_JITTER so they
+# don't all restart together) or once their RSS has grown by more than
+# WORKER_MAX_RSS_GROWTH_MB since their first request. 0 disables either limit.
+WORKERS = int(os.environ.get("APP_WORKERS", "1"))
+WORKER_MAX_REQUESTS = int(os.environ.get("APP_WORKER_MAX_REQUESTS", "0"))
+WORKER_MAX_REQUESTS_JITTER = int(os.environ.get("APP_WORKER_MAX_REQUESTS_JITTER", "0"))
+WORKER_MAX_RSS_GROWTH_MB = int(os.environ.get("APP_WORKER_MAX_RSS_GROWTH_MB", "0"))
+
+# Run in order before a process reports ready on /ready, see apps.core.warmup.
+WARMUP_STEPS = [
+    "apps.core.warmup.warm_database",
+    "apps.core.warmup.warm_urls",
+    "apps.core.warmup.warm_datasets",
+    "apps.carbon_intensity.warmup.warm_regions",
+    "apps.carbon_intensity.warmup.warm_series_index",
+    "apps.carbon_intensity.warmup.warm_latest",
+    "apps.core.warmup.warm_http",
+]
+
+# Queries explained by the explain_queries command, see apps.core.query_plans.
+QUERY_SHAPES = [
+    "apps.carbon_intensity.query_shapes.get_query_shapes",
+]
 
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# Pool connections per process with psycopg 3 rather than holding one
+# persistent connection per worker thread.
+DATABASE_POOL = os.environ.get("APP_DATABASE_POOL", "false").lower() == "true"
+# APP_DATABASE_HOST points at PgBouncer (k8s/pooler.yaml) in transaction mode.
+DATABASE_PGBOUNCER = os.environ.get("APP_DATABASE_PGBOUNCER", "false").lower() == "true"
+
+if DATABASE_POOL:
+    from psycopg_pool import ConnectionPool
+
 if DEVELOPMENT:
     DATABASES = {
         "default": {
@@ -115,6 +159,8 @@ if DEVELOPMENT:
             "NAME": BASE_DIR / "db.sqlite3",
         }
     }
+    # SQLite indexes the keys of the covering indexes without INCLUDE columns.
+    SILENCED_SYSTEM_CHECKS = ["models.W040"]
 else:
     DATABASES = {
         "default": {
@@ -125,8 +171,51 @@ else:
             "USER": os.environ["APP_DATABASE_USER"],
             "PASSWORD": os.environ["APP_DATABASE_PASSWORD"],
             "CONN_MAX_AGE": 120,
+            # Check a persistent connection still works before reusing it.
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {},
         }
     }
+    if DATABASE_POOL:
+        # Django's psycopg 3 pool: each process keeps up to max_size
+        # connections and requests borrow one rather than holding their own.
+        DATABASES["default"]["CONN_MAX_AGE"] = 0
+        DATABASES["default"]["OPTIONS"]["pool"] = {
+            "min_size": int(os.environ.get("APP_DATABASE_POOL_MIN_SIZE", "1")),
+            "max_size": int(os.environ.get("APP_DATABASE_POOL_MAX_SIZE", "4")),
+            "timeout": float(os.environ.get("APP_DATABASE_POOL_TIMEOUT", "10")),
+            # Idle connections are closed after this many seconds.
+            "max_idle": float(os.environ.get("APP_DATABASE_POOL_MAX_IDLE", "300")),
+            "check": ConnectionPool.check_connection,
+        }
+    if DATABASE_PGBOUNCER:
+        # PgBouncer in transaction mode hands each transaction whichever
+        # server connection is free, so cursors can't outlive a transaction.
+        DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = True
+
+# Read replicas (e.g. the CNPG `database-ro` service) for GET requests' time
+# series reads, see apps.core.db_router.
+DATABASE_REPLICAS = []
+if not DEVELOPMENT:
+    replica_hosts = os.environ.get("APP_DATABASE_REPLICA_HOSTS", "")
+    for number, host in enumerate(filter(None, replica_hosts.split(","))):
+        alias = f"replica_{number}"
+        DATABASES[alias] = {
+            **DATABASES["default"],
+            "HOST": host.strip(),
+            "OPTIONS": dict(DATABASES["default"]["OPTIONS"]),
+            "TEST": {"MIRROR": "default"},
+        }
+        DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["apps.core.db_router.ReplicaRouter"]
+# Apps whose models are read from replicas.
+REPLICA_APPS = ["carbon_intensity"]
+# Replicas further behind than this (seconds) are skipped.
+REPLICA_MAX_LAG = float(os.environ.get("APP_REPLICA_MAX_LAG", "30"))
+REPLICA_LAG_CHECK_INTERVAL = 5
+# Reads stay on the primary for this long after an ingest write.
+REPLICA_STICKY_SECONDS = float(os.environ.get("APP_REPLICA_STICKY_SECONDS", "60"))
 
 
 # Password validation
@@ -171,30 +260,36 @@ STATIC_URL = "static/"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 
-# settings.py additions
-# CELERY_BROKER_URL = 'redis://localhost:6379/0'
-# CELERY_RESULT_BACKEND = 'redis://localhost:6379/0'
-# CELERY_TIMEZONE = 'UTC'
-# CELERY_BEAT_SCHEDULE = {
-#     'update-intensity-every-30min': {
-#         'task': 'carbon_intensity.tasks.update_intensity_data',
-#         'schedule': 1800,
-#     },
-#     'update-generation-mix-hourly': {
-#         'task': 'carbon_intensity.tasks.update_generation_mix',
-#         'schedule': 3600,
-#     },
-# }
-
-# CACHES = {
-#     'default': {
-#         'BACKEND': 'django_redis.cache.RedisCache',
-#         'LOCATION': 'redis://localhost:6379/1',
-#         'OPTIONS': {
-#             'CLIENT_CLASS': 'django_redis.client.DefaultClient',
-#         }
-#     }
-# }
+# Celery, the app and beat schedule are in api/celery.py.
+CELERY_BROKER_URL = os.environ.get("APP_CELERY_BROKER_URL", "redis://localhost:6379/0")
+CELERY_TIMEZONE = "UTC"
+# Ingest runs this many seconds after each half-hourly settlement period
+# starts, and retries this often until upstream has published the period.
+INGEST_PUBLISH_OFFSET = float(os.environ.get("APP_INGEST_PUBLISH_OFFSET", "60"))
+INGEST_RETRY_SECONDS = float(os.environ.get("APP_INGEST_RETRY_SECONDS", "30"))
+# Regions ingested by their own task each (upstream's 14 DNO regions, England,
+# Scotland, Wales and GB).
+INGEST_REGION_IDS = list(range(1, 19))
+
+# Data versions, replica stickiness, rendered responses and ingest state are
+# shared between web workers and Celery through the cache, so it has to be a
+# shared one. Development runs in one process and keeps it in memory.
+if DEVELOPMENT:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django_redis.cache.RedisCache",
+            "LOCATION": os.environ.get("APP_CACHE_URL", "redis://localhost:6379/1"),
+            "OPTIONS": {
+                "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            },
+        }
+    }
 
 REST_FRAMEWORK = {
     "DEFAULT_THROTTLE_CLASSES": [
@@ -206,7 +301,70 @@ REST_FRAMEWORK = {
 }
 
 
-SWAGGER_SETTINGS = {"DEFAULT_INFO": "api.urls.api_info"}
+SWAGGER_SETTINGS = {"DEFAULT_INFO": "api.schema.api_info"}
+
+
+# DATA STORAGE
+
+# Keep a packed month-per-row copy of the half-hourly national/regional
+# intensity series and serve range reads from it.
+CARBON_INTENSITY_PACKED_STORAGE = (
+    os.environ.get("APP_PACKED_INTENSITY", "false").lower() == "true"
+)
+
+# Monthly partitions of the carbon intensity table (Postgres) are created
+# this many months ahead, see apps.carbon_intensity.partitions.
+INTENSITY_PARTITION_MONTHS_AHEAD = 3
+
+# Retention of raw half-hourly data, see apps.carbon_intensity.retention.
+# Whole months of raw rows (and hourly rollups) kept, 0 keeps them forever.
+RETENTION_RAW_MONTHS = int(os.environ.get("APP_RETENTION_RAW_MONTHS", "0"))
+# Computed stats not updated for this many days are deleted, 0 keeps them.
+RETENTION_STATS_DAYS = int(os.environ.get("APP_RETENTION_STATS_DAYS", "90"))
+RETENTION_CHUNK_SIZE = 5000
+# Seconds slept between deleted chunks.
+RETENTION_CHUNK_PAUSE = 0.2
+
+
+# Page sizes for the keyset paginated time series lists, see
+# apps.core.pagination.KeysetPagination. The maximum also caps unbounded queries.
+TIME_SERIES_PAGE_SIZE = int(os.environ.get("APP_TIME_SERIES_PAGE_SIZE", 5000))
+TIME_SERIES_MAX_PAGE_SIZE = int(os.environ.get("APP_TIME_SERIES_MAX_PAGE_SIZE", 20000))
+
+
+# PUSH
+
+# How often long-polls and event streams check for new data.
+PUSH_POLL_INTERVAL = float(os.environ.get("APP_PUSH_POLL_INTERVAL", 1))
+# Longest an async ``latest`` request may be held with ``?wait=``.
+LONG_POLL_MAX_WAIT = float(os.environ.get("APP_LONG_POLL_MAX_WAIT", 25))
+# Idle event streams get a comment line this often.
+SSE_HEARTBEAT_INTERVAL = float(os.environ.get("APP_SSE_HEARTBEAT_INTERVAL", 15))
+
+
+# Rows fetched from the database cursor and encoded per chunk of a bulk export.
+EXPORT_CHUNK_SIZE = int(os.environ.get("APP_EXPORT_CHUNK_SIZE", 5000))
+
+
+# First period ingested into an empty regional generation mix table, matching
+# the start of data/generationmix/monthly_generation_averages.json.
+REGIONAL_GENERATION_MIX_START = os.environ.get(
+    "APP_REGIONAL_GENERATION_MIX_START", "2022-11-01T00:00Z"
+)
+
+
+# RESPONSE CACHE
+
+# List endpoints served from pre-rendered bytes by
+# api.middleware.RenderedResponseCacheMiddleware, mapped to the data versions
+# they depend on. Entries are also dropped after RESPONSE_CACHE_TIMEOUT seconds
+# so relative default windows ("the last day") keep moving.
+RESPONSE_CACHE_ROUTES = {
+    "/api/v1/carbon-intensity/": ("carbon_intensity", "region"),
+    "/api/v1/generation-mix/": ("generation_mix",),
+    "/api/v1/region/": ("region",),
+}
+RESPONSE_CACHE_TIMEOUT = int(os.environ.get("APP_RESPONSE_CACHE_TIMEOUT", 300))
 
 
 # API KEYS
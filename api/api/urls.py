@@ -4,31 +4,25 @@ from django.urls import path, include, re_path
 from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
-from rest_framework import permissions
 from rest_framework.routers import DefaultRouter
 
-from apps.carbon_intensity.urls import router as carbon_intensity_router
-from apps.octopus.urls import router as octopus_router
+from api.schema import schema_json, schema_redoc
+from apps.core.metrics import db_metrics
+
+from apps.carbon_intensity.push import stream_latest
+from apps.carbon_intensity.urls import (
+    async_urlpatterns as carbon_intensity_async_urls,
+    router as carbon_intensity_router,
+)
+from apps.octopus.urls import (
+    async_urlpatterns as octopus_async_urls,
+    router as octopus_router,
+)
 
 router = DefaultRouter()
 router.registry.extend(carbon_intensity_router.registry)
 router.registry.extend(octopus_router.registry)
 
-api_info = openapi.Info(
-    title="Energy Dashboard API",
-    default_version="v1",
-    description="This is the documentation for the Energy Dashboard API",
-    license=openapi.License(name="MIT License"),
-)
-settings.SWAGGER_SETTINGS["DEFAULT_INFO"] = api_info
-
-schema_view = get_schema_view(
-    public=True,
-    permission_classes=[permissions.AllowAny],
-)
-
 admin.site.site_title = _("END Admin")
 admin.site.site_header = _("Energy Dashboard Administration")
 admin.site.index_title = _("Control Center Home")
@@ -37,14 +31,15 @@ urlpatterns = [
     path("api/admin/", admin.site.urls),
     path("api/v1/", include(router.urls)),
     path("api/v1/", include("apps.petition.urls")),
+    path("api/v1/stream/latest/", stream_latest, name="stream-latest"),
+    # Not routed by the ingress, for in-cluster scraping only.
+    path("metrics/db/", db_metrics, name="db-metrics"),
     re_path(
         r"^swagger(?P<format>\.json|\.yaml)$",
-        schema_view.without_ui(cache_timeout=0),
+        schema_json,
         name="schema-json",
     ),
-    re_path(
-        r"^docs/$", schema_view.with_ui("redoc", cache_timeout=0), name="schema-redoc"
-    ),
+    re_path(r"^docs/$", schema_redoc, name="schema-redoc"),
     path(
         "",
         lambda _: HttpResponse(
@@ -55,3 +50,9 @@ urlpatterns = [
         name="api-test",
     ),
 ]
+
+if settings.ASYNC_PROXY_VIEWS:
+    # Async upstream proxies take precedence over the matching viewset actions.
+    urlpatterns.insert(
+        0, path("api/v1/", include(carbon_intensity_async_urls + octopus_async_urls))
+    )
@@ -0,0 +1,115 @@
+"""Async counterparts of the CarbonIntensityViewSet upstream proxy actions.
+
+Routed ahead of the viewset when ``settings.ASYNC_PROXY_VIEWS`` is on (ASGI
+mode), so an upstream call in flight holds a coroutine rather than a worker.
+The ``latest`` long-polls are served here for the same reason.
+"""
+
+from datetime import datetime
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse
+
+from apps.core.async_views import check_throttles, json_response
+from apps.core.utils import clients
+
+from . import push
+from .serializers import CarbonIntensitySerializer
+from .viewsets import store_intensity_response
+
+
+def _store_and_serialize(response):
+    instances = store_intensity_response(response)
+    if instances is None:
+        return None
+    return CarbonIntensitySerializer(instances, many=True).data
+
+
+async def _intensity_response(request, fetch):
+    throttled = await check_throttles(request)
+    if throttled:
+        return throttled
+    response = await fetch(clients.AsyncCarbonIntensityService())
+    data = await sync_to_async(_store_and_serialize)(response)
+    if data is None:
+        return json_response({"detail": "No data available"}, status=404)
+    return json_response(data)
+
+
+async def current(request):
+    """Gets current national intensity."""
+    return await _intensity_response(
+        request, lambda service: service.get_current_intensity()
+    )
+
+
+async def today(request):
+    """Gets today's national intensity."""
+    return await _intensity_response(
+        request, lambda service: service.get_intensity_today()
+    )
+
+
+async def intensity_date(request, date):
+    try:
+        parsed_date = datetime.strptime(date, "%Y-%m-%d").date()
+    except ValueError:
+        return json_response(
+            {"detail": "Invalid date format. Use YYYY-MM-DD."}, status=400
+        )
+    return await _intensity_response(
+        request, lambda service: service.get_intensity_date(parsed_date)
+    )
+
+
+async def regional(request):
+    """Gets current regional intensity."""
+    throttled = await check_throttles(request)
+    if throttled:
+        return throttled
+    return json_response(
+        await clients.AsyncCarbonIntensityService().get_regional_current()
+    )
+
+
+async def _latest_response(request, event):
+    throttled = await check_throttles(request)
+    if throttled:
+        return throttled
+    if_none_match = request.headers.get("If-None-Match")
+    instance = await sync_to_async(push.LATEST_INSTANCES[event])()
+    if if_none_match == push.get_etag(event, instance) and "wait" in request.GET:
+        try:
+            wait = float(request.GET["wait"])
+        except ValueError:
+            return json_response(
+                {"detail": "'wait' must be a number of seconds."}, status=400
+            )
+        wait = max(min(wait, settings.LONG_POLL_MAX_WAIT), 0)
+        instance = await push.wait_for_change(event, if_none_match, wait)
+    if instance is None:
+        return json_response({"detail": "No data available"}, status=404)
+
+    etag = push.get_etag(event, instance)
+    if if_none_match == etag:
+        response = HttpResponse(status=304)
+    else:
+        response = json_response(
+            await sync_to_async(push.serialize_latest)(event, instance)
+        )
+    response["ETag"] = etag
+    return response
+
+
+async def latest(request):
+    """
+    Latest stored national intensity, long-polled with ``?wait=<seconds>``
+    when ``If-None-Match`` matches.
+    """
+    return await _latest_response(request, push.CARBON_INTENSITY_EVENT)
+
+
+async def latest_generation_mix(request):
+    """Latest stored generation mix, long-polled like ``latest``."""
+    return await _latest_response(request, push.GENERATION_MIX_EVENT)
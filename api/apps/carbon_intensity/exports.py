@@ -0,0 +1,201 @@
+"""Bulk export of stored time series as streamed CSV, Arrow or Parquet.
+
+Rows are read with ``values_list().iterator(chunk_size)`` (a server-side
+cursor on Postgres) and every chunk is encoded and yielded before the next
+one is fetched, so memory stays flat however long the range is.
+"""
+
+import csv
+import io
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+
+from apps.core import columnar
+
+from .models import (
+    FUEL_TYPES,
+    CarbonIntensity,
+    GenerationMix,
+    RegionalGenerationMix,
+)
+from .serializers import format_datetime
+
+CSV = "csv"
+ARROW = "arrow"
+PARQUET = "parquet"
+
+CONTENT_TYPES = {
+    CSV: "text/csv",
+    ARROW: "application/vnd.apache.arrow.stream",
+    PARQUET: "application/vnd.apache.parquet",
+}
+FORMATS = list(CONTENT_TYPES)
+
+
+@dataclass
+class ExportDataset:
+    model: type
+    columns: List[Tuple[str, str]]
+    filters: dict = field(default_factory=dict)
+    # National rows are stored with a NULL region and exported when no
+    # ``region_id`` is given, otherwise all regions are exported together.
+    has_national: bool = False
+
+    def get_queryset(self, from_dt: datetime, to_dt: datetime, region_id=None):
+        qs = self.model.objects.filter(
+            from_datetime__gte=from_dt, from_datetime__lt=to_dt, **self.filters
+        )
+        if region_id:
+            qs = qs.filter(region_id=region_id)
+        elif self.has_national:
+            qs = qs.filter(region__isnull=True)
+        return qs.order_by(*self.ordering).values_list(
+            *(name for name, _ in self.columns)
+        )
+
+    @property
+    def ordering(self) -> List[str]:
+        if any(name == "region_id" for name, _ in self.columns):
+            return ["from_datetime", "region_id"]
+        return ["from_datetime"]
+
+
+TIME_COLUMNS = [
+    ("from_datetime", columnar.TIMESTAMP),
+    ("to_datetime", columnar.TIMESTAMP),
+]
+FUEL_COLUMNS = [(fuel, columnar.FLOAT) for fuel in FUEL_TYPES]
+
+DATASETS = {
+    "carbon-intensity": ExportDataset(
+        CarbonIntensity,
+        TIME_COLUMNS
+        + [
+            ("actual", columnar.INT),
+            ("forecast", columnar.INT),
+            ("index", columnar.STRING),
+            ("region_id", columnar.INT),
+        ],
+        filters={"postcode_prefix__isnull": True},
+        has_national=True,
+    ),
+    "generation-mix": ExportDataset(GenerationMix, TIME_COLUMNS + FUEL_COLUMNS),
+    "regional-generation-mix": ExportDataset(
+        RegionalGenerationMix,
+        TIME_COLUMNS + [("region_id", columnar.INT)] + FUEL_COLUMNS,
+    ),
+}
+
+
+def _chunks(rows, chunk_size: int) -> Iterator[list]:
+    chunk = []
+    for row in rows.iterator(chunk_size=chunk_size):
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def stream_csv(dataset: ExportDataset, rows, chunk_size: int) -> Iterator[bytes]:
+    timestamps = [
+        position
+        for position, (_, column_type) in enumerate(dataset.columns)
+        if column_type == columnar.TIMESTAMP
+    ]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(name for name, _ in dataset.columns)
+    for chunk in _chunks(rows, chunk_size):
+        for row in chunk:
+            row = list(row)
+            for position in timestamps:
+                row[position] = format_datetime(row[position])
+            writer.writerow(row)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file collecting what pyarrow writes until it is drained."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def _arrow_schema(dataset: ExportDataset):
+    import pyarrow
+
+    types = {
+        columnar.TIMESTAMP: pyarrow.timestamp("ms", tz="UTC"),
+        columnar.INT: pyarrow.int64(),
+        columnar.FLOAT: pyarrow.float64(),
+        columnar.STRING: pyarrow.string(),
+    }
+    return pyarrow.schema(
+        [(name, types[column_type]) for name, column_type in dataset.columns]
+    )
+
+
+def stream_arrow(
+    dataset: ExportDataset, rows, chunk_size: int, file_format: str = ARROW
+) -> Iterator[bytes]:
+    """Arrow IPC stream, or Parquet with one row group per chunk."""
+    # Imported here, pyarrow is slow to import and viewsets import this module.
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+
+    schema = _arrow_schema(dataset)
+    sink = _ChunkSink()
+    if file_format == PARQUET:
+        writer = pyarrow.parquet.ParquetWriter(sink, schema)
+        write = writer.write_table
+    else:
+        writer = pyarrow.ipc.new_stream(sink, schema)
+        write = writer.write_batch
+
+    for chunk in _chunks(rows, chunk_size):
+        columns = list(zip(*chunk))
+        batch = pyarrow.record_batch(
+            [
+                pyarrow.array(values, type=schema_field.type)
+                for values, schema_field in zip(columns, schema)
+            ],
+            schema=schema,
+        )
+        write(pyarrow.Table.from_batches([batch]) if file_format == PARQUET else batch)
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def stream_export(
+    dataset: ExportDataset,
+    file_format: str,
+    from_dt: datetime,
+    to_dt: datetime,
+    region_id: Optional[int] = None,
+    chunk_size: int = 5000,
+) -> Iterator[bytes]:
+    rows = dataset.get_queryset(from_dt, to_dt, region_id)
+    if file_format == CSV:
+        return stream_csv(dataset, rows, chunk_size)
+    return stream_arrow(dataset, rows, chunk_size, file_format)
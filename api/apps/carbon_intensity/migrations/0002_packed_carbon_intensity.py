@@ -0,0 +1,46 @@
+# Generated by Django 5.1.7 on 2026-10-19 06:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("carbon_intensity", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PackedCarbonIntensity",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("month", models.DateField()),
+                ("actual", models.BinaryField()),
+                ("forecast", models.BinaryField()),
+                ("index", models.BinaryField()),
+                (
+                    "region",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="packed_intensity_data",
+                        to="carbon_intensity.region",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Packed Carbon Intensities",
+                "ordering": ["month"],
+                "unique_together": {("month", "region")},
+            },
+        ),
+    ]
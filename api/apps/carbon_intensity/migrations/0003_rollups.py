@@ -0,0 +1,102 @@
+# Generated by Django 5.1.7 on 2026-10-19 06:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("carbon_intensity", "0002_packed_carbon_intensity"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GenerationMixRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("from_datetime", models.DateTimeField()),
+                ("to_datetime", models.DateTimeField()),
+                (
+                    "resolution",
+                    models.CharField(
+                        choices=[
+                            ("hour", "Hourly"),
+                            ("day", "Daily"),
+                            ("week", "Weekly"),
+                            ("month", "Monthly"),
+                        ],
+                        max_length=5,
+                    ),
+                ),
+                ("count", models.IntegerField()),
+                ("fuel_mix", models.JSONField()),
+            ],
+            options={
+                "ordering": ["-from_datetime"],
+                "unique_together": {("resolution", "from_datetime")},
+            },
+        ),
+        migrations.CreateModel(
+            name="IntensityRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("from_datetime", models.DateTimeField()),
+                ("to_datetime", models.DateTimeField()),
+                (
+                    "resolution",
+                    models.CharField(
+                        choices=[
+                            ("hour", "Hourly"),
+                            ("day", "Daily"),
+                            ("week", "Weekly"),
+                            ("month", "Monthly"),
+                        ],
+                        max_length=5,
+                    ),
+                ),
+                ("count", models.IntegerField()),
+                ("min_intensity", models.IntegerField(blank=True, null=True)),
+                ("max_intensity", models.IntegerField(blank=True, null=True)),
+                ("average_intensity", models.FloatField(blank=True, null=True)),
+                ("p10_intensity", models.FloatField(blank=True, null=True)),
+                ("p50_intensity", models.FloatField(blank=True, null=True)),
+                ("p90_intensity", models.FloatField(blank=True, null=True)),
+                (
+                    "region",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="intensity_rollups",
+                        to="carbon_intensity.region",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-from_datetime"],
+                "indexes": [
+                    models.Index(
+                        fields=["resolution", "region", "from_datetime"],
+                        name="carbon_inte_resolut_8d7efd_idx",
+                    )
+                ],
+                "unique_together": {("resolution", "from_datetime", "region")},
+            },
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.1.7 on 2026-10-19 06:40
+
+import json
+
+from django.db import migrations, models
+
+FUEL_TYPES = [
+    "biomass",
+    "coal",
+    "imports",
+    "gas",
+    "nuclear",
+    "other",
+    "hydro",
+    "solar",
+    "wind",
+]
+
+
+def fuel_mix_to_columns(apps, schema_editor):
+    GenerationMix = apps.get_model("carbon_intensity", "GenerationMix")
+    for mix in GenerationMix.objects.iterator(chunk_size=2000):
+        fuel_mix = mix.fuel_mix
+        # Rows were saved with json.dumps() into the JSONField
+        if isinstance(fuel_mix, str):
+            fuel_mix = json.loads(fuel_mix)
+        for fuel in FUEL_TYPES:
+            setattr(mix, fuel, (fuel_mix or {}).get(fuel))
+        mix.save(update_fields=FUEL_TYPES)
+
+
+def columns_to_fuel_mix(apps, schema_editor):
+    GenerationMix = apps.get_model("carbon_intensity", "GenerationMix")
+    for mix in GenerationMix.objects.iterator(chunk_size=2000):
+        mix.fuel_mix = {
+            fuel: getattr(mix, fuel)
+            for fuel in FUEL_TYPES
+            if getattr(mix, fuel) is not None
+        }
+        mix.save(update_fields=["fuel_mix"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("carbon_intensity", "0003_rollups"),
+    ]
+
+    operations = [
+        *[
+            migrations.AddField(
+                model_name="generationmix",
+                name=fuel,
+                field=models.FloatField(blank=True, null=True),
+            )
+            for fuel in FUEL_TYPES
+        ],
+        migrations.AlterField(
+            model_name="generationmix",
+            name="fuel_mix",
+            field=models.JSONField(null=True),
+        ),
+        migrations.RunPython(fuel_mix_to_columns, columns_to_fuel_mix),
+        migrations.RemoveField(
+            model_name="generationmix",
+            name="fuel_mix",
+        ),
+    ]
@@ -0,0 +1,103 @@
+# Generated by Django 5.1.7 on 2026-10-19 06:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("carbon_intensity", "0004_generation_mix_fuel_columns"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RegionalGenerationMix",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("biomass", models.FloatField(blank=True, null=True)),
+                ("coal", models.FloatField(blank=True, null=True)),
+                ("imports", models.FloatField(blank=True, null=True)),
+                ("gas", models.FloatField(blank=True, null=True)),
+                ("nuclear", models.FloatField(blank=True, null=True)),
+                ("other", models.FloatField(blank=True, null=True)),
+                ("hydro", models.FloatField(blank=True, null=True)),
+                ("solar", models.FloatField(blank=True, null=True)),
+                ("wind", models.FloatField(blank=True, null=True)),
+                ("from_datetime", models.DateTimeField()),
+                ("to_datetime", models.DateTimeField()),
+                ("created", models.DateTimeField(auto_now_add=True)),
+                ("modified", models.DateTimeField(auto_now=True)),
+                (
+                    "region",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="generation_mix",
+                        to="carbon_intensity.region",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Regional Generation Mixes",
+                "ordering": ["-from_datetime"],
+                "indexes": [
+                    models.Index(
+                        fields=["region", "from_datetime"],
+                        name="carbon_inte_region__9f4e1e_idx",
+                    )
+                ],
+                "unique_together": {("from_datetime", "to_datetime", "region")},
+            },
+        ),
+        migrations.CreateModel(
+            name="RegionalGenerationMixAggregate",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("biomass", models.FloatField(blank=True, null=True)),
+                ("coal", models.FloatField(blank=True, null=True)),
+                ("imports", models.FloatField(blank=True, null=True)),
+                ("gas", models.FloatField(blank=True, null=True)),
+                ("nuclear", models.FloatField(blank=True, null=True)),
+                ("other", models.FloatField(blank=True, null=True)),
+                ("hydro", models.FloatField(blank=True, null=True)),
+                ("solar", models.FloatField(blank=True, null=True)),
+                ("wind", models.FloatField(blank=True, null=True)),
+                (
+                    "period",
+                    models.CharField(
+                        choices=[("month", "Monthly"), ("quarter", "Quarterly")],
+                        max_length=7,
+                    ),
+                ),
+                ("period_start", models.DateField()),
+                ("count", models.IntegerField()),
+                (
+                    "region",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="generation_mix_aggregates",
+                        to="carbon_intensity.region",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-period_start"],
+                "unique_together": {("period", "period_start", "region")},
+            },
+        ),
+    ]
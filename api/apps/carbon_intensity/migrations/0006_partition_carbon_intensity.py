@@ -0,0 +1,153 @@
+# Generated by Django 5.1.7 on 2026-10-19 06:57
+
+from datetime import date, datetime, timezone
+
+from django.db import migrations, models
+
+TABLE = "carbon_intensity_carbonintensity"
+OLD_TABLE = f"{TABLE}_rebuild"
+SEQUENCE = f"{TABLE}_id_seq"
+BRIN_INDEX = "carbon_inte_from_to_brin"
+# Partitions are created this many months past the current one.
+MONTHS_AHEAD = 3
+
+
+def _next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def _bound(month: date) -> datetime:
+    return datetime(month.year, month.month, 1, tzinfo=timezone.utc)
+
+
+def _rebuild(cursor, partitioned: bool):
+    """
+    Recreate the table (partitioned by month on from_datetime, or plain) with
+    the same columns, constraints and indexes, and copy the rows across.
+    """
+    cursor.execute(
+        """
+        SELECT conname, contype, pg_get_constraintdef(oid) FROM pg_constraint
+        WHERE conrelid = %s::regclass AND contype IN ('p', 'u', 'f')
+        """,
+        [TABLE],
+    )
+    constraints = cursor.fetchall()
+    cursor.execute(
+        """
+        SELECT indexname, indexdef FROM pg_indexes
+        WHERE tablename = %s AND indexname NOT IN (
+            SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass
+        )
+        """,
+        [TABLE, TABLE],
+    )
+    indexes = [
+        (name, definition)
+        for name, definition in cursor.fetchall()
+        if name != BRIN_INDEX
+    ]
+
+    # Free the table, constraint, index and sequence names.
+    cursor.execute(f"ALTER TABLE {TABLE} RENAME TO {OLD_TABLE}")
+    for name, _ in indexes:
+        cursor.execute(f'DROP INDEX "{name}"')
+    for name, _, _ in constraints:
+        cursor.execute(f'ALTER TABLE {OLD_TABLE} DROP CONSTRAINT "{name}"')
+    cursor.execute(f"ALTER TABLE {OLD_TABLE} ALTER COLUMN id DROP IDENTITY IF EXISTS")
+    cursor.execute(f"ALTER TABLE {OLD_TABLE} ALTER COLUMN id DROP DEFAULT")
+    cursor.execute(f"DROP SEQUENCE IF EXISTS {SEQUENCE}")
+
+    if partitioned:
+        cursor.execute(
+            f"CREATE TABLE {TABLE} (LIKE {OLD_TABLE} INCLUDING CONSTRAINTS) "
+            "PARTITION BY RANGE (from_datetime)"
+        )
+        cursor.execute(f"SELECT min(from_datetime) FROM {OLD_TABLE}")
+        now = datetime.now(timezone.utc)
+        first = cursor.fetchone()[0] or now
+        month, last = date(first.year, first.month, 1), date(now.year, now.month, 1)
+        for _ in range(MONTHS_AHEAD):
+            last = _next_month(last)
+        while month <= last:
+            cursor.execute(
+                f"CREATE TABLE {TABLE}_p{month:%Y_%m} PARTITION OF {TABLE} "
+                "FOR VALUES FROM (%s) TO (%s)",
+                [_bound(month), _bound(_next_month(month))],
+            )
+            month = _next_month(month)
+        cursor.execute(f"CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT")
+    else:
+        cursor.execute(f"CREATE TABLE {TABLE} (LIKE {OLD_TABLE} INCLUDING CONSTRAINTS)")
+
+    cursor.execute(f"INSERT INTO {TABLE} SELECT * FROM {OLD_TABLE}")
+    cursor.execute(f"DROP TABLE {OLD_TABLE}")
+
+    if partitioned:
+        # Identity columns need Postgres 17 on partitioned tables.
+        cursor.execute(f"CREATE SEQUENCE {SEQUENCE} OWNED BY {TABLE}.id")
+        cursor.execute(
+            f"ALTER TABLE {TABLE} ALTER COLUMN id SET DEFAULT nextval(%s)", [SEQUENCE]
+        )
+    else:
+        cursor.execute(
+            f"ALTER TABLE {TABLE} ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY"
+        )
+    cursor.execute(
+        f"SELECT setval(pg_get_serial_sequence(%s, 'id'), "
+        f"COALESCE((SELECT max(id) FROM {TABLE}), 0) + 1, false)",
+        [TABLE],
+    )
+
+    for name, kind, definition in constraints:
+        if kind == "p":
+            # Unique constraints on a partitioned table must include the
+            # partition key.
+            definition = (
+                "PRIMARY KEY (id, from_datetime)" if partitioned else "PRIMARY KEY (id)"
+            )
+        cursor.execute(f'ALTER TABLE {TABLE} ADD CONSTRAINT "{name}" {definition}')
+    for _, definition in indexes:
+        cursor.execute(definition)
+    if partitioned:
+        cursor.execute(
+            f"CREATE INDEX {BRIN_INDEX} ON {TABLE} "
+            "USING brin (from_datetime, to_datetime) WITH (pages_per_range = 32)"
+        )
+    cursor.execute(f"ANALYZE {TABLE}")
+
+
+def partition(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        _rebuild(cursor, partitioned=True)
+
+
+def unpartition(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        _rebuild(cursor, partitioned=False)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("carbon_intensity", "0005_regional_generation_mix"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="carbonintensity",
+            name="carbon_inte_from_da_aa64b3_idx",
+        ),
+        migrations.AddIndex(
+            model_name="carbonintensity",
+            index=models.Index(
+                fields=["region", "from_datetime"],
+                name="carbon_inte_region__8c5caa_idx",
+            ),
+        ),
+        # Postgres only, elsewhere the table stays as it is.
+        migrations.RunPython(partition, unpartition),
+    ]
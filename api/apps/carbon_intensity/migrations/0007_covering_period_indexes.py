@@ -0,0 +1,48 @@
+# Generated by Django 5.1.7 on 2026-10-19 07:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("carbon_intensity", "0006_partition_carbon_intensity"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="carbonintensity",
+            name="carbon_inte_region__8c5caa_idx",
+        ),
+        migrations.AddIndex(
+            model_name="carbonintensity",
+            index=models.Index(
+                fields=["region", "from_datetime"],
+                include=(
+                    "to_datetime",
+                    "actual",
+                    "forecast",
+                    "index",
+                    "postcode_prefix",
+                    "id",
+                ),
+                name="carbon_inte_regional_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="carbonintensity",
+            index=models.Index(
+                condition=models.Q(("region__isnull", True)),
+                fields=["from_datetime"],
+                include=(
+                    "to_datetime",
+                    "actual",
+                    "forecast",
+                    "index",
+                    "postcode_prefix",
+                    "id",
+                    "region",
+                ),
+                name="carbon_inte_national_idx",
+            ),
+        ),
+    ]
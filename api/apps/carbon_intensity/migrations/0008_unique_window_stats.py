@@ -0,0 +1,39 @@
+# Generated by Django 5.1.7 on 2026-10-19 07:04
+
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def dedupe_stats(apps, schema_editor):
+    """Keep the latest row of each window and block size."""
+    CarbonIntensityStats = apps.get_model("carbon_intensity", "CarbonIntensityStats")
+    duplicates = (
+        CarbonIntensityStats.objects.order_by()
+        .values("from_datetime", "to_datetime", "block_hours")
+        .annotate(rows=Count("pk"), keep=Max("pk"))
+        .filter(rows__gt=1)
+    )
+    for group in duplicates:
+        CarbonIntensityStats.objects.filter(
+            from_datetime=group["from_datetime"],
+            to_datetime=group["to_datetime"],
+            block_hours=group["block_hours"],
+        ).exclude(pk=group["keep"]).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("carbon_intensity", "0007_covering_period_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_stats, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="carbonintensitystats",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("block_hours__isnull", True)),
+                fields=("from_datetime", "to_datetime"),
+                name="carbon_stats_unique_window",
+            ),
+        ),
+    ]
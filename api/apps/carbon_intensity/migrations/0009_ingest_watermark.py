@@ -0,0 +1,29 @@
+# Generated by Django 5.1.7 on 2026-10-19 07:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("carbon_intensity", "0008_unique_window_stats"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IngestWatermark",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("series", models.CharField(max_length=64, unique=True)),
+                ("latest_from_datetime", models.DateTimeField()),
+                ("modified", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
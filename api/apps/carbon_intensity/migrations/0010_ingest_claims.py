@@ -0,0 +1,27 @@
+# Generated by Django 5.1.7 on 2026-10-19 07:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("carbon_intensity", "0009_ingest_watermark"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ingestwatermark",
+            name="claimed_at",
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AddField(
+            model_name="ingestwatermark",
+            name="claimed_from_datetime",
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AlterField(
+            model_name="ingestwatermark",
+            name="latest_from_datetime",
+            field=models.DateTimeField(null=True),
+        ),
+    ]
@@ -1,18 +1,28 @@
-from django.db import models
+from django.db import models, transaction
 from django.core.cache import cache
-from datetime import datetime
+from django.db.models import Avg, Count, Max
+from django.utils.dateparse import parse_datetime
+from datetime import date, datetime, time, timedelta, timezone as tz
 from dataclasses import dataclass, asdict
-from typing import Dict, Optional
-import json
+from typing import Dict, List, Optional, Tuple
 import logging
 
-from apps.core.utils.api_clients import CarbonIntensityService
+import numpy as np
+
+from apps.core.utils import clients
+from apps.core.utils.data_versions import bump_data_version
+from . import packing, rollups, stats
+from .regions import DATA_VERSION as REGION_DATA_VERSION, get_region
+from .series_index import DATA_VERSION, get_series_index
 
 logger = logging.getLogger(__name__)
 
 # Cache configuration
 CACHE_TTL = 60 * 15  # 15 minutes
 
+# Data version counters, bumped whenever the rows behind them change
+GENERATION_MIX_DATA_VERSION = "generation_mix"
+
 
 class CarbonIntensityManager(models.Manager):
     """Custom manager for CarbonIntensity model with caching."""
@@ -29,11 +39,16 @@ class CarbonIntensityManager(models.Manager):
             logger.debug("Returning cached carbon intensity data")
             return cached
 
+        # Imported here, retention imports the models.
+        from .retention import raw_cutoff
+
         qs = self.filter(from_datetime__gte=from_dt, to_datetime__lte=to_dt)
+        cutoff = raw_cutoff()
 
-        if not qs.exists():
+        # Periods past raw retention are served by rollups, not refetched.
+        if not qs.exists() and (cutoff is None or packing.as_utc(to_dt) > cutoff):
             # Trigger service directly if celery hasn't updated the data
-            service = CarbonIntensityService()
+            service = clients.CarbonIntensityService()
             response = service.get_intensity_between(from_dt, to_dt)
             if response and "data" in response:
                 for entry in response["data"]:
@@ -46,17 +61,22 @@ class CarbonIntensityManager(models.Manager):
                         index=intensity.get("index", "moderate"),
                     )
                     CarbonIntensity.from_dataclass(ci_data).save()
+                IntensityRollup.objects.refresh(from_dt, to_dt)
 
-            qs = self.filter(from_datetime__gte=from_dt, to_datetime__lte=to_dt)
+        qs = self.period_queryset(from_dt, to_dt, region_id)
+        cache.set(cache_key, qs, CACHE_TTL)
+        return qs
 
+    def period_queryset(
+        self, from_dt: datetime, to_dt: datetime, region_id: int = None
+    ) -> models.QuerySet:
+        """The period's national or regional rows, served by a covering index."""
+        qs = self.filter(from_datetime__gte=from_dt, to_datetime__lte=to_dt)
         if region_id:
             qs = qs.filter(region_id=region_id)
         else:
             qs = qs.filter(region__isnull=True)
-
-        qs = qs.order_by("from_datetime")
-        cache.set(cache_key, qs, CACHE_TTL)
-        return qs
+        return qs.order_by("from_datetime")
 
     def latest_national_intensity(self) -> Optional["CarbonIntensity"]:
         cache_key = "latest_national_intensity"
@@ -90,6 +110,15 @@ class Region(models.Model):
     def __str__(self):
         return f"{self.name} ({self.region_id})"
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        bump_data_version(REGION_DATA_VERSION)
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        bump_data_version(REGION_DATA_VERSION)
+        return result
+
 
 @dataclass
 class CarbonIntensityData:
@@ -108,6 +137,11 @@ class CarbonIntensityData:
         return CarbonIntensity.from_dataclass(self)
 
 
+# Columns read by period queries beyond the index keys. Postgres stores them
+# in the index leaves (INCLUDE); other databases index the keys only.
+COVERED_FIELDS = ["to_datetime", "actual", "forecast", "index", "postcode_prefix", "id"]
+
+
 class CarbonIntensity(models.Model):
     """Stores carbon intensity data for national and regional levels"""
 
@@ -140,8 +174,27 @@ class CarbonIntensity(models.Model):
     objects = CarbonIntensityManager()
 
     class Meta:
+        # On Postgres the table is range partitioned by month on
+        # from_datetime, with BRIN indexes on the time columns (see
+        # migration 0006 and the partitions module).
         indexes = [
-            models.Index(fields=["from_datetime", "to_datetime"]),
+            # period_queryset filters on region then a from_datetime range,
+            # and these include every column a page of rows reads so both
+            # can be answered from the index alone (see explain_queries).
+            models.Index(
+                fields=["region", "from_datetime"],
+                include=COVERED_FIELDS,
+                name="carbon_inte_regional_idx",
+            ),
+            # National rows have no region, so the key is just the time.
+            models.Index(
+                fields=["from_datetime"],
+                # Always NULL here, but selected, so it's needed for an
+                # index only scan.
+                include=[*COVERED_FIELDS, "region"],
+                condition=models.Q(region__isnull=True),
+                name="carbon_inte_national_idx",
+            ),
             models.Index(fields=["postcode_prefix"]),
             models.Index(fields=["index"]),
         ]
@@ -161,13 +214,17 @@ class CarbonIntensity(models.Model):
 
     def save(self, *args, **kwargs):
         """Override save to handle cache invalidation and duplicates"""
-        # Check for existing data before saving
-        exists = CarbonIntensity.objects.filter(
-            from_datetime=self.from_datetime,
-            to_datetime=self.to_datetime,
-            region=self.region,
-            postcode_prefix=self.postcode_prefix,
-        ).exists()
+        # Check for existing data before saving (updates of this row are fine)
+        exists = (
+            CarbonIntensity.objects.filter(
+                from_datetime=self.from_datetime,
+                to_datetime=self.to_datetime,
+                region=self.region,
+                postcode_prefix=self.postcode_prefix,
+            )
+            .exclude(pk=self.pk)
+            .exists()
+        )
 
         if exists:
             logger.warning("Duplicate carbon intensity data detected")
@@ -181,6 +238,7 @@ class CarbonIntensity(models.Model):
                 f"carbon_intensity_{self.from_datetime}_{self.to_datetime}",
             ]
         )
+        bump_data_version(DATA_VERSION)
 
 
 class GenerationMixManager(models.Manager):
@@ -197,6 +255,17 @@ class GenerationMixManager(models.Manager):
         cache.set(cache_key, instance, 60)  # 1 minute cache
         return instance
 
+    def get_average_mix(self, from_dt: datetime, to_dt: datetime) -> Dict[str, float]:
+        """Average percentage per fuel type over the period, computed in SQL."""
+        averages = self.filter(
+            from_datetime__gte=from_dt, to_datetime__lte=to_dt
+        ).aggregate(**{fuel: Avg(fuel) for fuel in FUEL_TYPES})
+        return {
+            fuel: round(value, 1)
+            for fuel, value in averages.items()
+            if value is not None
+        }
+
 
 @dataclass
 class GenerationMixData:
@@ -211,12 +280,58 @@ class GenerationMixData:
         return GenerationMix.from_dataclass(self)
 
 
-class GenerationMix(models.Model):
+FUEL_TYPES = [
+    "biomass",
+    "coal",
+    "imports",
+    "gas",
+    "nuclear",
+    "other",
+    "hydro",
+    "solar",
+    "wind",
+]
+
+
+class FuelMix(models.Model):
+    """Percentage of generation per fuel type, one column per fuel"""
+
+    biomass = models.FloatField(null=True, blank=True)
+    coal = models.FloatField(null=True, blank=True)
+    imports = models.FloatField(null=True, blank=True)
+    gas = models.FloatField(null=True, blank=True)
+    nuclear = models.FloatField(null=True, blank=True)
+    other = models.FloatField(null=True, blank=True)
+    hydro = models.FloatField(null=True, blank=True)
+    solar = models.FloatField(null=True, blank=True)
+    wind = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        abstract = True
+
+    @property
+    def fuel_mix(self) -> Dict[str, float]:
+        """{fuel_type: percentage} for the fuels with a value"""
+        return {
+            fuel: getattr(self, fuel)
+            for fuel in FUEL_TYPES
+            if getattr(self, fuel) is not None
+        }
+
+    @fuel_mix.setter
+    def fuel_mix(self, value: Dict[str, float]):
+        unknown = set(value) - set(FUEL_TYPES)
+        if unknown:
+            logger.warning(f"Ignoring unknown fuel types: {', '.join(sorted(unknown))}")
+        for fuel in FUEL_TYPES:
+            setattr(self, fuel, value.get(fuel))
+
+
+class GenerationMix(FuelMix):
     """Stores electricity generation mix percentages by fuel type"""
 
     from_datetime = models.DateTimeField()
     to_datetime = models.DateTimeField()
-    fuel_mix = models.JSONField()
     created = models.DateTimeField(auto_now_add=True)
     modified = models.DateTimeField(auto_now=True)
 
@@ -235,16 +350,487 @@ class GenerationMix(models.Model):
     @classmethod
     def from_dataclass(cls, data: GenerationMixData) -> "GenerationMix":
         """Create model instance from dataclass"""
-        return cls(
-            from_datetime=data.from_datetime,
-            to_datetime=data.to_datetime,
-            fuel_mix=json.dumps(data.fuel_mix),
-        )
+        instance = cls(from_datetime=data.from_datetime, to_datetime=data.to_datetime)
+        instance.fuel_mix = data.fuel_mix
+        return instance
 
     def save(self, *args, **kwargs):
         """Override save to handle cache invalidation"""
         super().save(*args, **kwargs)
         cache.delete("latest_generation_mix")
+        bump_data_version(GENERATION_MIX_DATA_VERSION)
+
+
+class RegionalGenerationMixManager(models.Manager):
+    """Custom manager for regional generation mix time series"""
+
+    def latest_to_datetime(self) -> Optional[datetime]:
+        return self.aggregate(latest=Max("to_datetime"))["latest"]
+
+
+class RegionalGenerationMix(FuelMix):
+    """Stores half-hourly generation mix percentages by fuel type per region"""
+
+    from_datetime = models.DateTimeField()
+    to_datetime = models.DateTimeField()
+    region = models.ForeignKey(
+        Region, on_delete=models.CASCADE, related_name="generation_mix"
+    )
+    created = models.DateTimeField(auto_now_add=True)
+    modified = models.DateTimeField(auto_now=True)
+
+    objects = RegionalGenerationMixManager()
+
+    class Meta:
+        verbose_name_plural = "Regional Generation Mixes"
+        indexes = [
+            models.Index(fields=["region", "from_datetime"]),
+        ]
+        ordering = ["-from_datetime"]
+        unique_together = [
+            ("from_datetime", "to_datetime", "region"),
+        ]
+
+    def __str__(self):
+        return f"Generation Mix for {self.region} from {self.from_datetime}"
+
+
+AGGREGATE_PERIODS = [
+    ("month", "Monthly"),
+    ("quarter", "Quarterly"),
+]
+
+
+def period_bounds(day: date, period: str) -> Tuple[date, date]:
+    """First day of the month/quarter containing ``day`` and of the next one."""
+    first_month = day.month if period == "month" else (day.month - 1) // 3 * 3 + 1
+    start = date(day.year, first_month, 1)
+    months = 1 if period == "month" else 3
+    end_month = first_month + months
+    end = date(day.year + (end_month - 1) // 12, (end_month - 1) % 12 + 1, 1)
+    return start, end
+
+
+class RegionalGenerationMixAggregateManager(models.Manager):
+    """Custom manager for monthly/quarterly regional generation mix averages"""
+
+    def refresh(self, from_dt: datetime, to_dt: datetime) -> int:
+        """
+        Recompute the monthly and quarterly averages touching the period.
+
+        :return: Number of aggregate rows written
+        """
+        written = 0
+        for period, _ in AGGREGATE_PERIODS:
+            start, _ = period_bounds(from_dt.date(), period)
+            last, _ = period_bounds(to_dt.date(), period)
+            while start <= last:
+                _, end = period_bounds(start, period)
+                averages = (
+                    RegionalGenerationMix.objects.filter(
+                        from_datetime__gte=datetime.combine(start, time.min, tz.utc),
+                        from_datetime__lt=datetime.combine(end, time.min, tz.utc),
+                    )
+                    .order_by()
+                    .values("region_id")
+                    .annotate(
+                        count=Count("id"), **{fuel: Avg(fuel) for fuel in FUEL_TYPES}
+                    )
+                )
+                instances = [
+                    RegionalGenerationMixAggregate(
+                        period=period, period_start=start, **row
+                    )
+                    for row in averages
+                ]
+                with transaction.atomic():
+                    self.filter(period=period, period_start=start).delete()
+                    self.bulk_create(instances)
+                written += len(instances)
+                start = end
+        return written
+
+    def get_quarter(self, year: int, quarter: int, period: str = "month") -> dict:
+        """
+        Averages for a quarter as ``{period: {region_id: {fuel: percentage}}}``,
+        matching the layout of ``monthly_generation_averages.json``.
+        """
+        start, end = period_bounds(date(year, (quarter - 1) * 3 + 1, 1), "quarter")
+        rows = self.filter(
+            period=period, period_start__gte=start, period_start__lt=end
+        ).order_by("period_start", "region_id")
+
+        result = {}
+        for row in rows:
+            key = (
+                f"{row.period_start:%Y-%m}"
+                if period == "month"
+                else f"{year}-Q{quarter}"
+            )
+            result.setdefault(key, {})[str(row.region_id)] = {
+                fuel: round(value, 1) for fuel, value in row.fuel_mix.items()
+            }
+        return result
+
+
+class RegionalGenerationMixAggregate(FuelMix):
+    """Stores average regional generation mix per month or quarter"""
+
+    period = models.CharField(max_length=7, choices=AGGREGATE_PERIODS)
+    period_start = models.DateField()
+    region = models.ForeignKey(
+        Region, on_delete=models.CASCADE, related_name="generation_mix_aggregates"
+    )
+    count = models.IntegerField()
+
+    objects = RegionalGenerationMixAggregateManager()
+
+    class Meta:
+        ordering = ["-period_start"]
+        unique_together = [
+            ("period", "period_start", "region"),
+        ]
+
+    def __str__(self):
+        return f"{self.get_period_display()} generation mix for {self.region} from {self.period_start}"
+
+
+class PackedCarbonIntensityManager(models.Manager):
+    """Custom manager for packed month-per-row carbon intensity arrays"""
+
+    def pack_period(
+        self, from_dt: datetime, to_dt: datetime, region_id: int = None
+    ) -> int:
+        """
+        (Re)pack stored half-hourly rows for every month touching the period.
+
+        :return: Number of month rows written
+        """
+        start = packing.month_start(from_dt)
+        end = packing.next_month(packing.month_start(to_dt))
+        rows = CarbonIntensity.objects.filter(
+            from_datetime__gte=start,
+            from_datetime__lt=end,
+            postcode_prefix__isnull=True,
+        )
+        if region_id:
+            rows = rows.filter(region_id=region_id)
+        else:
+            rows = rows.filter(region__isnull=True)
+
+        months = packing.pack_rows(
+            rows.values_list("from_datetime", "actual", "forecast", "index")
+        )
+        for month, (actual, forecast, index) in months.items():
+            self.update_or_create(
+                month=month.date(),
+                region_id=region_id or None,
+                defaults={
+                    "actual": actual.tobytes(),
+                    "forecast": forecast.tobytes(),
+                    "index": index.tobytes(),
+                },
+            )
+        bump_data_version(DATA_VERSION)
+        return len(months)
+
+    def get_for_period(
+        self,
+        from_dt: datetime,
+        to_dt: datetime,
+        region_id: int = None,
+        after: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> List[dict]:
+        """
+        Unpacked rows in the same shape as ``CarbonIntensitySerializer``.
+
+        :param after: Only return periods starting after this (a page cursor),
+            month rows before it are not read
+        :param limit: Stop reading month rows once this many rows are unpacked
+        """
+        start = packing.as_utc(from_dt)
+        if after is not None:
+            start = max(start, packing.as_utc(after))
+        qs = self.filter(
+            month__gte=packing.month_start(start).date(),
+            month__lte=packing.month_start(to_dt).date(),
+        )
+        region = None
+        if region_id:
+            qs = qs.filter(region_id=region_id)
+            region = get_region(region_id)
+        else:
+            qs = qs.filter(region__isnull=True)
+
+        months = []
+        count = 0
+        for month, actual, forecast, index in (
+            qs.order_by("month")
+            .values_list("month", "actual", "forecast", "index")
+            .iterator(chunk_size=12)
+        ):
+            packed_row = (datetime(month.year, month.month, 1), actual, forecast, index)
+            months.append(packing.unpack_series([packed_row], from_dt, to_dt, after))
+            count += len(months[-1][0])
+            if limit is not None and count >= limit:
+                break
+        if not months:
+            return []
+        series = [np.concatenate(parts)[:limit] for parts in zip(*months)]
+        return packing.series_to_rows(*series, region=region)
+
+
+class PackedCarbonIntensity(models.Model):
+    """Stores one month of half-hourly carbon intensity as packed arrays"""
+
+    month = models.DateField()
+    region = models.ForeignKey(
+        Region,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="packed_intensity_data",
+    )
+    actual = models.BinaryField()
+    forecast = models.BinaryField()
+    index = models.BinaryField()
+
+    objects = PackedCarbonIntensityManager()
+
+    class Meta:
+        verbose_name_plural = "Packed Carbon Intensities"
+        ordering = ["month"]
+        unique_together = [
+            ("month", "region"),
+        ]
+
+    def __str__(self):
+        location = self.region or "National"
+        return f"Packed Carbon Intensity for {location} in {self.month:%Y-%m}"
+
+
+class IntensityRollupManager(models.Manager):
+    """Custom manager for downsampled carbon intensity rollups"""
+
+    def refresh(
+        self,
+        from_dt: datetime,
+        to_dt: datetime,
+        region_id: int = None,
+        complete_from: datetime = None,
+    ) -> int:
+        """
+        Recompute every rollup bucket touching the period from the raw rows.
+
+        :param complete_from: Leave buckets starting before this untouched
+        :return: Number of rollup rows written
+        """
+        span_start, span_end = rollups.bucket_span(from_dt, to_dt)
+        rows = CarbonIntensity.objects.filter(
+            from_datetime__gte=span_start,
+            from_datetime__lt=span_end,
+            postcode_prefix__isnull=True,
+        )
+        if region_id:
+            rows = rows.filter(region_id=region_id)
+        else:
+            rows = rows.filter(region__isnull=True)
+        rows = list(
+            rows.order_by("from_datetime").values_list(
+                "from_datetime", "actual", "forecast"
+            )
+        )
+        starts = [row[0] for row in rows]
+        # Upstream only publishes actuals after the fact, fall back to forecast.
+        values = np.array(
+            [
+                actual if actual is not None else forecast
+                for _, actual, forecast in rows
+            ],
+            dtype=float,
+        )
+
+        written = 0
+        for resolution in rollups.RESOLUTIONS:
+            groups = rollups.group_buckets(
+                starts, from_dt, to_dt, resolution, complete_from
+            )
+            instances = []
+            for start, positions in groups.items():
+                summary = rollups.summarise(values[positions])
+                instances.append(
+                    IntensityRollup(
+                        resolution=resolution,
+                        from_datetime=start,
+                        to_datetime=rollups.bucket_end(start, resolution),
+                        region_id=region_id or None,
+                        count=summary["count"],
+                        min_intensity=summary["min"],
+                        max_intensity=summary["max"],
+                        average_intensity=summary["mean"],
+                        p10_intensity=summary["p10"],
+                        p50_intensity=summary["p50"],
+                        p90_intensity=summary["p90"],
+                    )
+                )
+            with transaction.atomic():
+                existing = self.filter(
+                    resolution=resolution, from_datetime__in=list(groups)
+                )
+                if region_id:
+                    existing = existing.filter(region_id=region_id)
+                else:
+                    existing = existing.filter(region__isnull=True)
+                existing.delete()
+                self.bulk_create(instances)
+            written += len(instances)
+        bump_data_version(DATA_VERSION)
+        return written
+
+    def get_for_period(
+        self,
+        resolution: str,
+        from_dt: datetime,
+        to_dt: datetime,
+        region_id: int = None,
+    ) -> models.QuerySet:
+        qs = self.filter(
+            resolution=resolution,
+            from_datetime__gte=rollups.bucket_start(from_dt, resolution),
+            from_datetime__lt=to_dt,
+        )
+        if region_id:
+            qs = qs.filter(region_id=region_id)
+        else:
+            qs = qs.filter(region__isnull=True)
+        return qs.order_by("from_datetime")
+
+
+class IntensityRollup(models.Model):
+    """Stores downsampled carbon intensity statistics for long-range charts"""
+
+    from_datetime = models.DateTimeField()
+    to_datetime = models.DateTimeField()
+    resolution = models.CharField(max_length=5, choices=rollups.RESOLUTION_CHOICES)
+    region = models.ForeignKey(
+        Region,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="intensity_rollups",
+    )
+    count = models.IntegerField()
+    min_intensity = models.IntegerField(null=True, blank=True)
+    max_intensity = models.IntegerField(null=True, blank=True)
+    average_intensity = models.FloatField(null=True, blank=True)
+    p10_intensity = models.FloatField(null=True, blank=True)
+    p50_intensity = models.FloatField(null=True, blank=True)
+    p90_intensity = models.FloatField(null=True, blank=True)
+
+    objects = IntensityRollupManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["resolution", "region", "from_datetime"]),
+        ]
+        ordering = ["-from_datetime"]
+        unique_together = [
+            ("resolution", "from_datetime", "region"),
+        ]
+
+    def __str__(self):
+        location = self.region or "National"
+        return (
+            f"{self.resolution.title()} rollup for {location} at {self.from_datetime}"
+        )
+
+
+class GenerationMixRollupManager(models.Manager):
+    """Custom manager for downsampled generation mix rollups"""
+
+    def refresh(
+        self, from_dt: datetime, to_dt: datetime, complete_from: datetime = None
+    ) -> int:
+        """
+        Recompute every rollup bucket touching the period from the raw rows.
+
+        :param complete_from: Leave buckets starting before this untouched
+        :return: Number of rollup rows written
+        """
+        span_start, span_end = rollups.bucket_span(from_dt, to_dt)
+        rows = list(
+            GenerationMix.objects.filter(
+                from_datetime__gte=span_start, from_datetime__lt=span_end
+            )
+            .order_by("from_datetime")
+            .values_list("from_datetime", *FUEL_TYPES)
+        )
+        starts = [row[0] for row in rows]
+        columns = np.array([row[1:] for row in rows], dtype=float).reshape(
+            len(rows), len(FUEL_TYPES)
+        )
+        values = {fuel: columns[:, i] for i, fuel in enumerate(FUEL_TYPES)}
+        fuels = [fuel for fuel in FUEL_TYPES if not np.isnan(values[fuel]).all()]
+
+        written = 0
+        for resolution in rollups.RESOLUTIONS:
+            groups = rollups.group_buckets(
+                starts, from_dt, to_dt, resolution, complete_from
+            )
+            instances = [
+                GenerationMixRollup(
+                    resolution=resolution,
+                    from_datetime=start,
+                    to_datetime=rollups.bucket_end(start, resolution),
+                    count=len(positions),
+                    fuel_mix={
+                        fuel: rollups.summarise(values[fuel][positions])
+                        for fuel in fuels
+                    },
+                )
+                for start, positions in groups.items()
+            ]
+            with transaction.atomic():
+                self.filter(
+                    resolution=resolution, from_datetime__in=list(groups)
+                ).delete()
+                self.bulk_create(instances)
+            written += len(instances)
+        bump_data_version(GENERATION_MIX_DATA_VERSION)
+        return written
+
+    def get_for_period(
+        self, resolution: str, from_dt: datetime, to_dt: datetime
+    ) -> models.QuerySet:
+        return self.filter(
+            resolution=resolution,
+            from_datetime__gte=rollups.bucket_start(from_dt, resolution),
+            from_datetime__lt=to_dt,
+        ).order_by("from_datetime")
+
+
+class GenerationMixRollup(models.Model):
+    """Stores downsampled generation mix statistics per fuel type"""
+
+    from_datetime = models.DateTimeField()
+    to_datetime = models.DateTimeField()
+    resolution = models.CharField(max_length=5, choices=rollups.RESOLUTION_CHOICES)
+    count = models.IntegerField()
+    fuel_mix = models.JSONField()  # {fuel_type: {min, max, mean, p10, p50, p90}}
+
+    objects = GenerationMixRollupManager()
+
+    class Meta:
+        ordering = ["-from_datetime"]
+        unique_together = [
+            ("resolution", "from_datetime"),
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.resolution.title()} generation mix rollup at {self.from_datetime}"
+        )
 
 
 class CarbonIntensityStatsManager(models.Manager):
@@ -262,6 +848,95 @@ class CarbonIntensityStatsManager(models.Manager):
         cache.set(cache_key, qs, CACHE_TTL)
         return qs
 
+    def compute(
+        self, from_dt: datetime, to_dt: datetime, block_hours: int = None
+    ) -> List["CarbonIntensityStats"]:
+        """
+        Statistics for the window computed from stored national intensity.
+
+        Upstream is only called when stored coverage of the window is
+        incomplete. Results are saved one row per block, updating any
+        existing row for the same window and block size.
+        """
+        cache_key = f"carbon_stats_computed_{from_dt}_{to_dt}_{block_hours}".replace(
+            " ", "_"
+        ).replace(":", "-")
+        cached = cache.get(cache_key)
+
+        if cached is not None:
+            return cached
+
+        blocks = self._compute_from_stored(from_dt, to_dt, block_hours)
+        if blocks is None:
+            logger.debug("Stored intensity incomplete, fetching upstream stats")
+            blocks = self._fetch_upstream(from_dt, to_dt, block_hours)
+
+        instances = []
+        for block in blocks:
+            instance, _ = self.update_or_create(
+                from_datetime=block["from_datetime"],
+                to_datetime=block["to_datetime"],
+                block_hours=block_hours,
+                defaults={
+                    "min_intensity": block["min_intensity"],
+                    "max_intensity": block["max_intensity"],
+                    "average_intensity": block["average_intensity"],
+                },
+            )
+            instances.append(instance)
+
+        if instances:
+            cache.set(cache_key, instances, CACHE_TTL)
+        return instances
+
+    def _compute_from_stored(
+        self, from_dt: datetime, to_dt: datetime, block_hours: int = None
+    ) -> Optional[List[dict]]:
+        index = get_series_index()
+        blocks = []
+        for block_from, block_to in stats.block_windows(from_dt, to_dt, block_hours):
+            window = index.window(block_from, block_to)
+            if not window or window["count"] < stats.expected_periods(
+                block_from, block_to
+            ):
+                return None
+            blocks.append(
+                {
+                    "from_datetime": block_from,
+                    "to_datetime": block_to,
+                    "min_intensity": window["min_intensity"],
+                    "max_intensity": window["max_intensity"],
+                    "average_intensity": window["average_intensity"],
+                }
+            )
+        return blocks or None
+
+    def _fetch_upstream(
+        self, from_dt: datetime, to_dt: datetime, block_hours: int = None
+    ) -> List[dict]:
+        service = clients.CarbonIntensityService()
+        if block_hours:
+            response = service.get_statistics_block(from_dt, to_dt, block_hours)
+        else:
+            response = service.get_statistics(from_dt, to_dt)
+        if not response or "data" not in response:
+            return []
+
+        data = response["data"]
+        entries = data if isinstance(data, list) else [data]
+        return [
+            {
+                "from_datetime": parse_datetime(entry["from"])
+                if "from" in entry
+                else from_dt,
+                "to_datetime": parse_datetime(entry["to"]) if "to" in entry else to_dt,
+                "min_intensity": entry["min"],
+                "max_intensity": entry["max"],
+                "average_intensity": entry["average"],
+            }
+            for entry in entries
+        ]
+
 
 @dataclass
 class CarbonIntensityStatistics:
@@ -299,6 +974,15 @@ class CarbonIntensityStats(models.Model):
         unique_together = [
             ("from_datetime", "to_datetime", "block_hours"),
         ]
+        constraints = [
+            # NULLs are distinct in unique_together, so whole-window stats
+            # need their own constraint.
+            models.UniqueConstraint(
+                fields=["from_datetime", "to_datetime"],
+                condition=models.Q(block_hours__isnull=True),
+                name="carbon_stats_unique_window",
+            ),
+        ]
 
     def __str__(self):
         return f"Stats from {self.from_datetime} to {self.to_datetime}"
@@ -312,3 +996,78 @@ class CarbonIntensityStats(models.Model):
         """Override save to handle cache invalidation"""
         super().save(*args, **kwargs)
         cache.delete(f"carbon_stats_{self.from_datetime}_{self.to_datetime}")
+
+
+class IngestWatermarkManager(models.Manager):
+    """Custom manager for the latest ingested period of each series"""
+
+    def claim(self, series: str, from_dt: datetime, ttl: timedelta) -> bool:
+        """
+        Claim ingesting the series' period ``from_dt``.
+
+        The series' row is locked while claiming, so of overlapping runs on
+        any worker only one gets the claim. Returns False when the period is
+        already ingested, or claimed by a run that started less than ``ttl``
+        ago (an older claim is left by a run that died and is taken over).
+        """
+        now = datetime.now(tz.utc)
+        with transaction.atomic():
+            self.get_or_create(series=series)
+            watermark = self.select_for_update().get(series=series)
+            latest = watermark.latest_from_datetime
+            if latest is not None and latest >= from_dt:
+                return False
+            if (
+                watermark.claimed_from_datetime == from_dt
+                and watermark.claimed_at > now - ttl
+            ):
+                return False
+            watermark.claimed_from_datetime = from_dt
+            watermark.claimed_at = now
+            watermark.save(
+                update_fields=["claimed_from_datetime", "claimed_at", "modified"]
+            )
+        return True
+
+    def release(self, series: str, from_dt: datetime) -> None:
+        """Drop a claim on ``from_dt``, so a retry can claim it again."""
+        self.filter(series=series, claimed_from_datetime=from_dt).update(
+            claimed_from_datetime=None, claimed_at=None
+        )
+
+    def advance(self, series: str, from_dt: datetime) -> None:
+        """Move the series' watermark to ``from_dt``, never backwards."""
+        watermark, created = self.get_or_create(
+            series=series, defaults={"latest_from_datetime": from_dt}
+        )
+        if not created:
+            # Conditional so overlapping runs can't move it back.
+            self.filter(pk=watermark.pk).filter(
+                models.Q(latest_from_datetime__lt=from_dt)
+                | models.Q(latest_from_datetime__isnull=True)
+            ).update(latest_from_datetime=from_dt, modified=datetime.now(tz.utc))
+
+    def get_latest(self, series: str) -> Optional[datetime]:
+        return (
+            self.filter(series=series)
+            .values_list("latest_from_datetime", flat=True)
+            .first()
+        )
+
+
+class IngestWatermark(models.Model):
+    """Stores the start of the latest period ingested for each series"""
+
+    # e.g. "intensity:national", "intensity:region:3", "generation_mix"
+    series = models.CharField(max_length=64, unique=True)
+    # Null until the series' first period is ingested.
+    latest_from_datetime = models.DateTimeField(null=True)
+    # The period a run is ingesting, and when it claimed it.
+    claimed_from_datetime = models.DateTimeField(null=True)
+    claimed_at = models.DateTimeField(null=True)
+    modified = models.DateTimeField(auto_now=True)
+
+    objects = IngestWatermarkManager()
+
+    def __str__(self):
+        return f"{self.series} ingested up to {self.latest_from_datetime}"
@@ -0,0 +1,174 @@
+"""Packed month-per-row storage for the half-hourly carbon intensity series.
+
+Each ``PackedCarbonIntensity`` row holds one calendar month (UTC) for one
+region (or national when ``region`` is null) as fixed-length arrays of
+``31 * 48`` slots: int16 ``actual``/``forecast`` and a uint8 ``index`` code.
+Slots beyond the end of shorter months are padding and are never returned.
+"""
+
+import calendar
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+SLOTS_PER_DAY = 48
+SLOTS_PER_MONTH = 31 * SLOTS_PER_DAY
+
+MISSING_VALUE = np.iinfo(np.int16).min
+MISSING_INDEX = np.iinfo(np.uint8).max
+
+# Order matches CarbonIntensity.INTENSITY_INDEXES, the code is the position.
+INDEX_VALUES = ["very low", "low", "moderate", "high", "very high"]
+INDEX_LABELS = ["Very Low", "Low", "Moderate", "High", "Very High"]
+INDEX_CODES = {value: code for code, value in enumerate(INDEX_VALUES)}
+
+
+def as_utc(dt: datetime) -> datetime:
+    """Treat naive datetimes as UTC and convert aware ones to UTC."""
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def month_start(dt: datetime) -> datetime:
+    dt = as_utc(dt)
+    return dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def next_month(dt: datetime) -> datetime:
+    if dt.month == 12:
+        return dt.replace(year=dt.year + 1, month=1)
+    return dt.replace(month=dt.month + 1)
+
+
+def month_slot(dt: datetime) -> int:
+    """Position of a settlement period within its month's arrays."""
+    dt = as_utc(dt)
+    return (dt.day - 1) * SLOTS_PER_DAY + dt.hour * 2 + dt.minute // 30
+
+
+def empty_month() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    return (
+        np.full(SLOTS_PER_MONTH, MISSING_VALUE, dtype=np.int16),
+        np.full(SLOTS_PER_MONTH, MISSING_VALUE, dtype=np.int16),
+        np.full(SLOTS_PER_MONTH, MISSING_INDEX, dtype=np.uint8),
+    )
+
+
+def pack_rows(
+    rows: Iterable[Tuple[datetime, Optional[int], Optional[int], str]],
+    months: Optional[Dict[datetime, Tuple[np.ndarray, np.ndarray, np.ndarray]]] = None,
+) -> Dict[datetime, Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Write ``(from_datetime, actual, forecast, index)`` rows into month arrays.
+
+    :param rows: Rows from the ``CarbonIntensity`` table (any order)
+    :param months: Existing month arrays to merge into, keyed by month start
+    :return: Month arrays keyed by month start
+    """
+    months = {} if months is None else months
+    for from_dt, actual, forecast, index in rows:
+        key = month_start(from_dt)
+        if key not in months:
+            months[key] = empty_month()
+        actual_arr, forecast_arr, index_arr = months[key]
+        slot = month_slot(from_dt)
+        actual_arr[slot] = MISSING_VALUE if actual is None else actual
+        forecast_arr[slot] = MISSING_VALUE if forecast is None else forecast
+        index_arr[slot] = INDEX_CODES.get(index, MISSING_INDEX)
+    return months
+
+
+def _format_datetimes(values: np.ndarray) -> List[str]:
+    # Matches DRF's DateTimeField output for UTC values, e.g. 2025-01-01T00:00:00Z
+    return [f"{value}Z" for value in np.datetime_as_string(values, unit="s")]
+
+
+def unpack_series(
+    packed_rows: List[Tuple[datetime, bytes, bytes, bytes]],
+    from_dt: datetime,
+    to_dt: datetime,
+    after: Optional[datetime] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Decode month rows into flat arrays restricted to ``[from_dt, to_dt]``.
+
+    :param packed_rows: ``(month, actual, forecast, index)`` ordered by month
+    :param after: Only keep periods starting strictly after this, for paging
+    :return: ``(from_datetimes, actual, forecast, index_codes)`` for every
+        populated slot whose period lies inside the window
+    """
+    if not packed_rows:
+        empty = np.array([], dtype="datetime64[s]")
+        return (
+            empty,
+            np.array([], np.int16),
+            np.array([], np.int16),
+            np.array([], np.uint8),
+        )
+
+    actual = np.frombuffer(b"".join(bytes(row[1]) for row in packed_rows), np.int16)
+    forecast = np.frombuffer(b"".join(bytes(row[2]) for row in packed_rows), np.int16)
+    index = np.frombuffer(b"".join(bytes(row[3]) for row in packed_rows), np.uint8)
+
+    month_starts = np.array(
+        [np.datetime64(as_utc(row[0]).replace(tzinfo=None), "s") for row in packed_rows]
+    )
+    month_lengths = np.array(
+        [
+            calendar.monthrange(row[0].year, row[0].month)[1] * SLOTS_PER_DAY
+            for row in packed_rows
+        ]
+    )
+    offsets = np.tile(np.arange(SLOTS_PER_MONTH), len(packed_rows))
+    starts = np.repeat(month_starts, SLOTS_PER_MONTH) + offsets * np.timedelta64(
+        30, "m"
+    )
+
+    window_from = np.datetime64(as_utc(from_dt).replace(tzinfo=None), "s")
+    window_to = np.datetime64(as_utc(to_dt).replace(tzinfo=None), "s")
+    if after is not None:
+        window_from = max(
+            window_from,
+            np.datetime64(as_utc(after).replace(tzinfo=None), "s")
+            + np.timedelta64(1, "s"),
+        )
+    mask = (
+        (offsets < np.repeat(month_lengths, SLOTS_PER_MONTH))
+        & (starts >= window_from)
+        & (starts + np.timedelta64(30, "m") <= window_to)
+        & (
+            (actual != MISSING_VALUE)
+            | (forecast != MISSING_VALUE)
+            | (index != MISSING_INDEX)
+        )
+    )
+    return starts[mask], actual[mask], forecast[mask], index[mask]
+
+
+def series_to_rows(
+    starts: np.ndarray,
+    actual: np.ndarray,
+    forecast: np.ndarray,
+    index: np.ndarray,
+    region: Optional[dict] = None,
+) -> List[dict]:
+    """Build rows in the same shape as ``CarbonIntensitySerializer`` output."""
+    from_strings = _format_datetimes(starts)
+    to_strings = _format_datetimes(starts + np.timedelta64(30, "m"))
+    labels = INDEX_LABELS + [None] * (MISSING_INDEX + 1 - len(INDEX_LABELS))
+    actual_values = [None if v == MISSING_VALUE else v for v in actual.tolist()]
+    forecast_values = [None if v == MISSING_VALUE else v for v in forecast.tolist()]
+    return [
+        {
+            "from_datetime": from_strings[i],
+            "to_datetime": to_strings[i],
+            "actual": actual_values[i],
+            "forecast": forecast_values[i],
+            "index": labels[code],
+            "region": region,
+            "postcode_prefix": None,
+        }
+        for i, code in enumerate(index.tolist())
+    ]
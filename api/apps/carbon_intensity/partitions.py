@@ -0,0 +1,126 @@
+"""Monthly range partitions of the carbon intensity table (Postgres only).
+
+Migration 0006 turns ``carbon_intensity_carbonintensity`` into a table
+partitioned by month on ``from_datetime``, with a default partition catching
+rows outside every month's range. Range queries only scan the months they
+cover, and old months can be detached (and archived or dropped) without
+touching the rest of the table.
+
+Partitions are created ahead of time by ``ensure_partitions`` (the
+``manage_partitions`` command and the daily ``ensure_intensity_partitions``
+task). Creating a month moves any of its rows out of the default partition.
+"""
+
+from datetime import date, datetime, timezone
+from typing import List
+
+from django.db import transaction
+
+TABLE = "carbon_intensity_carbonintensity"
+DEFAULT_PARTITION = f"{TABLE}_default"
+
+
+def month_start(value) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{TABLE}_p{month:%Y_%m}"
+
+
+def _bound(month: date) -> datetime:
+    return datetime(month.year, month.month, 1, tzinfo=timezone.utc)
+
+
+def is_partitioned(connection) -> bool:
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT EXISTS (
+                SELECT 1 FROM pg_partitioned_table
+                WHERE partrelid = to_regclass(%s)
+            )
+            """,
+            [TABLE],
+        )
+        return cursor.fetchone()[0]
+
+
+def list_partitions(connection) -> List[dict]:
+    """Each partition's name, bounds, estimated rows and size in bytes."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname,
+                   pg_get_expr(child.relpartbound, child.oid),
+                   child.reltuples::bigint,
+                   pg_total_relation_size(child.oid)
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = to_regclass(%s)
+            ORDER BY child.relname
+            """,
+            [TABLE],
+        )
+        return [
+            {"name": name, "bounds": bounds, "rows": max(rows, 0), "bytes": size}
+            for name, bounds, rows, size in cursor.fetchall()
+        ]
+
+
+def create_partition(connection, month: date) -> bool:
+    """Create the partition for ``month``, returning False if it exists."""
+    name = partition_name(month)
+    start, end = _bound(month), _bound(add_months(month, 1))
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [name])
+        if cursor.fetchone()[0]:
+            return False
+        cursor.execute(
+            f"CREATE TABLE {name} (LIKE {TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+        # Attaching checks the default partition holds no rows of this month.
+        cursor.execute(
+            f"""
+            WITH moved AS (
+                DELETE FROM {DEFAULT_PARTITION}
+                WHERE from_datetime >= %s AND from_datetime < %s
+                RETURNING *
+            )
+            INSERT INTO {name} SELECT * FROM moved
+            """,
+            [start, end],
+        )
+        cursor.execute(
+            f"ALTER TABLE {TABLE} ATTACH PARTITION {name} FOR VALUES FROM (%s) TO (%s)",
+            [start, end],
+        )
+    return True
+
+
+def ensure_partitions(connection, start: date, end: date) -> List[str]:
+    """Create any missing partitions for the months ``start`` to ``end``."""
+    created = []
+    month = month_start(start)
+    while month <= month_start(end):
+        if create_partition(connection, month):
+            created.append(partition_name(month))
+        month = add_months(month, 1)
+    return created
+
+
+def detach_partition(connection, month: date, drop: bool = False) -> str:
+    """Detach the partition for ``month`` so it can be archived or dropped."""
+    name = partition_name(month)
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {TABLE} DETACH PARTITION {name}")
+        if drop:
+            cursor.execute(f"DROP TABLE {name}")
+    return name
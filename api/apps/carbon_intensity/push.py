@@ -0,0 +1,183 @@
+"""Push channels for the latest national intensity and generation mix.
+
+* ``latest`` endpoints carry an ETag built from the newest row's
+  ``from_datetime`` and ``modified``, so every process agrees on it, and
+  answer ``If-None-Match`` with 304. In ASGI mode the async ``latest`` views
+  also take ``?wait=<seconds>`` and long-poll until the ETag moves on; the
+  sync viewsets ignore it rather than hold a worker.
+* ``stream_latest`` is a Server-Sent Events view for ASGI deployments. One
+  broadcaster task per process polls the data versions the ingest tasks bump
+  on every write and wakes every open stream, so idle connections cost a
+  coroutine each and no queries.
+"""
+
+import asyncio
+import json
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from django.db import models
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+from apps.core.utils.data_versions import get_data_version
+
+from .models import GENERATION_MIX_DATA_VERSION, CarbonIntensity, GenerationMix
+from .serializers import CarbonIntensitySerializer, GenerationMixSerializer
+from .series_index import DATA_VERSION as CARBON_INTENSITY_DATA_VERSION
+
+CARBON_INTENSITY_EVENT = "carbon-intensity"
+GENERATION_MIX_EVENT = "generation-mix"
+
+EVENT_VERSIONS = {
+    CARBON_INTENSITY_EVENT: CARBON_INTENSITY_DATA_VERSION,
+    GENERATION_MIX_EVENT: GENERATION_MIX_DATA_VERSION,
+}
+
+
+LATEST_INSTANCES: Dict[str, Callable[[], Optional[models.Model]]] = {
+    CARBON_INTENSITY_EVENT: CarbonIntensity.objects.latest_national_intensity,
+    GENERATION_MIX_EVENT: GenerationMix.objects.get_latest_mix,
+}
+
+LATEST_SERIALIZERS = {
+    CARBON_INTENSITY_EVENT: CarbonIntensitySerializer,
+    GENERATION_MIX_EVENT: GenerationMixSerializer,
+}
+
+
+def serialize_latest(event: str, instance: Optional[models.Model]) -> Optional[dict]:
+    return LATEST_SERIALIZERS[event](instance).data if instance else None
+
+
+def load_latest(event: str) -> Optional[dict]:
+    return serialize_latest(event, LATEST_INSTANCES[event]())
+
+
+def get_etag(event: str, instance: Optional[models.Model]) -> Optional[str]:
+    """ETag of ``instance``, the latest row served for ``event``."""
+    if instance is None:
+        return None
+    return '"{}-{}-{}"'.format(
+        event,
+        int(instance.from_datetime.timestamp()),
+        int(instance.modified.timestamp() * 1000),
+    )
+
+
+async def wait_for_change(
+    event: str, etag: str, timeout: float
+) -> Optional[models.Model]:
+    """
+    Wait until the latest row for ``event`` no longer matches ``etag`` or
+    ``timeout`` seconds have passed, returning the latest row.
+    """
+    get_latest = sync_to_async(LATEST_INSTANCES[event])
+    deadline = time.monotonic() + timeout
+    instance = await get_latest()
+    while get_etag(event, instance) == etag and time.monotonic() < deadline:
+        await asyncio.sleep(settings.PUSH_POLL_INTERVAL)
+        instance = await get_latest()
+    return instance
+
+
+class LatestBroadcaster:
+    """Polls data versions once per process and fans changes out to streams."""
+
+    def __init__(self):
+        self.versions: Dict[str, int] = {}
+        # event -> (version, JSON payload)
+        self.payloads: Dict[str, Tuple[int, str]] = {}
+        self.generation = 0
+        self.condition = None
+        self.task = None
+        self.loop = None
+
+    def poll(self) -> bool:
+        """Reload payloads whose version moved, returning whether any changed."""
+        changed = False
+        for event in LATEST_INSTANCES:
+            version = get_data_version(EVENT_VERSIONS[event])
+            if self.versions.get(event) == version:
+                continue
+            self.versions[event] = version
+            payload = json.dumps(
+                load_latest(event), cls=JSONEncoder, separators=(",", ":")
+            )
+            # Writes that leave the latest row as it was are not news.
+            if event not in self.payloads or self.payloads[event][1] != payload:
+                self.payloads[event] = (version, payload)
+                changed = True
+        return changed
+
+    async def _run(self):
+        while True:
+            if await sync_to_async(self.poll)():
+                async with self.condition:
+                    self.generation += 1
+                    self.condition.notify_all()
+            await asyncio.sleep(settings.PUSH_POLL_INTERVAL)
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        if self.task is None or self.task.done() or self.loop is not loop:
+            self.loop = loop
+            self.condition = asyncio.Condition()
+            await sync_to_async(self.poll)()
+            self.task = loop.create_task(self._run())
+
+    async def events(self, events):
+        """Server-Sent Events for ``events``, current payloads first."""
+        await self.start()
+        sent: Dict[str, int] = {}
+        while True:
+            seen = self.generation
+            for event in events:
+                version, payload = self.payloads.get(event, (None, None))
+                if version is not None and sent.get(event) != version:
+                    sent[event] = version
+                    yield f"event: {event}\nid: {version}\ndata: {payload}\n\n"
+            try:
+                async with self.condition:
+                    await asyncio.wait_for(
+                        self.condition.wait_for(lambda: self.generation != seen),
+                        settings.SSE_HEARTBEAT_INTERVAL,
+                    )
+            except asyncio.TimeoutError:
+                # Comment lines keep proxies from closing idle streams.
+                yield ": keepalive\n\n"
+
+
+broadcaster = LatestBroadcaster()
+
+
+async def stream_latest(request):
+    """
+    Server-Sent Events with the latest national intensity and generation mix.
+
+    ``?events=carbon-intensity,generation-mix`` selects the streams (both by
+    default). Only served under ASGI, where an idle stream holds no worker.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {"detail": "Event streams are only available when served over ASGI."},
+            status=501,
+        )
+    events = request.GET.get("events", ",".join(LATEST_INSTANCES)).split(",")
+    unknown = set(events) - set(LATEST_INSTANCES)
+    if unknown:
+        return JsonResponse(
+            {"detail": f"Unknown events: {', '.join(sorted(unknown))}"}, status=400
+        )
+
+    response = StreamingHttpResponse(
+        broadcaster.events(events), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    # Stop nginx buffering the stream.
+    response["X-Accel-Buffering"] = "no"
+    return response
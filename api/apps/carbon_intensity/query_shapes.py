@@ -0,0 +1,67 @@
+"""The carbon intensity queries served by the API, for ``explain_queries``."""
+
+from datetime import datetime
+
+from django.conf import settings
+
+from . import packing
+from .models import (
+    CarbonIntensity,
+    GenerationMix,
+    GenerationMixRollup,
+    IntensityRollup,
+    PackedCarbonIntensity,
+)
+from .serializers import INTENSITY_ROW_FIELDS
+
+
+def get_query_shapes(from_dt: datetime, to_dt: datetime, region_id: int):
+    page_size = settings.TIME_SERIES_PAGE_SIZE
+    shapes = [
+        (
+            "CarbonIntensity.get_for_period (exists)",
+            CarbonIntensity.objects.filter(
+                from_datetime__gte=from_dt, to_datetime__lte=to_dt
+            ).values_list("pk")[:1],
+        ),
+        (
+            "CarbonIntensity.latest_national_intensity",
+            CarbonIntensity.objects.filter(region__isnull=True).order_by(
+                "-from_datetime"
+            )[:1],
+        ),
+        (
+            "PackedCarbonIntensity.get_for_period",
+            PackedCarbonIntensity.objects.filter(
+                month__gte=packing.month_start(from_dt).date(),
+                month__lte=packing.month_start(to_dt).date(),
+                region__isnull=True,
+            )
+            .order_by("month")
+            .values_list("month", "actual", "forecast", "index"),
+        ),
+        (
+            "IntensityRollup.get_for_period",
+            IntensityRollup.objects.get_for_period("day", from_dt, to_dt),
+        ),
+        (
+            "GenerationMix.get_latest_mix",
+            GenerationMix.objects.order_by("-from_datetime")[:1],
+        ),
+        (
+            "GenerationMixRollup.get_for_period",
+            GenerationMixRollup.objects.get_for_period("day", from_dt, to_dt),
+        ),
+    ]
+    # A page of the keyset paginated list endpoint, national and regional.
+    for name, region in (("national", None), ("regional", region_id)):
+        queryset = CarbonIntensity.objects.period_queryset(from_dt, to_dt, region)
+        shapes.append(
+            (
+                f"CarbonIntensityViewSet.list ({name} page)",
+                queryset.order_by("from_datetime", "id").values_list(
+                    *INTENSITY_ROW_FIELDS
+                )[:page_size],
+            )
+        )
+    return shapes
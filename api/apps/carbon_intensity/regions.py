@@ -0,0 +1,58 @@
+"""Process-wide registry of regions for nesting in serialized rows.
+
+There are only a handful of regions, so they are loaded once per process and
+reloaded when the ``region`` data version changes (it is bumped whenever a
+region is saved or deleted). Serializers look regions up here rather than
+joining or querying per row.
+"""
+
+import threading
+from typing import Dict, Optional
+
+from apps.core.utils.data_versions import get_data_version
+
+DATA_VERSION = "region"
+
+REGION_FIELDS = ["region_id", "name", "postcode_prefix", "short_name"]
+
+_registry = {"version": None, "regions": {}}
+_lock = threading.Lock()
+
+
+def _load(version: int):
+    # Imported here, models import this module for its data version name.
+    from .models import Region
+
+    _registry["regions"] = {
+        region["region_id"]: region
+        for region in Region.objects.order_by().values(*REGION_FIELDS)
+    }
+    _registry["version"] = version
+
+
+def get_regions() -> Dict[int, dict]:
+    """``{region_id: serialized region}``, shared and not to be mutated."""
+    version = get_data_version(DATA_VERSION)
+    with _lock:
+        if _registry["version"] != version:
+            _load(version)
+        return _registry["regions"]
+
+
+def get_region(region_id: Optional[int]) -> Optional[dict]:
+    """Serialized region, reloading once if it is not known yet."""
+    if region_id is None:
+        return None
+    region_id = int(region_id)
+    region = get_regions().get(region_id)
+    if region is None:
+        with _lock:
+            _load(_registry["version"])
+            region = _registry["regions"].get(region_id)
+    return region
+
+
+def clear_regions():
+    with _lock:
+        _registry["version"] = None
+        _registry["regions"] = {}
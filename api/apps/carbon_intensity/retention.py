@@ -0,0 +1,170 @@
+"""Retention of the raw half-hourly data.
+
+Raw carbon intensity and generation mix rows, and hourly rollups, are kept for
+``RETENTION_RAW_MONTHS`` whole months. Before a month expires its rollups are
+recomputed from the raw rows (and it is packed, with packed storage enabled),
+so day, week and month resolutions keep serving it. Expired rows are deleted in
+chunks of ``RETENTION_CHUNK_SIZE`` with a ``RETENTION_CHUNK_PAUSE`` sleep
+between chunks, keeping locks, WAL bursts and replica lag small. On a
+partitioned table whole expired months are dropped instead.
+
+Computed statistics are a cache of upstream or series index results, rows
+not updated for ``RETENTION_STATS_DAYS`` are deleted. Tables rows were deleted
+from are vacuumed and analyzed on Postgres.
+"""
+
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import connection
+
+from apps.core.utils.data_versions import bump_data_version
+
+from . import packing, partitions, rollups
+from .models import (
+    GENERATION_MIX_DATA_VERSION,
+    CarbonIntensity,
+    CarbonIntensityStats,
+    GenerationMix,
+    GenerationMixRollup,
+    IntensityRollup,
+    PackedCarbonIntensity,
+)
+from .series_index import DATA_VERSION, REBUILD_DATA_VERSION
+
+logger = logging.getLogger(__name__)
+
+
+def raw_cutoff(now: Optional[datetime] = None) -> Optional[datetime]:
+    """Start of the oldest month kept, or None when raw data is kept forever."""
+    if not settings.RETENTION_RAW_MONTHS:
+        return None
+    month = packing.month_start(now or datetime.now(timezone.utc)).date()
+    month = partitions.add_months(month, -settings.RETENTION_RAW_MONTHS)
+    return datetime(month.year, month.month, 1, tzinfo=timezone.utc)
+
+
+def delete_in_chunks(queryset) -> int:
+    """Delete the queryset's rows a chunk at a time, pausing between chunks."""
+    deleted = 0
+    while True:
+        pks = list(
+            queryset.order_by().values_list("pk", flat=True)[
+                : settings.RETENTION_CHUNK_SIZE
+            ]
+        )
+        if not pks:
+            return deleted
+        deleted += queryset.model.objects.filter(pk__in=pks).delete()[0]
+        time.sleep(settings.RETENTION_CHUNK_PAUSE)
+
+
+def _oldest(queryset) -> Optional[datetime]:
+    return (
+        queryset.order_by("from_datetime")
+        .values_list("from_datetime", flat=True)
+        .first()
+    )
+
+
+def _expiring_months(oldest: Optional[datetime], cutoff: datetime):
+    if oldest is None:
+        return
+    month = packing.month_start(oldest)
+    while month < cutoff:
+        yield month, packing.next_month(month) - timedelta(microseconds=1)
+        month = packing.next_month(month)
+
+
+def roll_up_expiring(cutoff: datetime) -> int:
+    """
+    Recompute the rollups of every month before the cutoff, a month at a time.
+
+    Buckets starting before the oldest stored raw row are left alone, earlier
+    runs deleted part of their raw rows after rolling them up.
+    """
+    written = 0
+    intensity = CarbonIntensity.objects.filter(
+        from_datetime__lt=cutoff, postcode_prefix__isnull=True
+    )
+    region_ids = intensity.order_by().values_list("region_id", flat=True).distinct()
+    for region_id in list(region_ids):
+        regional = intensity.filter(region_id=region_id)
+        oldest = _oldest(regional)
+        for month, end in _expiring_months(oldest, cutoff):
+            written += IntensityRollup.objects.refresh(
+                month, end, region_id, complete_from=oldest
+            )
+            if settings.CARBON_INTENSITY_PACKED_STORAGE:
+                PackedCarbonIntensity.objects.pack_period(month, end, region_id)
+
+    mix = GenerationMix.objects.filter(from_datetime__lt=cutoff)
+    oldest = _oldest(mix)
+    for month, end in _expiring_months(oldest, cutoff):
+        written += GenerationMixRollup.objects.refresh(month, end, complete_from=oldest)
+    return written
+
+
+def drop_expired_partitions(cutoff: datetime) -> List[str]:
+    """Drop the partitions of months before the cutoff (Postgres only)."""
+    if not partitions.is_partitioned(connection):
+        return []
+    dropped = []
+    for partition in partitions.list_partitions(connection):
+        if partition["name"] == partitions.DEFAULT_PARTITION:
+            continue
+        month = datetime.strptime(partition["name"][-7:], "%Y_%m").date()
+        if month < cutoff.date():
+            dropped.append(partitions.detach_partition(connection, month, drop=True))
+    return dropped
+
+
+def vacuum(models):
+    if connection.vendor != "postgresql":
+        return
+    with connection.cursor() as cursor:
+        for model in models:
+            cursor.execute(f"VACUUM (ANALYZE) {model._meta.db_table}")
+
+
+def apply_retention(now: Optional[datetime] = None) -> Dict[str, int]:
+    """Roll up and delete expired raw data and stale stats, returning counts."""
+    now = now or datetime.now(timezone.utc)
+    deleted = {}
+    cutoff = raw_cutoff(now)
+    if cutoff is not None:
+        rolled_up = roll_up_expiring(cutoff)
+        logger.info(f"Rolled up {rolled_up} buckets before {cutoff:%Y-%m}")
+        dropped = drop_expired_partitions(cutoff)
+        for name in dropped:
+            logger.info(f"Dropped partition {name}")
+        deleted[CarbonIntensity] = delete_in_chunks(
+            CarbonIntensity.objects.filter(from_datetime__lt=cutoff)
+        )
+        deleted[GenerationMix] = delete_in_chunks(
+            GenerationMix.objects.filter(from_datetime__lt=cutoff)
+        )
+        for model in (IntensityRollup, GenerationMixRollup):
+            deleted[model] = delete_in_chunks(
+                model.objects.filter(resolution=rollups.HOUR, from_datetime__lt=cutoff)
+            )
+        if dropped or deleted[CarbonIntensity]:
+            # In-process series indexes only pick up new rows when refreshed,
+            # rebuild them without the deleted ones.
+            bump_data_version(REBUILD_DATA_VERSION)
+            bump_data_version(DATA_VERSION)
+        if deleted[GenerationMix]:
+            bump_data_version(GENERATION_MIX_DATA_VERSION)
+
+    if settings.RETENTION_STATS_DAYS:
+        deleted[CarbonIntensityStats] = delete_in_chunks(
+            CarbonIntensityStats.objects.filter(
+                modified__lt=now - timedelta(days=settings.RETENTION_STATS_DAYS)
+            )
+        )
+
+    vacuum([model for model, count in deleted.items() if count])
+    return {model._meta.model_name: count for model, count in deleted.items()}
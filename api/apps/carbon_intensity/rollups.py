@@ -0,0 +1,126 @@
+"""Downsampled rollups of the half-hourly intensity and generation mix series.
+
+Rollups are kept per resolution (hour, day, week, month) and recomputed only
+for the buckets touched by newly ingested periods, so ingest cost stays
+proportional to the new data rather than the table size.
+"""
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .packing import as_utc, month_start, next_month
+
+RAW = "raw"
+HOUR = "hour"
+DAY = "day"
+WEEK = "week"
+MONTH = "month"
+
+RESOLUTIONS = [HOUR, DAY, WEEK, MONTH]
+RESOLUTION_CHOICES = [
+    (HOUR, "Hourly"),
+    (DAY, "Daily"),
+    (WEEK, "Weekly"),
+    (MONTH, "Monthly"),
+]
+
+# Approximate bucket lengths, only used to estimate point counts.
+RESOLUTION_LENGTHS = {
+    RAW: timedelta(minutes=30),
+    HOUR: timedelta(hours=1),
+    DAY: timedelta(days=1),
+    WEEK: timedelta(weeks=1),
+    MONTH: timedelta(days=30),
+}
+
+PERCENTILES = (10, 50, 90)
+
+
+def bucket_start(dt: datetime, resolution: str) -> datetime:
+    dt = as_utc(dt)
+    if resolution == HOUR:
+        return dt.replace(minute=0, second=0, microsecond=0)
+    if resolution == DAY:
+        return dt.replace(hour=0, minute=0, second=0, microsecond=0)
+    if resolution == WEEK:
+        day = dt.replace(hour=0, minute=0, second=0, microsecond=0)
+        return day - timedelta(days=day.weekday())
+    if resolution == MONTH:
+        return month_start(dt)
+    raise ValueError(f"Unknown rollup resolution: {resolution}")
+
+
+def bucket_end(start: datetime, resolution: str) -> datetime:
+    if resolution == MONTH:
+        return next_month(start)
+    return start + RESOLUTION_LENGTHS[resolution]
+
+
+def bucket_span(from_dt: datetime, to_dt: datetime) -> Tuple[datetime, datetime]:
+    """Span of raw data needed to recompute every bucket touching the period."""
+    start = min(bucket_start(from_dt, resolution) for resolution in RESOLUTIONS)
+    end = max(
+        bucket_end(bucket_start(to_dt, resolution), resolution)
+        for resolution in RESOLUTIONS
+    )
+    return start, end
+
+
+def pick_resolution(from_dt: datetime, to_dt: datetime, max_points: int) -> str:
+    """Finest resolution whose point count over the period fits the budget."""
+    period = as_utc(to_dt) - as_utc(from_dt)
+    for resolution in [RAW, *RESOLUTIONS]:
+        if period / RESOLUTION_LENGTHS[resolution] <= max_points:
+            return resolution
+    return MONTH
+
+
+def summarise(values: np.ndarray) -> Dict[str, Optional[float]]:
+    """Min/max/mean/percentiles of a bucket, ignoring missing (NaN) values."""
+    values = values[~np.isnan(values)]
+    if not values.size:
+        return {
+            "count": 0,
+            "min": None,
+            "max": None,
+            "mean": None,
+            **{f"p{p}": None for p in PERCENTILES},
+        }
+    percentiles = np.percentile(values, PERCENTILES)
+    return {
+        "count": int(values.size),
+        "min": float(values.min()),
+        "max": float(values.max()),
+        "mean": round(float(values.mean()), 2),
+        **{f"p{p}": round(float(v), 2) for p, v in zip(PERCENTILES, percentiles)},
+    }
+
+
+def group_buckets(
+    starts: List[datetime],
+    from_dt: datetime,
+    to_dt: datetime,
+    resolution: str,
+    complete_from: Optional[datetime] = None,
+) -> Dict[datetime, List[int]]:
+    """
+    Positions of ``starts`` grouped by bucket, for buckets touching the period.
+
+    :param starts: Period start datetimes of the raw rows
+    :param complete_from: Skip buckets starting before this, their earlier raw
+        rows are no longer stored
+    :return: Row positions keyed by bucket start
+    """
+    first = bucket_start(from_dt, resolution)
+    if complete_from is not None:
+        first = max(first, as_utc(complete_from))
+    last = bucket_start(to_dt, resolution)
+    groups = defaultdict(list)
+    for position, dt in enumerate(starts):
+        key = bucket_start(dt, resolution)
+        if first <= key <= last:
+            groups[key].append(position)
+    return groups
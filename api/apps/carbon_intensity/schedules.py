@@ -0,0 +1,75 @@
+"""Ingest scheduling aligned to half-hourly settlement periods.
+
+Upstream publishes each period's intensity and generation mix shortly after
+the period starts. ``settlement_period`` runs beat entries at every half-hour
+boundary plus ``INGEST_PUBLISH_OFFSET`` seconds, instead of every 1800
+seconds from whenever beat started. Ingest tasks check the new period is in
+the response and retry every ``INGEST_RETRY_SECONDS`` until it is, giving up
+once the next run is due.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+
+from celery.schedules import BaseSchedule, schedstate
+from django.conf import settings
+from django.utils.dateparse import parse_datetime
+
+PERIOD = timedelta(minutes=30)
+EPOCH = datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+
+def period_start(dt: datetime) -> datetime:
+    """Start of the settlement period containing ``dt``."""
+    return EPOCH + (dt.astimezone(timezone.utc) - EPOCH) // PERIOD * PERIOD
+
+
+def next_run(after: datetime, offset: float) -> datetime:
+    """The first period boundary plus ``offset`` seconds later than ``after``."""
+    offset = timedelta(seconds=offset)
+    return period_start(after - offset) + PERIOD + offset
+
+
+def is_published(entries: Optional[Iterable[dict]], now: datetime = None) -> bool:
+    """Whether upstream entries include the current settlement period."""
+    current = period_start(now or datetime.now(timezone.utc))
+    return any(parse_datetime(entry["from"]) >= current for entry in entries or [])
+
+
+def retry_countdown(now: datetime = None) -> Optional[float]:
+    """Seconds until the next retry, or None once the next run would be sooner."""
+    now = now or datetime.now(timezone.utc)
+    retry_at = now + timedelta(seconds=settings.INGEST_RETRY_SECONDS)
+    if retry_at >= next_run(now, settings.INGEST_PUBLISH_OFFSET):
+        return None
+    return settings.INGEST_RETRY_SECONDS
+
+
+class settlement_period(BaseSchedule):
+    """Beat schedule due at every settlement period boundary plus ``offset``."""
+
+    def __init__(self, offset: float = None, nowfun=None, app=None):
+        self.offset = settings.INGEST_PUBLISH_OFFSET if offset is None else offset
+        super().__init__(nowfun=nowfun, app=app)
+
+    def remaining_estimate(self, last_run_at: datetime) -> timedelta:
+        last_run_at = self.maybe_make_aware(last_run_at)
+        return next_run(last_run_at, self.offset) - self.now()
+
+    def is_due(self, last_run_at: datetime) -> schedstate:
+        remaining = self.remaining_estimate(last_run_at).total_seconds()
+        if remaining > 0:
+            return schedstate(False, remaining)
+        now = self.now()
+        return schedstate(True, (next_run(now, self.offset) - now).total_seconds())
+
+    def __repr__(self):
+        return f"<settlement_period: every 30 minutes +{self.offset}s>"
+
+    def __reduce__(self):
+        return self.__class__, (self.offset, self.nowfun)
+
+    def __eq__(self, other):
+        if isinstance(other, settlement_period):
+            return self.offset == other.offset
+        return NotImplemented
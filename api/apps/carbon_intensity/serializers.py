@@ -1,15 +1,39 @@
+from datetime import datetime, timezone
+from typing import List, Optional
+from django.db.models import QuerySet
 from rest_framework import serializers
-from .models import CarbonIntensity, Region, GenerationMix, CarbonIntensityStats
+from .models import (
+    CarbonIntensity,
+    FUEL_TYPES,
+    Region,
+    GenerationMix,
+    CarbonIntensityStats,
+    IntensityRollup,
+    GenerationMixRollup,
+)
+from .regions import REGION_FIELDS, get_region, get_regions
 
 
 class RegionSerializer(serializers.ModelSerializer):
     class Meta:
         model = Region
-        fields = ["region_id", "name", "postcode_prefix", "short_name"]
+        fields = REGION_FIELDS
+
+
+class RegisteredRegionField(serializers.Field):
+    """Nested region read from the process-wide registry, not the database"""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("source", "region_id")
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return get_region(value)
 
 
 class CarbonIntensitySerializer(serializers.ModelSerializer):
-    region = RegionSerializer(read_only=True)
+    region = RegisteredRegionField()
     index = serializers.CharField(source="get_index_display")
 
     class Meta:
@@ -26,7 +50,7 @@ class CarbonIntensitySerializer(serializers.ModelSerializer):
 
 
 class GenerationMixSerializer(serializers.ModelSerializer):
-    fuel_mix = serializers.JSONField(binary=True)
+    fuel_mix = serializers.DictField(child=serializers.FloatField(), read_only=True)
 
     class Meta:
         model = GenerationMix
@@ -37,3 +61,117 @@ class CarbonIntensityStatsSerializer(serializers.ModelSerializer):
     class Meta:
         model = CarbonIntensityStats
         fields = "__all__"
+
+
+class IntensityRollupSerializer(serializers.ModelSerializer):
+    region = RegisteredRegionField()
+
+    class Meta:
+        model = IntensityRollup
+        fields = [
+            "from_datetime",
+            "to_datetime",
+            "resolution",
+            "count",
+            "min_intensity",
+            "max_intensity",
+            "average_intensity",
+            "p10_intensity",
+            "p50_intensity",
+            "p90_intensity",
+            "region",
+        ]
+
+
+class GenerationMixRollupSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = GenerationMixRollup
+        fields = ["from_datetime", "to_datetime", "resolution", "count", "fuel_mix"]
+
+
+# Fast paths for large list responses. These build the same rows as
+# CarbonIntensitySerializer / GenerationMixSerializer straight from
+# ``values_list()`` without per-row field introspection.
+
+INDEX_LABELS = dict(CarbonIntensity.INTENSITY_INDEXES)
+
+
+def format_datetime(value: Optional[datetime]) -> Optional[str]:
+    """Same output as DRF's DateTimeField under ``TIME_ZONE = "UTC"``."""
+    if value is None:
+        return None
+    value = value.astimezone(timezone.utc).isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+# Columns serialize_intensity_rows reads, all covered by the period indexes.
+INTENSITY_ROW_FIELDS = (
+    "from_datetime",
+    "to_datetime",
+    "actual",
+    "forecast",
+    "index",
+    "region_id",
+    "postcode_prefix",
+)
+
+
+def serialize_intensity_rows(rows) -> List[dict]:
+    """
+    ``CarbonIntensitySerializer(queryset, many=True).data`` without the overhead
+
+    :param rows: Queryset, or rows already read with
+        ``values_list(*INTENSITY_ROW_FIELDS)`` and any trailing columns
+    """
+    if isinstance(rows, QuerySet):
+        rows = rows.values_list(*INTENSITY_ROW_FIELDS)
+    regions = get_regions()
+    return [
+        {
+            "from_datetime": format_datetime(from_dt),
+            "to_datetime": format_datetime(to_dt),
+            "actual": actual,
+            "forecast": forecast,
+            "index": INDEX_LABELS.get(index, index),
+            "region": regions.get(region_id) or get_region(region_id),
+            "postcode_prefix": postcode_prefix,
+        }
+        for (
+            from_dt,
+            to_dt,
+            actual,
+            forecast,
+            index,
+            region_id,
+            postcode_prefix,
+            *_,
+        ) in rows
+    ]
+
+
+GENERATION_MIX_ROW_FIELDS = ("from_datetime", "to_datetime", *FUEL_TYPES)
+
+
+def serialize_generation_mix_rows(rows) -> List[dict]:
+    """
+    ``GenerationMixSerializer(queryset, many=True).data`` without the overhead
+
+    :param rows: Queryset, or rows already read with
+        ``values_list(*GENERATION_MIX_ROW_FIELDS)`` and any trailing columns
+    """
+    if isinstance(rows, QuerySet):
+        rows = rows.values_list(*GENERATION_MIX_ROW_FIELDS)
+    return [
+        {
+            "from_datetime": format_datetime(row[0]),
+            "to_datetime": format_datetime(row[1]),
+            "fuel_mix": {
+                fuel: float(value)
+                for fuel, value in zip(FUEL_TYPES, row[2:])
+                if value is not None
+            },
+        }
+        for row in rows
+    ]
@@ -0,0 +1,218 @@
+"""In-memory window index over the half-hourly carbon intensity series.
+
+Each region's series (national when ``region_id`` is None) is held as a dense
+int16 array with one slot per settlement period. Prefix sums give the total
+and count of any window in O(1), and min/max sparse tables give its extremes
+in O(1), so window statistics never scan rows.
+
+Indexes are built lazily per process. Whenever the ``carbon_intensity`` data
+version changes (it is bumped on every write) one grouped query reads each
+month's row count, latest ``modified`` and value sums, and only the months
+whose figures changed are re-read. Rows are matched on ``from_datetime``, so
+a row another shard commits after a newer one is still picked up. Deleting
+rows (retention) also bumps ``carbon_intensity_rebuild``, and indexes are then
+rebuilt from scratch.
+"""
+
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import numpy as np
+from django.db.models import Count, Max, Q, Sum
+from django.db.models.functions import TruncMonth
+
+from apps.core.utils.data_versions import get_data_version
+
+from .packing import MISSING_VALUE, as_utc, next_month
+
+DATA_VERSION = "carbon_intensity"
+REBUILD_DATA_VERSION = "carbon_intensity_rebuild"
+
+PERIOD = np.timedelta64(30, "m")
+MISSING_MIN = np.iinfo(np.int16).max
+MISSING_MAX = np.iinfo(np.int16).min
+
+_indexes: Dict[Optional[int], "IntensitySeriesIndex"] = {}
+_lock = threading.Lock()
+
+
+def _to_datetime64(dt: datetime) -> np.datetime64:
+    return np.datetime64(as_utc(dt).replace(tzinfo=None), "m")
+
+
+def _sparse_table(values: np.ndarray, op) -> List[np.ndarray]:
+    """Level ``k`` holds ``op`` over every run of ``2**k`` values."""
+    table = [values]
+    width = 1
+    while width * 2 <= len(values):
+        previous = table[-1]
+        table.append(op(previous[:-width], previous[width:]))
+        width *= 2
+    return table
+
+
+def _query(table: List[np.ndarray], op, start: int, end: int):
+    level = (end - start).bit_length() - 1
+    return op(table[level][start], table[level][end - (1 << level)])
+
+
+class IntensitySeriesIndex:
+    """Prefix sums and min/max sparse tables over one region's series."""
+
+    def __init__(self, region_id: Optional[int] = None, rebuild_version: int = None):
+        self.region_id = region_id
+        self.rebuild_version = rebuild_version
+        self.version = None
+        # Figures of each month's rows as of the last refresh.
+        self.months = {}
+        self.start = None
+        self.values = np.array([], dtype=np.int16)
+        self._rebuild_tables()
+
+    def _queryset(self):
+        # Imported here, models import this module to back the stats manager.
+        from .models import CarbonIntensity
+
+        rows = CarbonIntensity.objects.filter(postcode_prefix__isnull=True)
+        if self.region_id:
+            return rows.filter(region_id=self.region_id)
+        return rows.filter(region__isnull=True)
+
+    def _months(self) -> dict:
+        """Row count, latest ``modified`` and value sums of every stored month."""
+        rows = (
+            self._queryset()
+            .annotate(month=TruncMonth("from_datetime", tzinfo=timezone.utc))
+            .order_by()
+            .values_list("month")
+            .annotate(Count("id"), Max("modified"), Sum("actual"), Sum("forecast"))
+        )
+        return {month: figures for month, *figures in rows}
+
+    def _rows(self, months: List[datetime]):
+        window = Q()
+        for month in months:
+            window |= Q(from_datetime__gte=month, from_datetime__lt=next_month(month))
+        return (
+            self._queryset()
+            .filter(window)
+            .order_by()
+            .values_list("from_datetime", "actual", "forecast")
+        )
+
+    def _clear(self, month: datetime):
+        if self.start is None:
+            return
+        first = int((_to_datetime64(month) - self.start) // PERIOD)
+        last = int((_to_datetime64(next_month(month)) - self.start) // PERIOD)
+        self.values[max(first, 0) : max(last, 0)] = MISSING_VALUE
+
+    def refresh(self, version: int = None):
+        """Re-read the months whose rows changed and rebuild the tables."""
+        months = self._months()
+        changed = [
+            month
+            for month in months.keys() | self.months.keys()
+            if months.get(month) != self.months.get(month)
+        ]
+        if changed:
+            # Months re-read whole, rows deleted from them go too.
+            for month in changed:
+                self._clear(month)
+            rows = list(self._rows(changed))
+            if rows:
+                self._apply(rows)
+            self.months = months
+            self._rebuild_tables()
+        self.version = version
+
+    def _apply(self, rows):
+        starts = np.array([_to_datetime64(row[0]) for row in rows])
+        first, last = starts.min(), starts.max()
+        if self.start is None:
+            self.start = first
+        if first < self.start:
+            shift = int((self.start - first) // PERIOD)
+            self.values = np.concatenate(
+                [np.full(shift, MISSING_VALUE, np.int16), self.values]
+            )
+            self.start = first
+        size = int((last - self.start) // PERIOD) + 1
+        if size > len(self.values):
+            self.values = np.concatenate(
+                [
+                    self.values,
+                    np.full(size - len(self.values), MISSING_VALUE, np.int16),
+                ]
+            )
+
+        positions = ((starts - self.start) // PERIOD).astype(int)
+        # Upstream only publishes actuals after the fact, fall back to forecast.
+        self.values[positions] = [
+            MISSING_VALUE
+            if actual is None and forecast is None
+            else (actual if actual is not None else forecast)
+            for _, actual, forecast in rows
+        ]
+
+    def _rebuild_tables(self):
+        present = self.values != MISSING_VALUE
+        self.counts = np.concatenate([[0], np.cumsum(present, dtype=np.int64)])
+        self.sums = np.concatenate(
+            [[0], np.cumsum(np.where(present, self.values, 0), dtype=np.int64)]
+        )
+        self.min_table = _sparse_table(
+            np.where(present, self.values, MISSING_MIN).astype(np.int16), np.minimum
+        )
+        self.max_table = _sparse_table(
+            np.where(present, self.values, MISSING_MAX).astype(np.int16), np.maximum
+        )
+
+    def window(self, from_dt: datetime, to_dt: datetime) -> Optional[dict]:
+        """
+        Statistics over the periods lying inside ``[from_dt, to_dt]``.
+
+        :return: count/min/max/average of the stored periods in the window,
+            or ``None`` if none are stored
+        """
+        if self.start is None:
+            return None
+        start = int(np.ceil((_to_datetime64(from_dt) - self.start) / PERIOD))
+        end = int((_to_datetime64(to_dt) - self.start) // PERIOD)
+        start, end = max(start, 0), min(end, len(self.values))
+        if end <= start:
+            return None
+
+        count = int(self.counts[end] - self.counts[start])
+        if not count:
+            return None
+        total = int(self.sums[end] - self.sums[start])
+        return {
+            "count": count,
+            "min_intensity": int(_query(self.min_table, np.minimum, start, end)),
+            "max_intensity": int(_query(self.max_table, np.maximum, start, end)),
+            "average_intensity": round(total / count, 2),
+        }
+
+
+def get_series_index(region_id: Optional[int] = None) -> IntensitySeriesIndex:
+    """The process-wide index for a region, refreshed if the data has changed."""
+    region_id = int(region_id) if region_id else None
+    version = get_data_version(DATA_VERSION)
+    with _lock:
+        index = _indexes.get(region_id)
+        if index is None or index.version != version:
+            # Only checked when the data has changed, refreshes add rows but
+            # can't drop deleted ones.
+            rebuild_version = get_data_version(REBUILD_DATA_VERSION)
+            if index is None or index.rebuild_version != rebuild_version:
+                index = IntensitySeriesIndex(region_id, rebuild_version)
+                _indexes[region_id] = index
+            index.refresh(version)
+        return index
+
+
+def clear_series_indexes():
+    with _lock:
+        _indexes.clear()
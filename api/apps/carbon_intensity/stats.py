@@ -0,0 +1,36 @@
+"""Carbon intensity statistics computed from the stored half-hourly series.
+
+Mirrors the upstream ``intensity/stats`` endpoints: min, max and average
+intensity over a window, optionally split into ``block_hours`` blocks.
+"""
+
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from .packing import as_utc
+
+PERIOD_LENGTH = timedelta(minutes=30)
+
+
+def expected_periods(from_dt: datetime, to_dt: datetime) -> int:
+    """Number of whole settlement periods inside the window."""
+    return max(int((as_utc(to_dt) - as_utc(from_dt)) // PERIOD_LENGTH), 0)
+
+
+def block_windows(
+    from_dt: datetime, to_dt: datetime, block_hours: Optional[int] = None
+) -> List[Tuple[datetime, datetime]]:
+    """
+    Split a window into consecutive blocks, the last one truncated at ``to_dt``.
+
+    :param block_hours: Block length; the whole window is one block if unset
+    """
+    from_dt, to_dt = as_utc(from_dt), as_utc(to_dt)
+    if not block_hours:
+        return [(from_dt, to_dt)] if from_dt < to_dt else []
+    block = timedelta(hours=block_hours)
+    windows = []
+    while from_dt < to_dt:
+        windows.append((from_dt, min(from_dt + block, to_dt)))
+        from_dt += block
+    return windows
@@ -1,8 +1,30 @@
 # tasks.py
-from celery import shared_task
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from celery import group, shared_task
 from celery.utils.log import get_task_logger
-from .models import CarbonIntensity, GenerationMix
-from apps.core.utils.api_clients import CarbonIntensityService
+from celery.utils.time import get_exponential_backoff_interval
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.dateparse import parse_datetime
+from .models import (
+    CarbonIntensity,
+    GenerationMix,
+    GenerationMixRollup,
+    IngestWatermark,
+    IntensityRollup,
+    PackedCarbonIntensity,
+    Region,
+    RegionalGenerationMix,
+    RegionalGenerationMixAggregate,
+)
+from apps.core.utils import clients
+from apps.core.utils.base_client import (
+    NetworkError,
+    RateLimitError,
+    ServiceUnavailableError,
+)
+from . import schedules
 from .models import (
     CarbonIntensityData,
     GenerationMixData,
@@ -10,70 +32,279 @@ from .models import (
 
 logger = get_task_logger(__name__)
 
+# Watermark series, regional ones are suffixed with the region id.
+NATIONAL_SERIES = "intensity:national"
+REGIONAL_SERIES = "intensity:region:"
+GENERATION_MIX_SERIES = "generation_mix"
+
+# Claims outlive the retries of a period, older ones were left by a run that
+# died and are taken over.
+INGEST_CLAIM_TTL = timedelta(hours=1)
+
+# Upstream errors worth a few backed-off retries, separate from waiting for
+# a period to be published. Celery counts both kinds in request.retries, so
+# these are counted per task id in the shared cache instead.
+TRANSIENT_ERRORS = (NetworkError, RateLimitError, ServiceUnavailableError)
+TRANSIENT_MAX_RETRIES = 3
+# Well inside the half-hour schedule interval.
+TRANSIENT_BACKOFF_MAX = 300
+
 
 @shared_task
 def update_intensity_data():
-    service = CarbonIntensityService()
+    """
+    Fan out ingest of the current intensity, run by beat at each settlement
+    period boundary: national and every region in ``INGEST_REGION_IDS`` are
+    separate tasks, so they run concurrently across workers and retry or fail
+    on their own.
+    """
+    shards = [ingest_national_intensity.s()] + [
+        ingest_regional_intensity.s(region_id)
+        for region_id in settings.INGEST_REGION_IDS
+    ]
+    group(shards).apply_async()
+
+
+@shared_task(bind=True, max_retries=None)
+def ingest_national_intensity(self):
+    """Ingest the current national intensity once its period is published."""
+    with retry_transient(self):
+        response = clients.CarbonIntensityService().get_current_intensity()
+    entries = (response or {}).get("data") or []
+    retry_unpublished(self, entries)
+    ingest_once(NATIONAL_SERIES, entries, lambda: store_intensity_entries(entries))
+
+
+@shared_task(bind=True, max_retries=None)
+def ingest_regional_intensity(self, region_id):
+    """Ingest one region's current intensity once its period is published."""
+    with retry_transient(self):
+        response = clients.CarbonIntensityService().get_regional_regionid(region_id)
+    regions = (response or {}).get("data") or []
+    if not regions:
+        retry_unpublished(self, [])
+        return
+    # Upstream nests the region's periods under the region.
+    entries = regions[0].get("data") or []
+    retry_unpublished(self, entries)
+    ingest_once(
+        f"{REGIONAL_SERIES}{region_id}",
+        entries,
+        lambda: store_intensity_entries(entries, get_or_create_region(regions[0])),
+    )
+
+
+@shared_task(bind=True, max_retries=None)
+def update_generation_mix(self):
+    """Ingest the current generation mix, retrying until its period is published."""
+    with retry_transient(self):
+        response = clients.CarbonIntensityService().get_current_generation()
+    entries = (response or {}).get("data") or []
+    retry_unpublished(self, entries)
+    ingest_once(
+        GENERATION_MIX_SERIES, entries, lambda: store_generation_entries(entries)
+    )
+
+
+@contextmanager
+def retry_transient(task):
+    """Retry the task with capped exponential backoff after an upstream error."""
     try:
-        # Update national data
-        national_data = service.get_current_intensity()
-        process_intensity_response(national_data)
+        yield
+    except TRANSIENT_ERRORS as exc:
+        key = f"ingest:transient-retries:{task.request.id}"
+        cache.add(key, 0, INGEST_CLAIM_TTL.total_seconds())
+        retries = cache.incr(key)
+        if retries > TRANSIENT_MAX_RETRIES:
+            raise
+        countdown = get_exponential_backoff_interval(
+            factor=1,
+            retries=retries - 1,
+            maximum=TRANSIENT_BACKOFF_MAX,
+            full_jitter=True,
+        )
+        raise task.retry(exc=exc, countdown=countdown)
+
+
+def unpublished_max_retries() -> int:
+    """A period's worth of retries, plus the upstream error retries among them."""
+    period = schedules.PERIOD.total_seconds()
+    return int(period // settings.INGEST_RETRY_SECONDS) + TRANSIENT_MAX_RETRIES
+
 
-        # Update regional data
-        regional_data = service.get_regional_current()
-        process_regional_response(regional_data)
+def retry_unpublished(task, entries):
+    """Retry the task soon if upstream doesn't have the current period yet."""
+    if schedules.is_published(entries):
+        return
+    countdown = schedules.retry_countdown()
+    if countdown is not None:
+        logger.info(f"Current period not published yet, retrying in {countdown}s")
+        raise task.retry(countdown=countdown, max_retries=unpublished_max_retries())
+    # The next scheduled run is due first, store what upstream has.
+    logger.warning("Current period still not published")
 
-        logger.info("Successfully updated intensity data")
+
+def ingest_once(series, entries, store):
+    """
+    Run ``store`` unless another run already ingested the series' latest
+    period, then advance its watermark.
+
+    The period is claimed on the series' ``IngestWatermark`` row in the
+    database, so of overlapping runs (retries, a slow worker, a manual run)
+    only one writes a period. The claim is released if storing fails, so a
+    retry can claim it.
+    """
+    if not entries:
+        return False
+    latest = max(parse_datetime(entry["from"]) for entry in entries)
+    if not IngestWatermark.objects.claim(series, latest, INGEST_CLAIM_TTL):
+        logger.info(f"{series} at {latest} already ingested")
+        return False
+    try:
+        store()
+        IngestWatermark.objects.advance(series, latest)
     except Exception as e:
-        logger.error(f"Error updating intensity data: {str(e)}")
+        IngestWatermark.objects.release(series, latest)
+        logger.error(f"Error ingesting {series} at {latest}: {str(e)}")
         raise
+    logger.info(f"Ingested {series} at {latest}")
+    return True
 
 
 @shared_task
-def update_generation_mix():
-    service = CarbonIntensityService()
+def update_regional_generation_mix(since=None):
+    """
+    Ingest regional generation mix from the last stored period up to now.
+
+    :param since: ISO datetime to start from when nothing is stored yet
+    """
+    service = clients.CarbonIntensityService()
+    start = RegionalGenerationMix.objects.latest_to_datetime()
+    if start is None:
+        start = parse_datetime(since or settings.REGIONAL_GENERATION_MIX_START)
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+    now = datetime.now(timezone.utc)
+
     try:
-        response = service.get_current_generation()
-        if response and "data" in response:
-            for entry in response["data"]:
-                mix_data = GenerationMixData(
-                    from_datetime=entry["from"],
-                    to_datetime=entry["to"],
-                    fuel_mix={
-                        item["fuel"]: item["perc"] for item in entry["generationmix"]
-                    },
-                )
-                GenerationMix.from_dataclass(mix_data).save()
-        logger.info("Successfully updated generation mix")
+        while start < now:
+            # Upstream regional ranges are limited to 14 days per request
+            end = min(start + timedelta(days=14), now)
+            response = service.get_regional_intensity_range(start, end)
+            span = process_regional_generation_response(response)
+            if span:
+                RegionalGenerationMixAggregate.objects.refresh(*span)
+            start = end
+        logger.info("Successfully updated regional generation mix")
     except Exception as e:
-        logger.error(f"Error updating generation mix: {str(e)}")
+        logger.error(f"Error updating regional generation mix: {str(e)}")
         raise
 
 
-def process_intensity_response(response):
-    if response and "data" in response:
-        for entry in response["data"]:
-            intensity = entry.get("intensity", {})
-            ci_data = CarbonIntensityData(
-                from_datetime=entry["from"],
-                to_datetime=entry["to"],
-                actual=intensity.get("actual"),
-                forecast=intensity.get("forecast"),
-                index=intensity.get("index", "moderate"),
-            )
-            CarbonIntensity.from_dataclass(ci_data).save()
-
-
-def process_regional_response(response):
-    if response and "data" in response:
-        for region in response["data"].get("regions", []):
-            intensity = region.get("intensity", {})
-            ci_data = CarbonIntensityData(
-                from_datetime=region["from"],
-                to_datetime=region["to"],
-                actual=intensity.get("actual"),
-                forecast=intensity.get("forecast"),
-                index=intensity.get("index", "moderate"),
-                region_id=region.get("regionid"),
+@shared_task
+def ensure_intensity_partitions(months_ahead=None):
+    """Create the carbon intensity partitions for the coming months."""
+    from django.db import connection
+
+    from . import partitions
+
+    if not partitions.is_partitioned(connection):
+        return []
+    today = datetime.now(timezone.utc).date()
+    end = partitions.add_months(
+        partitions.month_start(today),
+        months_ahead or settings.INTENSITY_PARTITION_MONTHS_AHEAD,
+    )
+    created = partitions.ensure_partitions(connection, today, end)
+    for name in created:
+        logger.info(f"Created partition {name}")
+    return created
+
+
+@shared_task
+def apply_retention():
+    """Roll up and delete raw data past retention, and stale stats."""
+    from . import retention
+
+    deleted = retention.apply_retention()
+    logger.info(f"Retention deleted {deleted}")
+    return deleted
+
+
+def get_or_create_region(region):
+    """Region row for an upstream regional entry, created on first sight."""
+    instance, _ = Region.objects.get_or_create(
+        region_id=region["regionid"],
+        defaults={
+            "name": region.get("dnoregion") or region.get("shortname"),
+            "short_name": region.get("shortname"),
+        },
+    )
+    return instance
+
+
+def process_regional_generation_response(response):
+    """Store regional generation mix entries, returning the span ingested."""
+    if not response or not response.get("data"):
+        return None
+    instances = []
+    for interval in response["data"]:
+        from_dt = parse_datetime(interval["from"])
+        to_dt = parse_datetime(interval["to"])
+        for region in interval.get("regions", []):
+            instance = RegionalGenerationMix(
+                from_datetime=from_dt,
+                to_datetime=to_dt,
+                region=get_or_create_region(region),
             )
-            CarbonIntensity.from_dataclass(ci_data).save()
+            instance.fuel_mix = {
+                item["fuel"]: item["perc"] for item in region.get("generationmix", [])
+            }
+            instances.append(instance)
+    # Overlapping runs write the same periods, keep whichever landed first
+    RegionalGenerationMix.objects.bulk_create(instances, ignore_conflicts=True)
+    if not instances:
+        return None
+    return (
+        min(instance.from_datetime for instance in instances),
+        max(instance.from_datetime for instance in instances),
+    )
+
+
+def store_intensity_entries(entries, region=None):
+    """Store national (or one region's) intensity entries and their rollups."""
+    region_id = region.region_id if region else None
+    for entry in entries:
+        intensity = entry.get("intensity", {})
+        ci_data = CarbonIntensityData(
+            from_datetime=entry["from"],
+            to_datetime=entry["to"],
+            actual=intensity.get("actual"),
+            forecast=intensity.get("forecast"),
+            index=intensity.get("index", "moderate"),
+            region_id=region_id,
+        )
+        CarbonIntensity.from_dataclass(ci_data).save()
+    refresh_derived_data(entries, region_id)
+
+
+def store_generation_entries(entries):
+    for entry in entries:
+        mix_data = GenerationMixData(
+            from_datetime=entry["from"],
+            to_datetime=entry["to"],
+            fuel_mix={item["fuel"]: item["perc"] for item in entry["generationmix"]},
+        )
+        GenerationMix.from_dataclass(mix_data).save()
+    starts = [parse_datetime(entry["from"]) for entry in entries]
+    GenerationMixRollup.objects.refresh(min(starts), max(starts))
+
+
+def refresh_derived_data(entries, region_id=None):
+    """Refresh rollups and the packed copy for the periods of ingested entries."""
+    if not entries:
+        return
+    starts = [parse_datetime(entry["from"]) for entry in entries]
+    IntensityRollup.objects.refresh(min(starts), max(starts), region_id)
+    if settings.CARBON_INTENSITY_PACKED_STORAGE:
+        PackedCarbonIntensity.objects.pack_period(min(starts), max(starts), region_id)
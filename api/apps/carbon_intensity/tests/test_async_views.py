@@ -0,0 +1,47 @@
+import asyncio
+import json
+from django.test import RequestFactory, TestCase
+from apps.carbon_intensity import async_views
+from apps.carbon_intensity.models import CarbonIntensity
+from apps.core.utils.base_client import AsyncServiceMixin, httpx
+
+INTENSITY = {
+    "data": [
+        {
+            "from": "2025-03-01T00:00Z",
+            "to": "2025-03-01T00:30Z",
+            "intensity": {"forecast": 120, "actual": 118, "index": "moderate"},
+        }
+    ]
+}
+
+
+class AsyncProxyViewTests(TestCase):
+    def setUp(self):
+        self.requested = []
+
+    def handler(self, request):
+        self.requested.append(request.url.path)
+        return httpx.Response(200, json=INTENSITY)
+
+    async def call(self, view, *args):
+        # Stand in for the shared client the mixin would open for this loop.
+        AsyncServiceMixin._clients[asyncio.get_running_loop()] = httpx.AsyncClient(
+            transport=httpx.MockTransport(self.handler)
+        )
+        request = RequestFactory().get("/")
+        return await view(request, *args)
+
+    async def test_current_stores_and_serializes(self):
+        response = await self.call(async_views.current)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.requested, ["/intensity"])
+        data = json.loads(response.content)
+        self.assertEqual(data[0]["from_datetime"], "2025-03-01T00:00:00Z")
+        self.assertEqual(data[0]["actual"], 118)
+        self.assertTrue(await CarbonIntensity.objects.filter(actual=118).aexists())
+
+    async def test_invalid_date(self):
+        response = await self.call(async_views.intensity_date, "01-03-2025")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.requested, [])
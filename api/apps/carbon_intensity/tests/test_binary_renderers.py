@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta, timezone
+import pyarrow
+import pyarrow.ipc
+from django.core.cache import cache
+from django.test import TestCase
+from apps.carbon_intensity.models import CarbonIntensity
+from apps.core import renderers
+from apps.core.columnar import to_timestamp
+
+
+class BinaryRendererTests(TestCase):
+    url = "/api/v1/carbon-intensity/?from=2025-03-01T00:00Z&to=2025-03-01T02:00Z"
+
+    def setUp(self):
+        cache.clear()
+        self.start = datetime(2025, 3, 1, tzinfo=timezone.utc)
+        for i in range(4):
+            from_dt = self.start + timedelta(minutes=30 * i)
+            CarbonIntensity.objects.create(
+                from_datetime=from_dt,
+                to_datetime=from_dt + timedelta(minutes=30),
+                actual=None if i == 3 else 100 + i,
+                forecast=100,
+            )
+        self.from_ms = int(self.start.timestamp() * 1000)
+
+    def get(self, media_type):
+        response = self.client.get(self.url, HTTP_ACCEPT=media_type)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], media_type)
+        return response.content
+
+    def test_msgpack(self):
+        payload = renderers.msgpack.unpackb(self.get("application/msgpack"))
+        columns = {column["name"]: column for column in payload["columns"]}
+        self.assertEqual(payload["length"], 4)
+        self.assertEqual(columns["from_datetime"]["values"][0], self.from_ms)
+        self.assertEqual(columns["actual"]["values"], [100, 101, 102, None])
+        self.assertEqual(columns["region.region_id"]["values"], [None] * 4)
+
+    def test_protobuf(self):
+        table = renderers.ProtobufRenderer.get_table_class().FromString(
+            self.get("application/x-protobuf")
+        )
+        columns = {column.name: column for column in table.columns}
+        self.assertEqual(table.length, 4)
+        self.assertEqual(columns["from_datetime"].int_values[0], self.from_ms)
+        self.assertEqual(list(columns["actual"].null_positions), [3])
+        self.assertEqual(columns["index"].string_values[0], "Moderate")
+
+    def test_arrow(self):
+        table = pyarrow.ipc.open_stream(
+            self.get("application/vnd.apache.arrow.stream")
+        ).read_all()
+        self.assertEqual(table.num_rows, 4)
+        self.assertEqual(table.column("from_datetime").to_pylist()[0], self.start)
+        self.assertEqual(table.column("actual").to_pylist(), [100, 101, 102, None])
+
+
+class ToTimestampTests(TestCase):
+    def test_parses_utc_designator(self):
+        self.assertEqual(to_timestamp("1970-01-01T00:00:01Z"), 1000)
+        self.assertEqual(to_timestamp("1970-01-01T01:00:01+01:00"), 1000)
+        self.assertIsNone(to_timestamp(None))
@@ -0,0 +1,53 @@
+import csv
+import io
+from datetime import datetime, timedelta, timezone
+import pyarrow
+import pyarrow.ipc
+import pyarrow.parquet
+from django.test import TestCase, override_settings
+from apps.carbon_intensity.models import CarbonIntensity
+
+
+@override_settings(EXPORT_CHUNK_SIZE=7)
+class ExportTests(TestCase):
+    url = "/api/v1/export/carbon-intensity/?from=2025-03-01T00:00Z&to=2025-03-02T00:00Z"
+
+    def setUp(self):
+        self.start = datetime(2025, 3, 1, tzinfo=timezone.utc)
+        for i in range(60):
+            from_dt = self.start + timedelta(minutes=30 * i)
+            CarbonIntensity.objects.create(
+                from_datetime=from_dt,
+                to_datetime=from_dt + timedelta(minutes=30),
+                actual=i,
+                forecast=100,
+            )
+
+    def get(self, url):
+        response = self.client.get(url, HTTP_ACCEPT="text/csv")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content)
+
+    def test_csv(self):
+        rows = list(csv.DictReader(io.StringIO(self.get(self.url).decode())))
+        self.assertEqual(len(rows), 48)
+        self.assertEqual(rows[0]["from_datetime"], "2025-03-01T00:00:00Z")
+        self.assertEqual(rows[47]["actual"], "47")
+        self.assertEqual(rows[0]["region_id"], "")
+
+    def test_arrow_and_parquet(self):
+        arrow = pyarrow.ipc.open_stream(
+            self.get(self.url + "&file_format=arrow")
+        ).read_all()
+        parquet = pyarrow.parquet.read_table(
+            pyarrow.BufferReader(self.get(self.url + "&file_format=parquet"))
+        )
+        for table in (arrow, parquet):
+            self.assertEqual(table.num_rows, 48)
+            self.assertEqual(table.column("actual").to_pylist(), list(range(48)))
+            self.assertEqual(table.column("from_datetime")[0].as_py(), self.start)
+
+    def test_unknown_format(self):
+        response = self.client.get(self.url + "&file_format=xlsx")
+        self.assertEqual(response.status_code, 400)
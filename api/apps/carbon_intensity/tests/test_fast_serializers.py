@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta, timezone
+from rest_framework.renderers import JSONRenderer
+from django.test import TestCase
+from apps.carbon_intensity.models import CarbonIntensity, GenerationMix, Region
+from apps.carbon_intensity.serializers import (
+    CarbonIntensitySerializer,
+    GenerationMixSerializer,
+    serialize_generation_mix_rows,
+    serialize_intensity_rows,
+)
+from apps.core.renderers import FastJSONRenderer
+
+
+class FastSerializerTests(TestCase):
+    def setUp(self):
+        self.start = datetime(2025, 3, 1, tzinfo=timezone.utc)
+        region = Region.objects.create(
+            region_id=1, name="North Scotland", short_name="NS"
+        )
+        for i, index in enumerate(["very low", "low", "moderate", "very high"]):
+            from_dt = self.start + timedelta(minutes=30 * i)
+            CarbonIntensity.objects.create(
+                from_datetime=from_dt,
+                to_datetime=from_dt + timedelta(minutes=30),
+                actual=None if i == 0 else 50 * i,
+                forecast=60 * i,
+                index=index,
+                region=region if i % 2 else None,
+            )
+            mix = GenerationMix(
+                from_datetime=from_dt, to_datetime=from_dt + timedelta(minutes=30)
+            )
+            mix.fuel_mix = {"gas": 40.5, "wind": 59.5} if i else {"wind": 100}
+            mix.save()
+
+    def assertSameBytes(self, fast_rows, serializer_rows):
+        self.assertEqual(
+            FastJSONRenderer().render(fast_rows), JSONRenderer().render(serializer_rows)
+        )
+
+    def test_intensity_rows_match_serializer(self):
+        queryset = CarbonIntensity.objects.order_by("from_datetime")
+        self.assertSameBytes(
+            serialize_intensity_rows(queryset),
+            CarbonIntensitySerializer(queryset, many=True).data,
+        )
+
+    def test_generation_mix_rows_match_serializer(self):
+        queryset = GenerationMix.objects.all()
+        self.assertSameBytes(
+            serialize_generation_mix_rows(queryset),
+            GenerationMixSerializer(queryset, many=True).data,
+        )
+
+    def test_renderer_defers_datetimes_to_drf(self):
+        data = {"from_datetime": self.start, "values": [1, 2.5, None]}
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_renderer_writes_non_string_keys_like_drf(self):
+        data = {1: [1, 2], 2.5: "a", False: None, None: {3: "b"}}
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
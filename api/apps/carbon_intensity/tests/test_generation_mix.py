@@ -0,0 +1,43 @@
+from datetime import datetime, timedelta, timezone
+from django.test import TestCase
+from rest_framework.test import APIClient
+from apps.carbon_intensity.models import GenerationMix, GenerationMixData
+from apps.carbon_intensity.serializers import GenerationMixSerializer
+
+
+class GenerationMixColumnTests(TestCase):
+    def setUp(self):
+        self.start = datetime(2025, 3, 1, tzinfo=timezone.utc)
+        for i in range(4):
+            from_dt = self.start + timedelta(minutes=30 * i)
+            GenerationMix.from_dataclass(
+                GenerationMixData(
+                    from_datetime=from_dt,
+                    to_datetime=from_dt + timedelta(minutes=30),
+                    fuel_mix={"wind": 10.0 * (i + 1), "gas": 50.0, "storage": 1.0},
+                )
+            ).save()
+
+    def test_from_dataclass_fills_fuel_columns(self):
+        mix = GenerationMix.objects.order_by("from_datetime").first()
+        self.assertEqual(mix.wind, 10.0)
+        self.assertEqual(mix.gas, 50.0)
+        self.assertIsNone(mix.coal)
+        self.assertEqual(mix.fuel_mix, {"gas": 50.0, "wind": 10.0})
+
+    def test_serializer_returns_fuel_mix_object(self):
+        mix = GenerationMix.objects.order_by("from_datetime").first()
+        data = GenerationMixSerializer(mix).data
+        self.assertEqual(data["fuel_mix"], {"gas": 50.0, "wind": 10.0})
+
+    def test_filter_and_sort_by_fuel_share_in_database(self):
+        windy = GenerationMix.objects.filter(wind__gte=30).order_by("-wind")
+        self.assertEqual([mix.wind for mix in windy], [40.0, 30.0])
+
+    def test_average_endpoint(self):
+        response = APIClient().get(
+            "/api/v1/generation-mix/average/",
+            {"from": "2025-03-01T00:00:00Z", "to": "2025-03-01T02:00:00Z"},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["fuel_mix"], {"gas": 50.0, "wind": 25.0})
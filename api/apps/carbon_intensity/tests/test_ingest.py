@@ -0,0 +1,99 @@
+from datetime import datetime, timezone
+from unittest.mock import patch
+from django.core.cache import cache
+from django.test import TestCase
+from apps.carbon_intensity import tasks
+from apps.carbon_intensity.models import CarbonIntensity, IngestWatermark, Region
+
+NOW = datetime(2025, 3, 1, 10, 5, tzinfo=timezone.utc)
+
+REGIONAL_RESPONSE = {
+    "data": [
+        {
+            "regionid": 3,
+            "dnoregion": "Electricity North West",
+            "shortname": "North West England",
+            "data": [
+                {
+                    "from": "2025-03-01T10:00Z",
+                    "to": "2025-03-01T10:30Z",
+                    "intensity": {"forecast": 120, "index": "moderate"},
+                }
+            ],
+        }
+    ]
+}
+
+
+@patch("apps.carbon_intensity.schedules.datetime")
+@patch("apps.carbon_intensity.tasks.clients.CarbonIntensityService")
+class ShardedIngestTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_region_shard_creates_region_and_watermark(self, service, clock):
+        clock.now.return_value = NOW
+        service.return_value.get_regional_regionid.return_value = REGIONAL_RESPONSE
+
+        tasks.ingest_regional_intensity(3)
+
+        self.assertEqual(
+            Region.objects.get(region_id=3).short_name, "North West England"
+        )
+        self.assertEqual(CarbonIntensity.objects.get(region_id=3).forecast, 120)
+        self.assertEqual(
+            IngestWatermark.objects.get_latest("intensity:region:3"),
+            datetime(2025, 3, 1, 10, 0, tzinfo=timezone.utc),
+        )
+
+    def test_overlapping_runs_write_once(self, service, clock):
+        clock.now.return_value = NOW
+        service.return_value.get_regional_regionid.return_value = REGIONAL_RESPONSE
+
+        with patch.object(tasks, "store_intensity_entries") as store:
+            tasks.ingest_regional_intensity(3)
+            tasks.ingest_regional_intensity(3)
+        store.assert_called_once()
+
+    def test_failed_store_releases_the_period(self, service, clock):
+        clock.now.return_value = NOW
+        service.return_value.get_regional_regionid.return_value = REGIONAL_RESPONSE
+
+        with patch.object(tasks, "store_intensity_entries", side_effect=ValueError):
+            with self.assertRaises(ValueError):
+                tasks.ingest_regional_intensity(3)
+        tasks.ingest_regional_intensity(3)
+        self.assertTrue(CarbonIntensity.objects.filter(region_id=3).exists())
+
+    def test_period_claimed_by_another_run_is_skipped(self, service, clock):
+        clock.now.return_value = NOW
+        service.return_value.get_regional_regionid.return_value = REGIONAL_RESPONSE
+        period = datetime(2025, 3, 1, 10, 0, tzinfo=timezone.utc)
+        # Claimed by a run still storing it on another worker.
+        IngestWatermark.objects.claim(
+            "intensity:region:3", period, tasks.INGEST_CLAIM_TTL
+        )
+
+        with patch.object(tasks, "store_intensity_entries") as store:
+            tasks.ingest_regional_intensity(3)
+            store.assert_not_called()
+
+            # A claim older than the TTL was left by a run that died.
+            IngestWatermark.objects.update(
+                claimed_at=datetime(2025, 3, 1, tzinfo=timezone.utc)
+            )
+            tasks.ingest_regional_intensity(3)
+        store.assert_called_once()
+
+    def test_watermark_never_moves_back(self, service, clock):
+        later = datetime(2025, 3, 1, 10, 30, tzinfo=timezone.utc)
+        IngestWatermark.objects.advance("generation_mix", later)
+        IngestWatermark.objects.advance("generation_mix", NOW)
+        self.assertEqual(IngestWatermark.objects.get_latest("generation_mix"), later)
+
+    def test_fan_out_one_task_per_shard(self, service, clock):
+        with patch.object(tasks, "group") as group:
+            tasks.update_intensity_data()
+        shards = group.call_args[0][0]
+        self.assertEqual(len(shards), 19)
+        self.assertEqual(shards[1].args, (1,))
@@ -0,0 +1,124 @@
+import json
+import re
+from datetime import datetime, timedelta, timezone
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from apps.carbon_intensity.models import (
+    CarbonIntensity,
+    PackedCarbonIntensity,
+    Region,
+)
+from apps.carbon_intensity.serializers import CarbonIntensitySerializer
+
+
+class PackedCarbonIntensityTests(TestCase):
+    def setUp(self):
+        self.region = Region.objects.create(
+            region_id=13, name="London", short_name="London"
+        )
+        start = datetime(2025, 1, 31, 22, 0, tzinfo=timezone.utc)
+        indexes = ["very low", "low", "moderate", "high", "very high"]
+        for i in range(8):
+            from_dt = start + timedelta(minutes=30 * i)
+            CarbonIntensity.objects.create(
+                from_datetime=from_dt,
+                to_datetime=from_dt + timedelta(minutes=30),
+                actual=None if i == 3 else 100 + i,
+                forecast=110 + i,
+                index=indexes[i % len(indexes)],
+            )
+            CarbonIntensity.objects.create(
+                from_datetime=from_dt,
+                to_datetime=from_dt + timedelta(minutes=30),
+                actual=200 + i,
+                forecast=210 + i,
+                region=self.region,
+            )
+        self.from_dt = start
+        self.to_dt = start + timedelta(hours=4)
+
+    def _expected(self, region_id=None):
+        qs = CarbonIntensity.objects.get_for_period(self.from_dt, self.to_dt, region_id)
+        return [dict(row) for row in CarbonIntensitySerializer(qs, many=True).data]
+
+    def test_pack_period_writes_one_row_per_month(self):
+        written = PackedCarbonIntensity.objects.pack_period(self.from_dt, self.to_dt)
+        self.assertEqual(written, 2)
+        self.assertEqual(
+            PackedCarbonIntensity.objects.filter(region__isnull=True).count(), 2
+        )
+
+    def test_national_round_trip_matches_serializer(self):
+        PackedCarbonIntensity.objects.pack_period(self.from_dt, self.to_dt)
+        rows = PackedCarbonIntensity.objects.get_for_period(self.from_dt, self.to_dt)
+        self.assertEqual(rows, self._expected())
+
+    def test_regional_round_trip_matches_serializer(self):
+        PackedCarbonIntensity.objects.pack_period(self.from_dt, self.to_dt, 13)
+        rows = PackedCarbonIntensity.objects.get_for_period(
+            self.from_dt, self.to_dt, 13
+        )
+        self.assertEqual(rows, self._expected(13))
+
+    def test_window_is_clipped(self):
+        PackedCarbonIntensity.objects.pack_period(self.from_dt, self.to_dt)
+        rows = PackedCarbonIntensity.objects.get_for_period(
+            self.from_dt + timedelta(hours=1), self.from_dt + timedelta(hours=2)
+        )
+        self.assertEqual(
+            [row["from_datetime"] for row in rows],
+            ["2025-01-31T23:00:00Z", "2025-01-31T23:30:00Z"],
+        )
+
+    def test_after_and_limit(self):
+        PackedCarbonIntensity.objects.pack_period(self.from_dt, self.to_dt)
+        rows = PackedCarbonIntensity.objects.get_for_period(
+            self.from_dt, self.to_dt, after=self.from_dt + timedelta(hours=1), limit=3
+        )
+        self.assertEqual(
+            [row["from_datetime"] for row in rows],
+            ["2025-01-31T23:30:00Z", "2025-02-01T00:00:00Z", "2025-02-01T00:30:00Z"],
+        )
+
+
+@override_settings(
+    CARBON_INTENSITY_PACKED_STORAGE=True,
+    TIME_SERIES_PAGE_SIZE=40,
+    TIME_SERIES_MAX_PAGE_SIZE=40,
+)
+class PackedPaginationTests(TestCase):
+    url = "/api/v1/carbon-intensity/?from=2024-11-30T00:00Z&to=2025-02-02T00:00Z"
+
+    def setUp(self):
+        cache.clear()
+        self.starts = []
+        for day in (
+            datetime(2024, 11, 30, tzinfo=timezone.utc),
+            datetime(2025, 1, 15, tzinfo=timezone.utc),
+            datetime(2025, 2, 1, tzinfo=timezone.utc),
+        ):
+            for i in range(30):
+                from_dt = day + timedelta(minutes=30 * i)
+                CarbonIntensity.objects.create(
+                    from_datetime=from_dt,
+                    to_datetime=from_dt + timedelta(minutes=30),
+                    actual=i,
+                    forecast=i,
+                )
+                self.starts.append(from_dt.strftime("%Y-%m-%dT%H:%M:%SZ"))
+        PackedCarbonIntensity.objects.pack_period(
+            datetime(2024, 11, 1, tzinfo=timezone.utc),
+            datetime(2025, 2, 28, tzinfo=timezone.utc),
+        )
+        CarbonIntensity.objects.all().delete()
+
+    def test_walks_months_longer_than_a_page(self):
+        url, pages = self.url, []
+        while url:
+            response = self.client.get(url, HTTP_ACCEPT="application/json")
+            self.assertEqual(response.status_code, 200)
+            pages.append([row["from_datetime"] for row in json.loads(response.content)])
+            link = response.get("Link")
+            url = re.match(r'<(.+)>; rel="next"', link).group(1) if link else None
+        self.assertEqual([len(page) for page in pages], [40, 40, 10])
+        self.assertEqual(sum(pages, []), self.starts)
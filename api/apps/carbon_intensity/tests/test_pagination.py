@@ -0,0 +1,59 @@
+import json
+import re
+from datetime import datetime, timedelta, timezone
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from rest_framework.request import Request
+from apps.carbon_intensity.models import GenerationMix
+from apps.core.pagination import KeysetPagination
+
+
+@override_settings(TIME_SERIES_PAGE_SIZE=3, TIME_SERIES_MAX_PAGE_SIZE=4)
+class KeysetPaginationTests(TestCase):
+    url = "/api/v1/generation-mix/"
+
+    def setUp(self):
+        cache.clear()
+        start = datetime(2025, 3, 1, tzinfo=timezone.utc)
+        for i in range(8):
+            from_dt = start + timedelta(minutes=30 * i)
+            mix = GenerationMix(
+                from_datetime=from_dt, to_datetime=from_dt + timedelta(minutes=30)
+            )
+            mix.fuel_mix = {"wind": float(i)}
+            mix.save()
+
+    def walk(self, url):
+        pages = []
+        while url:
+            response = self.client.get(url, HTTP_ACCEPT="application/json")
+            self.assertEqual(response.status_code, 200)
+            pages.append(
+                [row["fuel_mix"]["wind"] for row in json.loads(response.content)]
+            )
+            link = response.get("Link")
+            url = re.match(r'<(.+)>; rel="next"', link).group(1) if link else None
+        return pages
+
+    def test_walks_every_row_once(self):
+        self.assertEqual(
+            self.walk(self.url), [[0.0, 1.0, 2.0], [3.0, 4.0, 5.0], [6.0, 7.0]]
+        )
+
+    def test_page_size_is_capped(self):
+        pages = self.walk(self.url + "?page_size=100")
+        self.assertEqual([len(page) for page in pages], [4, 4])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url + "?cursor=not-a-cursor")
+        self.assertEqual(response.status_code, 404)
+
+    def test_page_and_cursor_come_from_one_query(self):
+        paginator = KeysetPagination()
+        request = Request(RequestFactory().get(self.url))
+        with self.assertNumQueries(1):
+            page = paginator.paginate_queryset(
+                GenerationMix.objects.values_list("from_datetime", "id", named=True),
+                request,
+            )
+        self.assertEqual(paginator.next_position, tuple(page[-1]))
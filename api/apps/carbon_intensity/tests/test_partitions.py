@@ -0,0 +1,27 @@
+from datetime import date
+from io import StringIO
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from apps.carbon_intensity import partitions
+
+
+class PartitionMonthTests(SimpleTestCase):
+    def test_add_months_across_years(self):
+        self.assertEqual(partitions.add_months(date(2024, 11, 1), 3), date(2025, 2, 1))
+        self.assertEqual(partitions.add_months(date(2024, 1, 1), -1), date(2023, 12, 1))
+
+    def test_partition_name(self):
+        self.assertEqual(
+            partitions.partition_name(date(2025, 3, 1)),
+            "carbon_intensity_carbonintensity_p2025_03",
+        )
+
+
+class UnpartitionedTests(TestCase):
+    def test_not_partitioned_outside_postgres(self):
+        if connection.vendor == "postgresql":
+            self.skipTest("Migrations partition the table on PostgreSQL")
+        self.assertFalse(partitions.is_partitioned(connection))
+        with self.assertRaises(CommandError):
+            call_command("manage_partitions", stdout=StringIO())
@@ -0,0 +1,104 @@
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from apps.carbon_intensity import async_views
+from apps.carbon_intensity.models import CarbonIntensity
+from apps.carbon_intensity.push import LatestBroadcaster
+
+
+@override_settings(PUSH_POLL_INTERVAL=0.01)
+class LatestPushTests(TestCase):
+    url = "/api/v1/carbon-intensity/latest/"
+
+    def setUp(self):
+        cache.clear()
+        self.create(datetime(2025, 3, 1, tzinfo=timezone.utc))
+
+    def create(self, from_dt):
+        CarbonIntensity.objects.create(
+            from_datetime=from_dt, to_datetime=from_dt + timedelta(minutes=30), actual=1
+        )
+
+    def test_not_modified_until_new_data(self):
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.create(datetime(2025, 3, 1, 0, 30, tzinfo=timezone.utc))
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["from_datetime"], "2025-03-01T00:30:00Z")
+
+    def test_etag_does_not_depend_on_process_state(self):
+        etag = self.client.get(self.url)["ETag"]
+        # Drops the cached latest row and data versions, as in a new process.
+        cache.clear()
+        self.assertEqual(self.client.get(self.url)["ETag"], etag)
+
+    def test_sync_view_does_not_wait(self):
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.get(self.url + "?wait=60", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    async def latest(self, query="", **headers):
+        request = RequestFactory().get(self.url + query, **headers)
+        return await async_views.latest(request)
+
+    async def test_long_poll_times_out(self):
+        etag = (await self.latest())["ETag"]
+        response = await self.latest("?wait=0.05", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    async def test_long_poll_wakes_on_new_data(self):
+        etag = (await self.latest())["ETag"]
+
+        async def ingest():
+            await asyncio.sleep(0.05)
+            await sync_to_async(self.create)(
+                datetime(2025, 3, 1, 0, 30, tzinfo=timezone.utc)
+            )
+
+        task = asyncio.ensure_future(ingest())
+        response = await self.latest("?wait=5", HTTP_IF_NONE_MATCH=etag)
+        await task
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        data = json.loads(response.content)
+        self.assertEqual(data["from_datetime"], "2025-03-01T00:30:00Z")
+
+    def test_stream_requires_asgi(self):
+        self.assertEqual(self.client.get("/api/v1/stream/latest/").status_code, 501)
+
+
+@override_settings(PUSH_POLL_INTERVAL=60, SSE_HEARTBEAT_INTERVAL=0.05)
+class LatestBroadcasterTests(TestCase):
+    def test_streams_current_payload_changes_and_heartbeats(self):
+        broadcaster = LatestBroadcaster()
+        broadcaster.poll = lambda: False
+        broadcaster.payloads = {"carbon-intensity": (1, '{"actual":1}')}
+
+        async def scenario():
+            stream = broadcaster.events(["carbon-intensity"])
+            messages = [await stream.__anext__()]
+            broadcaster.payloads["carbon-intensity"] = (2, '{"actual":2}')
+            async with broadcaster.condition:
+                broadcaster.generation += 1
+                broadcaster.condition.notify_all()
+            messages.append(await stream.__anext__())
+            messages.append(await stream.__anext__())
+            broadcaster.task.cancel()
+            return messages
+
+        self.assertEqual(
+            asyncio.run(scenario()),
+            [
+                'event: carbon-intensity\nid: 1\ndata: {"actual":1}\n\n',
+                'event: carbon-intensity\nid: 2\ndata: {"actual":2}\n\n',
+                ": keepalive\n\n",
+            ],
+        )
@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta, timezone
+from django.test import TestCase
+from apps.carbon_intensity.models import (
+    Region,
+    RegionalGenerationMix,
+    RegionalGenerationMixAggregate,
+)
+from apps.carbon_intensity.tasks import process_regional_generation_response
+
+
+def regional_response(from_dt, mixes):
+    return {
+        "data": [
+            {
+                "from": from_dt.isoformat(),
+                "to": (from_dt + timedelta(minutes=30)).isoformat(),
+                "regions": [
+                    {
+                        "regionid": region_id,
+                        "dnoregion": f"DNO {region_id}",
+                        "shortname": f"Region {region_id}",
+                        "generationmix": [
+                            {"fuel": fuel, "perc": perc} for fuel, perc in mix.items()
+                        ],
+                    }
+                    for region_id, mix in mixes.items()
+                ],
+            }
+        ]
+    }
+
+
+class RegionalGenerationMixTests(TestCase):
+    def setUp(self):
+        self.start = datetime(2025, 1, 31, 23, 30, tzinfo=timezone.utc)
+        for i, wind in enumerate([40, 60, 80]):
+            from_dt = self.start + timedelta(minutes=30 * i)
+            process_regional_generation_response(
+                regional_response(
+                    from_dt, {1: {"wind": wind, "gas": 100 - wind}, 2: {"wind": 10}}
+                )
+            )
+        RegionalGenerationMixAggregate.objects.refresh(
+            self.start, self.start + timedelta(hours=1)
+        )
+
+    def test_ingest_creates_regions_and_ignores_duplicates(self):
+        process_regional_generation_response(
+            regional_response(self.start, {1: {"wind": 0}})
+        )
+        self.assertEqual(Region.objects.count(), 2)
+        self.assertEqual(RegionalGenerationMix.objects.count(), 6)
+
+    def test_monthly_averages(self):
+        result = RegionalGenerationMixAggregate.objects.get_quarter(2025, 1)
+        self.assertEqual(list(result), ["2025-01", "2025-02"])
+        self.assertEqual(result["2025-01"]["1"]["wind"], 40)
+        self.assertEqual(result["2025-02"]["1"]["wind"], 70)
+        self.assertEqual(result["2025-02"]["1"]["gas"], 30)
+        self.assertNotIn("gas", result["2025-02"]["2"])
+
+    def test_quarter_average(self):
+        result = RegionalGenerationMixAggregate.objects.get_quarter(2025, 1, "quarter")
+        self.assertEqual(result["2025-Q1"]["1"]["wind"], 60)
@@ -0,0 +1,35 @@
+from datetime import datetime, timedelta, timezone
+from django.test import TestCase
+from apps.carbon_intensity.models import CarbonIntensity, Region
+from apps.carbon_intensity.regions import clear_regions, get_regions
+from apps.carbon_intensity.serializers import CarbonIntensitySerializer
+
+
+class RegionRegistryTests(TestCase):
+    def setUp(self):
+        clear_regions()
+        self.region = Region.objects.create(
+            region_id=1, name="North Scotland", short_name="NS"
+        )
+        start = datetime(2025, 3, 1, tzinfo=timezone.utc)
+        for i in range(48):
+            from_dt = start + timedelta(minutes=30 * i)
+            CarbonIntensity.objects.create(
+                from_datetime=from_dt,
+                to_datetime=from_dt + timedelta(minutes=30),
+                forecast=100,
+                region=self.region,
+            )
+
+    def test_regional_history_query_count(self):
+        queryset = CarbonIntensity.objects.filter(region_id=1)
+        get_regions()
+        with self.assertNumQueries(1):
+            data = CarbonIntensitySerializer(queryset, many=True).data
+        self.assertEqual(data[0]["region"]["short_name"], "NS")
+
+    def test_reloads_when_regions_change(self):
+        self.assertEqual(get_regions()[1]["name"], "North Scotland")
+        self.region.name = "Scotland North"
+        self.region.save()
+        self.assertEqual(get_regions()[1]["name"], "Scotland North")
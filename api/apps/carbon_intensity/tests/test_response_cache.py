@@ -0,0 +1,34 @@
+import gzip
+import json
+from django.core.cache import cache
+from django.test import TestCase
+from apps.carbon_intensity.models import Region
+
+
+class RenderedResponseCacheTests(TestCase):
+    url = "/api/v1/region/"
+
+    def setUp(self):
+        cache.clear()
+        Region.objects.create(region_id=1, name="North Scotland", short_name="NS")
+
+    def test_hit_skips_the_view(self):
+        first = self.client.get(self.url, HTTP_ACCEPT="application/json")
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url, HTTP_ACCEPT="application/json")
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["Content-Type"], first["Content-Type"])
+
+    def test_serves_gzip_variant(self):
+        first = self.client.get(self.url, HTTP_ACCEPT="application/json")
+        second = self.client.get(
+            self.url, HTTP_ACCEPT="application/json", HTTP_ACCEPT_ENCODING="gzip"
+        )
+        self.assertEqual(second["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(second.content), first.content)
+
+    def test_write_invalidates(self):
+        self.client.get(self.url, HTTP_ACCEPT="application/json")
+        Region.objects.create(region_id=2, name="South Scotland", short_name="SS")
+        response = self.client.get(self.url, HTTP_ACCEPT="application/json")
+        self.assertEqual(len(json.loads(response.content)), 2)
@@ -0,0 +1,136 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from apps.carbon_intensity import retention
+from apps.carbon_intensity.models import (
+    CarbonIntensity,
+    CarbonIntensityStats,
+    GenerationMix,
+    GenerationMixData,
+    GenerationMixRollup,
+    IntensityRollup,
+)
+from apps.carbon_intensity.series_index import clear_series_indexes, get_series_index
+
+
+@override_settings(
+    RETENTION_RAW_MONTHS=1,
+    RETENTION_STATS_DAYS=30,
+    RETENTION_CHUNK_SIZE=7,
+    RETENTION_CHUNK_PAUSE=0,
+)
+class RetentionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        clear_series_indexes()
+        self.now = datetime(2025, 4, 15, tzinfo=timezone.utc)
+        # Two days at the end of February, expired, and two in March.
+        for start in (datetime(2025, 2, 27), datetime(2025, 3, 1)):
+            for i in range(96):
+                from_dt = start.replace(tzinfo=timezone.utc) + timedelta(minutes=30 * i)
+                CarbonIntensity.objects.create(
+                    from_datetime=from_dt,
+                    to_datetime=from_dt + timedelta(minutes=30),
+                    actual=100,
+                )
+                GenerationMix.from_dataclass(
+                    GenerationMixData(
+                        from_datetime=from_dt,
+                        to_datetime=from_dt + timedelta(minutes=30),
+                        fuel_mix={"wind": 50.0, "gas": 50.0},
+                    )
+                ).save()
+
+    def test_expired_raw_data_is_rolled_up_then_deleted(self):
+        february = datetime(2025, 2, 27, tzinfo=timezone.utc)
+        self.assertIsNotNone(
+            get_series_index().window(february, february + timedelta(days=1))
+        )
+
+        deleted = retention.apply_retention(self.now)
+
+        self.assertEqual(deleted["carbonintensity"], 96)
+        self.assertEqual(deleted["generationmix"], 96)
+        self.assertEqual(CarbonIntensity.objects.count(), 96)
+        self.assertFalse(
+            CarbonIntensity.objects.filter(
+                from_datetime__lt=self.now.replace(day=1, month=3)
+            ).exists()
+        )
+        days = IntensityRollup.objects.get_for_period(
+            "day", february, february + timedelta(days=2)
+        )
+        self.assertEqual([day.count for day in days], [48, 48])
+        self.assertFalse(
+            IntensityRollup.objects.filter(
+                resolution="hour",
+                from_datetime__lt=datetime(2025, 3, 1, tzinfo=timezone.utc),
+            ).exists()
+        )
+        # Deleting rows rebuilds the series index without them.
+        self.assertIsNone(
+            get_series_index().window(february, february + timedelta(days=1))
+        )
+
+    def test_straddling_week_survives_the_next_month_expiring(self):
+        week = datetime(2025, 1, 27, tzinfo=timezone.utc)
+        for i in range(7 * 48):
+            from_dt = week + timedelta(minutes=30 * i)
+            CarbonIntensity.objects.create(
+                from_datetime=from_dt,
+                to_datetime=from_dt + timedelta(minutes=30),
+                actual=100,
+            )
+            GenerationMix.from_dataclass(
+                GenerationMixData(
+                    from_datetime=from_dt,
+                    to_datetime=from_dt + timedelta(minutes=30),
+                    fuel_mix={"wind": 50.0, "gas": 50.0},
+                )
+            ).save()
+
+        # January expires first, then February with the week's tail.
+        retention.apply_retention(datetime(2025, 3, 15, tzinfo=timezone.utc))
+        retention.apply_retention(self.now)
+
+        self.assertEqual(
+            IntensityRollup.objects.get(
+                resolution="week", from_datetime=week, region__isnull=True
+            ).count,
+            336,
+        )
+        self.assertEqual(
+            GenerationMixRollup.objects.get(
+                resolution="week", from_datetime=week
+            ).count,
+            336,
+        )
+
+    def test_stale_stats_are_deleted(self):
+        window = {
+            "from_datetime": datetime(2025, 3, 1, tzinfo=timezone.utc),
+            "to_datetime": datetime(2025, 3, 2, tzinfo=timezone.utc),
+            "min_intensity": 100,
+            "max_intensity": 100,
+            "average_intensity": 100,
+        }
+        stale = CarbonIntensityStats.objects.create(**window)
+        CarbonIntensityStats.objects.filter(pk=stale.pk).update(
+            modified=self.now - timedelta(days=31)
+        )
+        CarbonIntensityStats.objects.create(**window, block_hours=6)
+
+        retention.apply_retention(self.now)
+
+        self.assertEqual(
+            list(CarbonIntensityStats.objects.values_list("block_hours", flat=True)),
+            [6],
+        )
+
+    @patch("apps.carbon_intensity.models.clients.CarbonIntensityService")
+    def test_expired_periods_are_not_refetched(self, service):
+        retention.apply_retention(self.now)
+        january = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        CarbonIntensity.objects.get_for_period(january, january + timedelta(days=1))
+        service.assert_not_called()
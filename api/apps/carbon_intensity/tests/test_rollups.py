@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta, timezone
+from django.test import TestCase
+from rest_framework.test import APIClient
+from apps.carbon_intensity import rollups
+from apps.carbon_intensity.models import (
+    CarbonIntensity,
+    GenerationMix,
+    GenerationMixData,
+    GenerationMixRollup,
+    IntensityRollup,
+)
+
+
+class RollupTests(TestCase):
+    def setUp(self):
+        self.start = datetime(2025, 3, 1, tzinfo=timezone.utc)
+        for i in range(96):
+            from_dt = self.start + timedelta(minutes=30 * i)
+            CarbonIntensity.objects.create(
+                from_datetime=from_dt,
+                to_datetime=from_dt + timedelta(minutes=30),
+                actual=None if i == 0 else i,
+                forecast=1000,
+            )
+            GenerationMix.from_dataclass(
+                GenerationMixData(
+                    from_datetime=from_dt,
+                    to_datetime=from_dt + timedelta(minutes=30),
+                    fuel_mix={"wind": float(i), "gas": 10.0},
+                )
+            ).save()
+        self.end = self.start + timedelta(days=2)
+
+    def test_pick_resolution(self):
+        self.assertEqual(rollups.pick_resolution(self.start, self.end, 300), "raw")
+        self.assertEqual(rollups.pick_resolution(self.start, self.end, 10), "day")
+        year = self.start + timedelta(days=365)
+        self.assertEqual(rollups.pick_resolution(self.start, year, 400), "day")
+        self.assertEqual(rollups.pick_resolution(self.start, year, 60), "week")
+
+    def test_intensity_rollup_buckets(self):
+        IntensityRollup.objects.refresh(self.start, self.end)
+        days = list(IntensityRollup.objects.get_for_period("day", self.start, self.end))
+        self.assertEqual(len(days), 2)
+        # The first period has no actual value so its forecast is used instead
+        self.assertEqual(days[0].count, 48)
+        self.assertEqual(days[0].min_intensity, 1)
+        self.assertEqual(days[0].max_intensity, 1000)
+        self.assertEqual(days[1].min_intensity, 48)
+        self.assertEqual(days[1].average_intensity, 71.5)
+        self.assertEqual(IntensityRollup.objects.filter(resolution="hour").count(), 48)
+
+    def test_refresh_is_incremental_and_idempotent(self):
+        IntensityRollup.objects.refresh(self.start, self.end)
+        total = IntensityRollup.objects.count()
+        last = self.end - timedelta(minutes=30)
+        IntensityRollup.objects.refresh(last, last)
+        self.assertEqual(IntensityRollup.objects.count(), total)
+
+    def test_generation_mix_rollup(self):
+        GenerationMixRollup.objects.refresh(self.start, self.end)
+        month = GenerationMixRollup.objects.get(resolution="month")
+        self.assertEqual(month.count, 96)
+        self.assertEqual(month.fuel_mix["gas"]["mean"], 10.0)
+        self.assertEqual(month.fuel_mix["wind"]["max"], 95.0)
+
+    def test_list_endpoint_resolution(self):
+        IntensityRollup.objects.refresh(self.start, self.end)
+        response = APIClient().get(
+            "/api/v1/carbon-intensity/",
+            {
+                "from": "2025-03-01T00:00:00Z",
+                "to": "2025-03-03T00:00:00Z",
+                "resolution": "auto",
+                "points": 10,
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 2)
+        self.assertEqual(response.json()[0]["resolution"], "day")
+
+    def test_list_endpoint_rejects_unknown_resolution(self):
+        response = APIClient().get(
+            "/api/v1/carbon-intensity/", {"resolution": "fortnight"}
+        )
+        self.assertEqual(response.status_code, 400)
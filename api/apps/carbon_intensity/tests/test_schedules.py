@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock, patch
+from celery.exceptions import Retry
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from apps.carbon_intensity import schedules
+from apps.carbon_intensity.tasks import (
+    TRANSIENT_BACKOFF_MAX,
+    retry_transient,
+    retry_unpublished,
+)
+from apps.core.utils.base_client import NetworkError
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+@override_settings(INGEST_PUBLISH_OFFSET=60, INGEST_RETRY_SECONDS=30)
+class SettlementPeriodTests(SimpleTestCase):
+    def test_next_run_is_boundary_plus_offset(self):
+        self.assertEqual(
+            schedules.next_run(utc(2025, 3, 1, 10, 0), 60), utc(2025, 3, 1, 10, 1)
+        )
+        self.assertEqual(
+            schedules.next_run(utc(2025, 3, 1, 10, 1), 60), utc(2025, 3, 1, 10, 31)
+        )
+        self.assertEqual(
+            schedules.next_run(utc(2025, 3, 1, 10, 45), 60), utc(2025, 3, 1, 11, 1)
+        )
+
+    def test_due_once_per_period(self):
+        now = utc(2025, 3, 1, 10, 2)
+        schedule = schedules.settlement_period(nowfun=lambda: now)
+        due, next_in = schedule.is_due(utc(2025, 3, 1, 9, 31))
+        self.assertTrue(due)
+        self.assertEqual(next_in, timedelta(minutes=29).total_seconds())
+        due, next_in = schedule.is_due(utc(2025, 3, 1, 10, 1))
+        self.assertFalse(due)
+        self.assertEqual(next_in, timedelta(minutes=29).total_seconds())
+
+    def test_is_published(self):
+        now = utc(2025, 3, 1, 10, 5)
+        previous = [{"from": "2025-03-01T09:30Z"}]
+        self.assertFalse(schedules.is_published(previous, now))
+        self.assertTrue(schedules.is_published([{"from": "2025-03-01T10:00Z"}], now))
+
+    def test_retries_stop_before_the_next_run(self):
+        self.assertEqual(schedules.retry_countdown(utc(2025, 3, 1, 10, 2)), 30)
+        self.assertIsNone(schedules.retry_countdown(utc(2025, 3, 1, 10, 30, 40)))
+
+    @patch("apps.carbon_intensity.schedules.datetime")
+    def test_task_retries_until_published(self, clock):
+        clock.now.return_value = utc(2025, 3, 1, 10, 2)
+        task = Mock()
+        task.retry.return_value = Retry()
+        with self.assertRaises(Retry):
+            retry_unpublished(task, [{"from": "2025-03-01T09:30Z"}])
+        # A half-hour of 30 s retries, plus room for upstream error retries.
+        task.retry.assert_called_once_with(countdown=30, max_retries=63)
+        retry_unpublished(task, [{"from": "2025-03-01T10:00Z"}])
+        self.assertEqual(task.retry.call_count, 1)
+
+    def test_upstream_errors_have_their_own_capped_budget(self):
+        cache.clear()
+        # Many retries already spent waiting for publication.
+        task = Mock(request=Mock(id="task-id", retries=40))
+        task.retry.return_value = Retry()
+        for _ in range(3):
+            with self.assertRaises(Retry):
+                with retry_transient(task):
+                    raise NetworkError("down")
+        self.assertTrue(
+            all(
+                call.kwargs["countdown"] <= TRANSIENT_BACKOFF_MAX
+                for call in task.retry.call_args_list
+            )
+        )
+        with self.assertRaises(NetworkError):
+            with retry_transient(task):
+                raise NetworkError("down")
+        self.assertEqual(task.retry.call_count, 3)
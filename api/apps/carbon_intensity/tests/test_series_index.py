@@ -0,0 +1,69 @@
+import random
+from datetime import datetime, timedelta, timezone
+from django.core.cache import cache
+from django.test import TestCase
+from apps.carbon_intensity.models import CarbonIntensity
+from apps.carbon_intensity.series_index import clear_series_indexes, get_series_index
+
+
+class IntensitySeriesIndexTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        clear_series_indexes()
+        self.start = datetime(2025, 3, 1, tzinfo=timezone.utc)
+        rng = random.Random(0)
+        self.values = {}
+        for i in range(200):
+            if i in (20, 21):
+                continue  # a gap in the stored series
+            from_dt = self.start + timedelta(minutes=30 * i)
+            self.values[i] = rng.randint(20, 400)
+            CarbonIntensity.objects.create(
+                from_datetime=from_dt,
+                to_datetime=from_dt + timedelta(minutes=30),
+                actual=self.values[i],
+            )
+
+    def test_windows_match_brute_force(self):
+        index = get_series_index()
+        rng = random.Random(1)
+        for _ in range(50):
+            first = rng.randint(0, 199)
+            last = rng.randint(first + 1, 200)
+            expected = [self.values[i] for i in range(first, last) if i in self.values]
+            window = index.window(
+                self.start + timedelta(minutes=30 * first),
+                self.start + timedelta(minutes=30 * last),
+            )
+            if not expected:
+                self.assertIsNone(window)
+                continue
+            self.assertEqual(window["count"], len(expected))
+            self.assertEqual(window["min_intensity"], min(expected))
+            self.assertEqual(window["max_intensity"], max(expected))
+            self.assertEqual(
+                window["average_intensity"], round(sum(expected) / len(expected), 2)
+            )
+
+    def test_refreshes_after_ingest(self):
+        before = get_series_index().window(self.start, self.start + timedelta(days=5))
+        from_dt = self.start + timedelta(minutes=30 * 20)
+        CarbonIntensity.objects.create(
+            from_datetime=from_dt, to_datetime=from_dt + timedelta(minutes=30), actual=1
+        )
+        after = get_series_index().window(self.start, self.start + timedelta(days=5))
+        self.assertEqual(after["count"], before["count"] + 1)
+        self.assertEqual(after["min_intensity"], 1)
+
+    def test_late_commit_from_another_shard_is_picked_up(self):
+        get_series_index()
+        from_dt = self.start + timedelta(minutes=30 * 21)
+        late = CarbonIntensity.objects.create(
+            from_datetime=from_dt, to_datetime=from_dt + timedelta(minutes=30), actual=1
+        )
+        # Written before the last refresh, committed after it.
+        CarbonIntensity.objects.filter(pk=late.pk).update(
+            modified=self.start - timedelta(days=1)
+        )
+        window = get_series_index().window(from_dt, from_dt + timedelta(minutes=30))
+        self.assertEqual(window["min_intensity"], 1)
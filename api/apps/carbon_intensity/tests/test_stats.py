@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+from django.core.cache import cache
+from django.test import TestCase
+from apps.carbon_intensity.models import CarbonIntensity, CarbonIntensityStats
+from apps.carbon_intensity.series_index import clear_series_indexes
+
+
+class CarbonIntensityStatsComputeTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        clear_series_indexes()
+        self.start = datetime(2025, 3, 1, tzinfo=timezone.utc)
+        for i in range(48):
+            from_dt = self.start + timedelta(minutes=30 * i)
+            CarbonIntensity.objects.create(
+                from_datetime=from_dt,
+                to_datetime=from_dt + timedelta(minutes=30),
+                actual=None if i == 47 else 100 + i,
+                forecast=500,
+            )
+        self.end = self.start + timedelta(days=1)
+        self.service = patch(
+            "apps.core.utils.api_clients.CarbonIntensityService"
+        ).start()
+        self.addCleanup(patch.stopall)
+
+    def test_computes_window_from_stored_rows(self):
+        (result,) = CarbonIntensityStats.objects.compute(self.start, self.end)
+        self.assertEqual(result.min_intensity, 100)
+        self.assertEqual(result.max_intensity, 500)
+        self.assertEqual(
+            result.average_intensity, round((sum(range(100, 147)) + 500) / 48, 2)
+        )
+        self.service.assert_not_called()
+
+    def test_computes_blocks(self):
+        results = CarbonIntensityStats.objects.compute(self.start, self.end, 12)
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0].to_datetime, self.start + timedelta(hours=12))
+        self.assertEqual(results[0].max_intensity, 123)
+        self.assertEqual(results[1].min_intensity, 124)
+
+    def test_repeated_requests_do_not_duplicate_rows(self):
+        CarbonIntensityStats.objects.compute(self.start, self.end)
+        cache.clear()
+        CarbonIntensityStats.objects.compute(self.start, self.end)
+        self.assertEqual(CarbonIntensityStats.objects.count(), 1)
+
+    def test_falls_back_to_upstream_for_missing_coverage(self):
+        self.service.return_value.get_statistics.return_value = {
+            "data": [{"max": 300, "average": 200, "min": 100, "index": "moderate"}]
+        }
+        (result,) = CarbonIntensityStats.objects.compute(
+            self.start, self.end + timedelta(hours=1)
+        )
+        self.service.return_value.get_statistics.assert_called_once()
+        self.assertEqual(result.average_intensity, 200)
@@ -1,6 +1,7 @@
+from django.urls import path
 from rest_framework.routers import SimpleRouter
 
-from . import viewsets
+from . import async_views, viewsets
 
 router = SimpleRouter()
 
@@ -11,5 +12,21 @@ router.register("region", viewsets.RegionViewSet, basename="region")
 router.register(
     "generation-mix", viewsets.GenerationMixViewSet, basename="generation-mix"
 )
+router.register(
+    "carbon-intensity-stats",
+    viewsets.CarbonIntensityStatsViewSet,
+    basename="carbon-intensity-stats",
+)
+router.register("export", viewsets.ExportViewSet, basename="export")
 
 urlpatterns = router.urls
+
+# Served ahead of the router in ASGI mode, see settings.ASYNC_PROXY_VIEWS
+async_urlpatterns = [
+    path("carbon-intensity/current/", async_views.current),
+    path("carbon-intensity/latest/", async_views.latest),
+    path("carbon-intensity/regional/", async_views.regional),
+    path("carbon-intensity/today/", async_views.today),
+    path("carbon-intensity/date/<str:date>/", async_views.intensity_date),
+    path("generation-mix/latest/", async_views.latest_generation_mix),
+]
@@ -1,48 +1,171 @@
 from datetime import datetime, timedelta
 from dataclasses import asdict
-import json
-import os
-from pathlib import Path
+from typing import List, Optional
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ParseError
+from rest_framework.negotiation import BaseContentNegotiation
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
+from django.conf import settings
+from django.http import StreamingHttpResponse
 from django.utils.dateparse import parse_datetime
 from django.core.exceptions import ValidationError
 from .models import (
     CarbonIntensity,
     CarbonIntensityData,
+    PackedCarbonIntensity,
+    IntensityRollup,
+    GenerationMixRollup,
     Region,
     GenerationMix,
     CarbonIntensityStats,
-    CarbonIntensityStatistics,
+    AGGREGATE_PERIODS,
+    FUEL_TYPES,
+    RegionalGenerationMixAggregate,
 )
 from .serializers import (
     CarbonIntensitySerializer,
     RegionSerializer,
     GenerationMixSerializer,
     CarbonIntensityStatsSerializer,
+    IntensityRollupSerializer,
+    GenerationMixRollupSerializer,
+    GENERATION_MIX_ROW_FIELDS,
+    INTENSITY_ROW_FIELDS,
+    serialize_generation_mix_rows,
+    serialize_intensity_rows,
 )
+from . import exports, push, rollups
 
-from apps.core.utils.api_clients import CarbonIntensityService
+from apps.core import columnar
+from apps.core.pagination import KeysetPagination
+from apps.core.renderers import FastJSONRenderer, TIME_SERIES_RENDERERS
+from apps.core.utils import clients
+from apps.core.utils.datasets import MONTHLY_GENERATION_AVERAGES, load_dataset
 
 
-class CarbonIntensityViewSet(viewsets.ReadOnlyModelViewSet):
-    serializer_class = CarbonIntensitySerializer
+# Roughly the pixel width of a dashboard chart.
+DEFAULT_POINT_BUDGET = 300
 
-    def get_queryset(self):
+
+class RollupListMixin:
+    """Lets list endpoints serve a downsampled rollup via ``?resolution=``."""
+
+    def get_resolution(self, from_dt, to_dt):
+        params = self.request.query_params
+        resolution = params.get("resolution", rollups.RAW)
+        if resolution == "auto":
+            try:
+                points = int(params.get("points", DEFAULT_POINT_BUDGET))
+            except ValueError:
+                raise ParseError("'points' must be an integer.")
+            return rollups.pick_resolution(from_dt, to_dt, max(points, 1))
+        if resolution not in [rollups.RAW, *rollups.RESOLUTIONS]:
+            raise ParseError(
+                f"'resolution' must be one of auto, raw, {', '.join(rollups.RESOLUTIONS)}."
+            )
+        return resolution
+
+
+class LatestPushMixin:
+    """
+    Conditional ``latest`` responses keyed on the newest row, see ``push``.
+
+    A matching ``If-None-Match`` gets a 304. ``?wait=`` long-polls are only
+    served by the async views in ASGI mode, here they are answered at once.
+    """
+
+    def latest_response(self, request, event):
+        instance = push.LATEST_INSTANCES[event]()
+        if not instance:
+            return Response(
+                {"detail": "No data available"}, status=status.HTTP_404_NOT_FOUND
+            )
+        etag = push.get_etag(event, instance)
+        if request.headers.get("If-None-Match") == etag:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data, headers={"ETag": etag})
+
+
+class CarbonIntensityViewSet(
+    LatestPushMixin, RollupListMixin, viewsets.ReadOnlyModelViewSet
+):
+    serializer_class = CarbonIntensitySerializer
+    pagination_class = KeysetPagination
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer, *TIME_SERIES_RENDERERS]
+    columnar_schema = {
+        "from_datetime": columnar.TIMESTAMP,
+        "to_datetime": columnar.TIMESTAMP,
+        "actual": columnar.INT,
+        "forecast": columnar.INT,
+        "index": columnar.STRING,
+        "region.region_id": columnar.INT,
+        "region.name": columnar.STRING,
+        "region.postcode_prefix": columnar.STRING,
+        "region.short_name": columnar.STRING,
+        "postcode_prefix": columnar.STRING,
+    }
+
+    def _get_period(self):
         params = self.request.query_params
-        print(params)
         from_dt = parse_datetime(
             params.get(
                 "from", (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
             )
         )
         to_dt = parse_datetime(params.get("to", datetime.now().strftime("%Y-%m-%d")))
-        region_id = params.get("region_id")
-        postcode = params.get("postcode")
 
         if not from_dt or not to_dt:
             raise ValidationError("Both 'from' and 'to' datetime parameters required")
+        return from_dt, to_dt
+
+    def list(self, request, *args, **kwargs):
+        """
+        Serve range reads from a rollup when a coarser resolution is requested,
+        or from packed storage when it is enabled and populated. Packed reads
+        are paged by a cursor that only reads the months past it. Raw rows are
+        paged by ``(from_datetime, id)`` keyset and built with the
+        ``values_list()`` fast path rather than the serializer.
+        """
+        if "resolution" in request.query_params:
+            from_dt, to_dt = self._get_period()
+            resolution = self.get_resolution(from_dt, to_dt)
+            if resolution != rollups.RAW:
+                queryset = IntensityRollup.objects.get_for_period(
+                    resolution, from_dt, to_dt, request.query_params.get("region_id")
+                )
+                serializer = IntensityRollupSerializer(queryset, many=True)
+                return Response(serializer.data)
+
+        params = request.query_params
+        if settings.CARBON_INTENSITY_PACKED_STORAGE and not params.get("postcode"):
+            from_dt, to_dt = self._get_period()
+            position = self.paginator.decode_cursor(request)
+            rows = PackedCarbonIntensity.objects.get_for_period(
+                from_dt,
+                to_dt,
+                params.get("region_id"),
+                after=position[0] if position else None,
+                limit=self.paginator.get_page_size(request) + 1,
+            )
+            # Months that were never packed are paged from the table instead.
+            if rows:
+                page = self.paginator.paginate_rows(
+                    rows, request, lambda row: parse_datetime(row["from_datetime"])
+                )
+                return self.get_paginated_response(page)
+        page = self.paginate_queryset(
+            self.get_queryset().values_list(*INTENSITY_ROW_FIELDS, "id", named=True)
+        )
+        return self.get_paginated_response(serialize_intensity_rows(page))
+
+    def get_queryset(self):
+        params = self.request.query_params
+        from_dt, to_dt = self._get_period()
+        region_id = params.get("region_id")
+        postcode = params.get("postcode")
 
         queryset = CarbonIntensity.objects.get_for_period(from_dt, to_dt, region_id)
 
@@ -53,35 +176,33 @@ class CarbonIntensityViewSet(viewsets.ReadOnlyModelViewSet):
 
     @action(detail=False, methods=["get"], url_path="latest")
     def latest(self, request):
-        """Take latest stored national intensity (from Django DB)."""
-        instance = CarbonIntensity.objects.latest_national_intensity()
-        if not instance:
-            return Response(
-                {"detail": "No data available"}, status=status.HTTP_404_NOT_FOUND
-            )
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+        """
+        Take latest stored national intensity (from Django DB).
+
+        Supports ``If-None-Match``, and long-polling with ``?wait=<seconds>``
+        in ASGI mode.
+        """
+        return self.latest_response(request, push.CARBON_INTENSITY_EVENT)
 
     # National Intensity Endpoints
     @action(detail=False, methods=["get"], url_path="current")
     def current(self, request):
         """Gets current national intensity."""
-        service = CarbonIntensityService()
+        service = clients.CarbonIntensityService()
         response = service.get_current_intensity()
         return self._handle_intensity_response(response)
 
     @action(detail=False, methods=["get"], url_path="regional")
     def regional(self, request):
         """Gets current regional intensity."""
-        service = CarbonIntensityService()
+        service = clients.CarbonIntensityService()
         response = service.get_regional_current()
-        print(response)
         return Response(response, status=status.HTTP_200_OK)
 
     @action(detail=False, methods=["get"])
     def today(self, request):
         """Gets today's national intensity."""
-        service = CarbonIntensityService()
+        service = clients.CarbonIntensityService()
         response = service.get_intensity_today()
         return self._handle_intensity_response(response)
 
@@ -91,13 +212,19 @@ class CarbonIntensityViewSet(viewsets.ReadOnlyModelViewSet):
             parsed_date = datetime.strptime(date, "%Y-%m-%d").date().isoformat()
         except ValueError:
             raise ValidationError("Invalid date format. Use YYYY-MM-DD.")
-        service = CarbonIntensityService()
+        service = clients.CarbonIntensityService()
         response = service.get_intensity_date(parsed_date)
         return self._handle_intensity_response(response)
 
     @action(detail=False, methods=["get"], url_path="quarterly-generationmix")
     def quarterly(self, request):
-        """Gets quarterly generation mix."""
+        """
+        Gets quarterly generation mix.
+
+        Monthly regional averages are served from the stored aggregates, pass
+        ``aggregate=quarter`` for one average over the whole quarter. The
+        bundled JSON file is used for months that have not been ingested.
+        """
         year = request.query_params.get("year")
         quarter = request.query_params.get("quarter")
         if not year or not quarter:
@@ -105,28 +232,37 @@ class CarbonIntensityViewSet(viewsets.ReadOnlyModelViewSet):
                 {"error": "Year and quarter are required parameters."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-
-        module_path = Path(__file__).resolve().parent.parent.parent
-        file_path = os.path.join(
-            module_path, "data/generationmix/monthly_generation_averages.json"
+        try:
+            year, quarter = int(year), int(quarter)
+        except ValueError:
+            raise ParseError("Year and quarter must be integers.")
+        if not 1 <= quarter <= 4:
+            raise ParseError("Quarter must be between 1 and 4.")
+
+        period = request.query_params.get("aggregate", "month")
+        if period not in dict(AGGREGATE_PERIODS):
+            raise ParseError(
+                f"Invalid aggregate '{period}', expected one of: "
+                f"{', '.join(dict(AGGREGATE_PERIODS))}"
+            )
+        aggregates = RegionalGenerationMixAggregate.objects.get_quarter(
+            year, quarter, period
         )
-        # Check if the file exists
-        if not os.path.exists(file_path):
+        if aggregates or period != "month":
+            return Response(aggregates)
+
+        data = load_dataset(MONTHLY_GENERATION_AVERAGES)
+        if data is None:
             return Response(
                 {"error": "Data file not found."},
                 status=status.HTTP_404_NOT_FOUND,
             )
-        # Load the data from the JSON file
-        with open(file_path, "r") as f:
-            data = json.load(f)
 
         # Filter the data for the specified quarter and year
         filtered_data = {}
         for month, regions in data.items():
             month_date = datetime.strptime(month, "%Y-%m")
-            if month_date.year == int(year) and (month_date.month - 1) // 3 + 1 == int(
-                quarter
-            ):
+            if month_date.year == year and (month_date.month - 1) // 3 + 1 == quarter:
                 filtered_data[month] = regions
 
         return Response(filtered_data)
@@ -137,66 +273,74 @@ class CarbonIntensityViewSet(viewsets.ReadOnlyModelViewSet):
         url_path="stats/(?P<from_time>[^/]+)/(?P<to_time>[^/]+)",
     )
     def stats(self, request, from_time=None, to_time=None):
+        """
+        Min/max/average national intensity, optionally in ``?block=`` hour blocks.
+        Computed from stored data, upstream is only used for missing coverage.
+        """
         from_dt = parse_datetime(from_time)
         to_dt = parse_datetime(to_time)
         if not from_dt or not to_dt:
             raise ValidationError("Valid 'from' and 'to' datetimes required.")
-        service = CarbonIntensityService()
-        response = service.get_statistics(from_dt, to_dt)
-        return self._handle_stats_response(response, from_dt, to_dt)
+        block = request.query_params.get("block")
+        try:
+            block_hours = int(block) if block else None
+        except ValueError:
+            raise ParseError("'block' must be a whole number of hours.")
+        if block_hours is not None and not 1 <= block_hours <= 24:
+            raise ParseError("'block' must be between 1 and 24 hours.")
 
-    def _handle_intensity_response(self, response):
-        if not response or "data" not in response:
+        instances = CarbonIntensityStats.objects.compute(from_dt, to_dt, block_hours)
+        if not instances:
             return Response(
                 {"detail": "No data available"}, status=status.HTTP_404_NOT_FOUND
             )
+        if block_hours:
+            return Response(CarbonIntensityStatsSerializer(instances, many=True).data)
+        return Response(CarbonIntensityStatsSerializer(instances[0]).data)
 
-        # Save data to CarbonIntensity model
-        data = response["data"]
-        if isinstance(data, list):
-            entries = data
-        else:
-            entries = [data]
-
-        saved_instances = []
-        for entry in entries:
-            intensity = entry.get("intensity", {})
-            ci_data = CarbonIntensityData(
-                from_datetime=parse_datetime(entry["from"]),
-                to_datetime=parse_datetime(entry["to"]),
-                actual=intensity.get("actual"),
-                forecast=intensity.get("forecast"),
-                index=intensity.get("index", "moderate"),
-            )
-            obj, created = CarbonIntensity.objects.update_or_create(
-                from_datetime=ci_data.from_datetime,
-                to_datetime=ci_data.to_datetime,
-                defaults=asdict(ci_data),
-            )
-            saved_instances.append(obj)
-
-        serializer = self.get_serializer(saved_instances, many=True)
-        return Response(serializer.data)
-
-    def _handle_stats_response(self, response, from_dt, to_dt):
-        if not response or "data" not in response:
+    def _handle_intensity_response(self, response):
+        instances = store_intensity_response(response)
+        if instances is None:
             return Response(
                 {"detail": "No data available"}, status=status.HTTP_404_NOT_FOUND
             )
+        serializer = self.get_serializer(instances, many=True)
+        return Response(serializer.data)
 
-        # Save stats data
-        stats_data = CarbonIntensityStatistics(
-            from_datetime=from_dt,
-            to_datetime=to_dt,
-            min_intensity=response["data"]["min"],
-            max_intensity=response["data"]["max"],
-            average_intensity=response["data"]["average"],
-        )
-        stats_obj = CarbonIntensityStats.from_dataclass(stats_data)
-        stats_obj.save()
 
-        serializer = CarbonIntensityStatsSerializer(stats_obj)
-        return Response(serializer.data)
+def store_intensity_response(response) -> Optional[List[CarbonIntensity]]:
+    """
+    Save the national entries of an upstream intensity response.
+
+    :return: the saved instances, or ``None`` if the response has no data
+    """
+    if not response or "data" not in response:
+        return None
+
+    # Save data to CarbonIntensity model
+    data = response["data"]
+    if isinstance(data, list):
+        entries = data
+    else:
+        entries = [data]
+
+    saved_instances = []
+    for entry in entries:
+        intensity = entry.get("intensity", {})
+        ci_data = CarbonIntensityData(
+            from_datetime=parse_datetime(entry["from"]),
+            to_datetime=parse_datetime(entry["to"]),
+            actual=intensity.get("actual"),
+            forecast=intensity.get("forecast"),
+            index=intensity.get("index", "moderate"),
+        )
+        obj, created = CarbonIntensity.objects.update_or_create(
+            from_datetime=ci_data.from_datetime,
+            to_datetime=ci_data.to_datetime,
+            defaults=asdict(ci_data),
+        )
+        saved_instances.append(obj)
+    return saved_instances
 
 
 class RegionViewSet(viewsets.ReadOnlyModelViewSet):
@@ -205,29 +349,80 @@ class RegionViewSet(viewsets.ReadOnlyModelViewSet):
     lookup_field = "region_id"
 
 
-class GenerationMixViewSet(viewsets.ReadOnlyModelViewSet):
+class GenerationMixViewSet(
+    LatestPushMixin, RollupListMixin, viewsets.ReadOnlyModelViewSet
+):
     serializer_class = GenerationMixSerializer
+    pagination_class = KeysetPagination
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer, *TIME_SERIES_RENDERERS]
+    columnar_schema = {
+        "from_datetime": columnar.TIMESTAMP,
+        "to_datetime": columnar.TIMESTAMP,
+        **{f"fuel_mix.{fuel}": columnar.FLOAT for fuel in FUEL_TYPES},
+    }
+
+    def list(self, request, *args, **kwargs):
+        """
+        Serve a rollup when a coarser resolution is requested, raw rows paged
+        by keyset through the ``values_list()`` fast path otherwise.
+        """
+        params = request.query_params
+        if "resolution" in params:
+            from_dt = parse_datetime(params.get("from", ""))
+            to_dt = parse_datetime(params.get("to", ""))
+            if not from_dt or not to_dt:
+                raise ParseError("'from' and 'to' are required with 'resolution'.")
+            resolution = self.get_resolution(from_dt, to_dt)
+            if resolution != rollups.RAW:
+                queryset = GenerationMixRollup.objects.get_for_period(
+                    resolution, from_dt, to_dt
+                )
+                serializer = GenerationMixRollupSerializer(queryset, many=True)
+                return Response(serializer.data)
+        page = self.paginate_queryset(
+            self.get_queryset().values_list(
+                *GENERATION_MIX_ROW_FIELDS, "id", named=True
+            )
+        )
+        return self.get_paginated_response(serialize_generation_mix_rows(page))
 
     def get_queryset(self):
         params = self.request.query_params
-        from_dt = parse_datetime(params.get("from"))
-        to_dt = parse_datetime(params.get("to"))
+        from_dt = parse_datetime(params.get("from", ""))
+        to_dt = parse_datetime(params.get("to", ""))
 
         if from_dt and to_dt:
             return GenerationMix.objects.filter(
                 from_datetime__gte=from_dt, to_datetime__lte=to_dt
             )
+        # Unbounded, the paginator caps how much of it one response returns
         return GenerationMix.objects.all()
 
     @action(detail=False, methods=["get"])
-    def latest(self, request):
-        instance = GenerationMix.objects.get_latest_mix()
-        if not instance:
+    def average(self, request):
+        """Average percentage per fuel type between ``from`` and ``to``."""
+        from_dt = parse_datetime(request.query_params.get("from", ""))
+        to_dt = parse_datetime(request.query_params.get("to", ""))
+        if not from_dt or not to_dt:
+            raise ParseError("Both 'from' and 'to' datetime parameters required.")
+        fuel_mix = GenerationMix.objects.get_average_mix(from_dt, to_dt)
+        if not fuel_mix:
             return Response(
                 {"detail": "No data available"}, status=status.HTTP_404_NOT_FOUND
             )
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+        return Response(
+            {"from_datetime": from_dt, "to_datetime": to_dt, "fuel_mix": fuel_mix}
+        )
+
+    @action(detail=False, methods=["get"])
+    def latest(self, request):
+        """
+        Latest stored generation mix.
+
+        Supports ``If-None-Match``, and long-polling with ``?wait=<seconds>``
+        in ASGI mode.
+        """
+        return self.latest_response(request, push.GENERATION_MIX_EVENT)
 
 
 class CarbonIntensityStatsViewSet(viewsets.ReadOnlyModelViewSet):
@@ -242,3 +437,73 @@ class CarbonIntensityStatsViewSet(viewsets.ReadOnlyModelViewSet):
             raise ValidationError("Both 'from' and 'to' datetime parameters required")
 
         return CarbonIntensityStats.objects.get_stats(from_dt, to_dt)
+
+    def list(self, request, *args, **kwargs):
+        """Stored stats for the window, computed on demand if there are none."""
+        queryset = self.get_queryset()
+        if not queryset:
+            queryset = CarbonIntensityStats.objects.compute(
+                parse_datetime(request.query_params["from"]),
+                parse_datetime(request.query_params["to"]),
+            )
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+
+class IgnoreClientContentNegotiation(BaseContentNegotiation):
+    """Exports pick their own content type, errors are always JSON."""
+
+    def select_parser(self, request, parsers):
+        return parsers[0]
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return (renderers[0], renderers[0].media_type)
+
+
+class ExportViewSet(viewsets.ViewSet):
+    """
+    Bulk export of a stored dataset between ``from`` and ``to``.
+
+    ``file_format`` is one of csv (default), arrow or parquet. The file is
+    streamed chunk by chunk straight from the database cursor.
+    """
+
+    lookup_field = "dataset"
+    content_negotiation_class = IgnoreClientContentNegotiation
+
+    def list(self, request):
+        return Response(
+            {
+                "datasets": list(exports.DATASETS),
+                "formats": exports.FORMATS,
+            }
+        )
+
+    def retrieve(self, request, dataset=None):
+        if dataset not in exports.DATASETS:
+            raise NotFound(f"Unknown dataset '{dataset}'.")
+        params = request.query_params
+        from_dt = parse_datetime(params.get("from", ""))
+        to_dt = parse_datetime(params.get("to", ""))
+        if not from_dt or not to_dt:
+            raise ParseError("Both 'from' and 'to' datetime parameters required.")
+        file_format = params.get("file_format", exports.CSV)
+        if file_format not in exports.FORMATS:
+            raise ParseError(
+                f"'file_format' must be one of {', '.join(exports.FORMATS)}."
+            )
+
+        response = StreamingHttpResponse(
+            exports.stream_export(
+                exports.DATASETS[dataset],
+                file_format,
+                from_dt,
+                to_dt,
+                params.get("region_id"),
+                settings.EXPORT_CHUNK_SIZE,
+            ),
+            content_type=exports.CONTENT_TYPES[file_format],
+        )
+        filename = f"{dataset}_{from_dt:%Y%m%d}_{to_dt:%Y%m%d}.{file_format}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
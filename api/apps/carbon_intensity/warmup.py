@@ -0,0 +1,19 @@
+"""Warm-up steps for the carbon intensity app, see apps.core.warmup."""
+
+from . import push
+from .regions import get_regions
+from .series_index import get_series_index
+
+
+def warm_regions():
+    get_regions()
+
+
+def warm_series_index():
+    # The national index, which the stats and range endpoints read.
+    get_series_index()
+
+
+def warm_latest():
+    for event in push.LATEST_INSTANCES:
+        push.load_latest(event)
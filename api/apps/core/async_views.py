@@ -0,0 +1,44 @@
+"""Helpers for the plain Django async views served in ASGI mode.
+
+DRF views are synchronous, so the upstream proxy endpoints get async
+counterparts that keep the DRF behaviour they replace: the same throttles and
+the same compact JSON output.
+"""
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from apps.core.renderers import FastJSONRenderer
+
+
+def json_response(data, status: int = 200) -> HttpResponse:
+    """Response rendered exactly as DRF's JSONRenderer would render ``data``."""
+    return HttpResponse(
+        FastJSONRenderer().render(data),
+        content_type="application/json",
+        status=status,
+    )
+
+
+def _throttle_wait(request):
+    drf_request = Request(request)
+    for throttle_class in api_settings.DEFAULT_THROTTLE_CLASSES:
+        throttle = throttle_class()
+        if not throttle.allow_request(drf_request, None):
+            return throttle.wait() or 0
+    return None
+
+
+async def check_throttles(request):
+    """A 429 response if the default DRF throttles refuse ``request``."""
+    wait = await sync_to_async(_throttle_wait)(request)
+    if wait is None:
+        return None
+    response = json_response(
+        {"detail": "Request was throttled."},
+        status=429,
+    )
+    response["Retry-After"] = str(int(wait))
+    return response
@@ -0,0 +1,114 @@
+"""Columnar layout of list responses for the binary renderers.
+
+Rows (lists of dicts, with nested dicts flattened to ``parent.child`` names)
+are turned into typed columns. Views can pin column types through a
+``columnar_schema`` attribute, anything else is inferred from the values.
+Timestamps are carried as integer milliseconds since the Unix epoch (UTC).
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from django.utils.dateparse import parse_datetime
+
+TIMESTAMP = "timestamp"
+INT = "int"
+FLOAT = "float"
+STRING = "string"
+BOOL = "bool"
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MILLISECOND = timedelta(milliseconds=1)
+
+
+@dataclass
+class Column:
+    name: str
+    type: str
+    values: List[Any]
+
+
+def _flatten(row: dict, prefix: str = "") -> Dict[str, Any]:
+    flat = {}
+    for key, value in row.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{name}."))
+        else:
+            flat[name] = value
+    return flat
+
+
+def _infer_type(values: List[Any]) -> str:
+    types = {type(value) for value in values if value is not None}
+    if not types:
+        return STRING
+    if types == {bool}:
+        return BOOL
+    if types == {int}:
+        return INT
+    if types <= {int, float}:
+        return FLOAT
+    if types == {datetime}:
+        return TIMESTAMP
+    return STRING
+
+
+def to_timestamp(value) -> Optional[int]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = parse_datetime(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - EPOCH) // MILLISECOND
+
+
+_CONVERTERS = {
+    TIMESTAMP: to_timestamp,
+    INT: int,
+    FLOAT: float,
+    STRING: str,
+    BOOL: bool,
+}
+
+
+def to_columns(data, schema: Optional[Dict[str, str]] = None) -> List[Column]:
+    """
+    Typed columns for a list response (a single object becomes one row).
+
+    :param schema: ``{column name: type}`` for columns whose type must not
+        depend on the values that happen to be in the response
+    """
+    schema = schema or {}
+    if data is None:
+        rows = []
+    elif isinstance(data, dict):
+        rows = [_flatten(data)]
+    else:
+        rows = [_flatten(row) for row in data]
+
+    names = list(dict.fromkeys(name for row in rows for name in row))
+    # A null nested object (e.g. a national row's region) still gets the
+    # schema's child columns rather than a column of its own.
+    for name in list(names):
+        children = [column for column in schema if column.startswith(f"{name}.")]
+        if children:
+            position = names.index(name)
+            names[position : position + 1] = [
+                child for child in children if child not in names
+            ]
+    columns = []
+    for name in names:
+        values = [row.get(name) for row in rows]
+        column_type = schema.get(name) or _infer_type(values)
+        convert = _CONVERTERS[column_type]
+        columns.append(
+            Column(
+                name,
+                column_type,
+                [None if value is None else convert(value) for value in values],
+            )
+        )
+    return columns
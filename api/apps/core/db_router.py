@@ -0,0 +1,120 @@
+"""Routes read-only requests' time series reads to read replicas.
+
+``ReplicaRoutingMiddleware`` decides once per request whether replicas may be
+used: only for GET/HEAD requests, and not within ``REPLICA_STICKY_SECONDS`` of
+the last ingest write (recorded by ``bump_data_version``), so data that was
+just ingested is read back from the primary until replicas have caught up.
+Ingest writes happen in Celery, so the last write is recorded in the shared
+default cache (Redis outside development) as a key expiring after
+``REPLICA_STICKY_SECONDS``, which needs no clock agreement between hosts.
+Anything outside a request (Celery ingest, management commands) and any read
+after a write in the same request uses ``default``.
+
+Replicas are checked for replication lag at most every
+``REPLICA_LAG_CHECK_INTERVAL`` seconds per process; those further behind than
+``REPLICA_MAX_LAG`` seconds, or unreachable, are skipped until the next check.
+"""
+
+import contextvars
+import logging
+import random
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+LAST_WRITE_CACHE_KEY = "replica_last_write"
+
+REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(
+            EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+        )
+    END
+"""
+
+# Whether reads in the current request may go to a replica.
+_use_replicas = contextvars.ContextVar("use_replicas", default=False)
+
+# alias -> (monotonic time checked, lag in seconds or None if unreachable)
+_lag_checks: Dict[str, Tuple[float, Optional[float]]] = {}
+
+
+def record_write():
+    """Pin every process's reads to the primary for ``REPLICA_STICKY_SECONDS``."""
+    if settings.DATABASE_REPLICAS:
+        cache.set(LAST_WRITE_CACHE_KEY, True, settings.REPLICA_STICKY_SECONDS)
+
+
+def recently_written() -> bool:
+    return cache.get(LAST_WRITE_CACHE_KEY) is not None
+
+
+@contextmanager
+def replica_reads(enabled: bool = True):
+    token = _use_replicas.set(enabled)
+    try:
+        yield
+    finally:
+        _use_replicas.reset(token)
+
+
+def get_replica_lag(alias: str) -> Optional[float]:
+    checked, lag = _lag_checks.get(alias, (None, None))
+    if (
+        checked is None
+        or time.monotonic() - checked > settings.REPLICA_LAG_CHECK_INTERVAL
+    ):
+        try:
+            with connections[alias].cursor() as cursor:
+                cursor.execute(REPLICA_LAG_SQL)
+                lag = float(cursor.fetchone()[0])
+        except DatabaseError as e:
+            logger.warning(f"Replica {alias} is unavailable: {e}")
+            lag = None
+        _lag_checks[alias] = (time.monotonic(), lag)
+    return lag
+
+
+def healthy_replicas() -> List[str]:
+    healthy = []
+    for alias in settings.DATABASE_REPLICAS:
+        lag = get_replica_lag(alias)
+        if lag is not None and lag <= settings.REPLICA_MAX_LAG:
+            healthy.append(alias)
+    return healthy
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if (
+            not _use_replicas.get()
+            or model._meta.app_label not in settings.REPLICA_APPS
+        ):
+            return None
+        replicas = healthy_replicas()
+        if not replicas:
+            return None
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        # Read back anything this request writes from the primary.
+        _use_replicas.set(False)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
@@ -0,0 +1,89 @@
+import time
+import zlib
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+
+# Key of the Postgres advisory lock held while migrating. Every replica uses
+# the same key, so only one of them migrates at a time. The lock is
+# session-level so migrations keep their own transactions (and
+# ``atomic = False`` ones none), run it against Postgres directly rather than
+# through PgBouncer in transaction mode.
+MIGRATION_LOCK_KEY = zlib.crc32(b"energy-dashboard:migrate")
+
+
+class Command(BaseCommand):
+    help = (
+        "Apply pending migrations, serialised across replicas by a database "
+        "advisory lock. Exits straight away when the schema is current."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database to migrate (default: default)",
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report whether migrations are pending, exiting 1 if so",
+        )
+        parser.add_argument(
+            "--lock-timeout",
+            type=float,
+            default=300,
+            help="Seconds to wait for another replica's migration (default: 300)",
+        )
+
+    def pending_migrations(self, connection):
+        executor = MigrationExecutor(connection)
+        targets = executor.loader.graph.leaf_nodes()
+        return executor.migration_plan(targets)
+
+    def acquire_lock(self, connection, timeout: float):
+        if connection.vendor != "postgresql":
+            return
+        deadline = time.monotonic() + timeout
+        with connection.cursor() as cursor:
+            while True:
+                cursor.execute("SELECT pg_try_advisory_lock(%s)", [MIGRATION_LOCK_KEY])
+                if cursor.fetchone()[0]:
+                    return
+                if time.monotonic() >= deadline:
+                    raise CommandError(
+                        f"Timed out after {timeout}s waiting for the migration lock"
+                    )
+                self.stdout.write("Waiting for another replica to finish migrating")
+                time.sleep(1)
+
+    def release_lock(self, connection):
+        if connection.vendor != "postgresql":
+            return
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_unlock(%s)", [MIGRATION_LOCK_KEY])
+
+    def handle(self, *args, **options):
+        database = options["database"]
+        connection = connections[database]
+
+        plan = self.pending_migrations(connection)
+        if not plan:
+            self.stdout.write(self.style.SUCCESS("Schema is current"))
+            return
+        if options["check"]:
+            self.stdout.write(f"{len(plan)} migration(s) pending")
+            raise SystemExit(1)
+
+        self.acquire_lock(connection, options["lock_timeout"])
+        try:
+            # Another replica may have migrated while this one waited.
+            if self.pending_migrations(connection):
+                call_command("migrate", database=database, interactive=False)
+            else:
+                self.stdout.write("Migrated by another replica")
+        finally:
+            self.release_lock(connection)
+        self.stdout.write(self.style.SUCCESS("Schema is current"))
@@ -0,0 +1,59 @@
+from datetime import datetime
+from django.core.management.base import BaseCommand
+from apps.carbon_intensity.models import (
+    CarbonIntensity,
+    GenerationMix,
+    GenerationMixRollup,
+    IntensityRollup,
+)
+
+
+class Command(BaseCommand):
+    help = "Rebuild hourly/daily/weekly/monthly rollups from stored half-hourly data"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--start-date",
+            type=str,
+            default=None,
+            help="Start date in YYYY-MM-DD format (default: earliest stored row)",
+        )
+        parser.add_argument(
+            "--end-date",
+            type=str,
+            default=None,
+            help="End date in YYYY-MM-DD format (default: latest stored row)",
+        )
+
+    def _period(self, queryset, options):
+        start = (
+            datetime.strptime(options["start_date"], "%Y-%m-%d")
+            if options["start_date"]
+            else queryset.order_by("from_datetime").first().from_datetime
+        )
+        end = (
+            datetime.strptime(options["end_date"], "%Y-%m-%d")
+            if options["end_date"]
+            else queryset.order_by("-from_datetime").first().from_datetime
+        )
+        return start, end
+
+    def handle(self, *args, **options):
+        intensity = CarbonIntensity.objects.filter(postcode_prefix__isnull=True)
+        if intensity.exists():
+            start, end = self._period(intensity, options)
+            region_ids = (
+                intensity.order_by().values_list("region_id", flat=True).distinct()
+            )
+            for region_id in region_ids:
+                written = IntensityRollup.objects.refresh(start, end, region_id)
+                self.stdout.write(
+                    f"Wrote {written} intensity rollup(s) for {region_id or 'national'} data"
+                )
+
+        if GenerationMix.objects.exists():
+            start, end = self._period(GenerationMix.objects.all(), options)
+            written = GenerationMixRollup.objects.refresh(start, end)
+            self.stdout.write(f"Wrote {written} generation mix rollup(s)")
+
+        self.stdout.write(self.style.SUCCESS("Successfully rebuilt rollups"))
@@ -0,0 +1,70 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from apps.core import query_plans
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN the queries the API's managers and viewsets run and report "
+        "full scans and sorts no index serves"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--date",
+            type=str,
+            default=None,
+            help="Day to query in YYYY-MM-DD format (default: yesterday)",
+        )
+        parser.add_argument(
+            "--region-id", type=int, default=1, help="Region for regional queries"
+        )
+        parser.add_argument(
+            "--analyze",
+            action="store_true",
+            help="Run the queries for actual timings (PostgreSQL only)",
+        )
+        parser.add_argument(
+            "--plans", action="store_true", help="Print each query's full plan"
+        )
+        parser.add_argument(
+            "--fail-on-miss",
+            action="store_true",
+            help="Exit with an error if any query misses an index",
+        )
+
+    def handle(self, *args, **options):
+        if options["date"]:
+            day = datetime.strptime(options["date"], "%Y-%m-%d")
+        else:
+            day = datetime.now() - timedelta(days=1)
+        from_dt = day.replace(hour=0, minute=0, second=0, microsecond=0)
+        from_dt = from_dt.replace(tzinfo=timezone.utc)
+        to_dt = from_dt + timedelta(days=1)
+
+        missed = 0
+        shapes = query_plans.get_query_shapes(from_dt, to_dt, options["region_id"])
+        for name, queryset in shapes:
+            vendor = connections[queryset.db].vendor
+            plan = query_plans.explain(queryset, analyze=options["analyze"])
+            result = query_plans.analyse_plan(plan, vendor)
+            if result["misses"]:
+                missed += 1
+                self.stdout.write(self.style.WARNING(f"MISS {name}"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"OK   {name}"))
+            self.stdout.write(f"     indexes: {', '.join(result['indexes']) or '-'}")
+            for miss in result["misses"]:
+                self.stdout.write(f"     {miss}")
+            if options["plans"]:
+                text = plan if isinstance(plan, str) else json.dumps(plan, indent=2)
+                self.stdout.write(text)
+
+        summary = f"{missed} of {len(shapes)} queries miss an index"
+        if missed and options["fail_on_miss"]:
+            raise CommandError(summary)
+        self.stdout.write(summary)
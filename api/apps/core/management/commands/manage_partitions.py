@@ -0,0 +1,77 @@
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.carbon_intensity import partitions
+from apps.carbon_intensity.series_index import DATA_VERSION
+from apps.core.utils.data_versions import bump_data_version
+
+
+class Command(BaseCommand):
+    help = (
+        "List the monthly carbon intensity partitions, create upcoming ones "
+        "and detach old ones (PostgreSQL only)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=settings.INTENSITY_PARTITION_MONTHS_AHEAD,
+            help="Create partitions up to this many months from now",
+        )
+        parser.add_argument(
+            "--detach-before",
+            type=str,
+            default=None,
+            help="Detach partitions for months before YYYY-MM",
+        )
+        parser.add_argument(
+            "--drop",
+            action="store_true",
+            help="Drop detached partitions instead of keeping them as tables",
+        )
+
+    def handle(self, *args, **options):
+        if not partitions.is_partitioned(connection):
+            raise CommandError(
+                "The carbon intensity table is only partitioned on PostgreSQL"
+            )
+
+        today = datetime.now(timezone.utc).date()
+        end = partitions.add_months(
+            partitions.month_start(today), options["months_ahead"]
+        )
+        for name in partitions.ensure_partitions(connection, today, end):
+            self.stdout.write(f"Created {name}")
+
+        if options["detach_before"]:
+            try:
+                before = datetime.strptime(options["detach_before"], "%Y-%m").date()
+            except ValueError:
+                raise CommandError("--detach-before must be in YYYY-MM format")
+            detached = []
+            for partition in partitions.list_partitions(connection):
+                name = partition["name"]
+                if name == partitions.DEFAULT_PARTITION:
+                    continue
+                month = datetime.strptime(name[-7:], "%Y_%m").date()
+                if month < before:
+                    detached.append(
+                        partitions.detach_partition(connection, month, options["drop"])
+                    )
+            if detached:
+                # Indexes and rollups read from the table must see rows go.
+                bump_data_version(DATA_VERSION)
+            for name in detached:
+                verb = "Dropped" if options["drop"] else "Detached"
+                self.stdout.write(f"{verb} {name}")
+
+        for partition in partitions.list_partitions(connection):
+            self.stdout.write(
+                f"{partition['name']:<48} {partition['rows']:>10} rows "
+                f"{partition['bytes'] / 1024 / 1024:>8.1f} MiB  {partition['bounds']}"
+            )
+        self.stdout.write(self.style.SUCCESS("Partitions are up to date"))
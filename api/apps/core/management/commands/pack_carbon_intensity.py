@@ -0,0 +1,49 @@
+from datetime import datetime
+from django.core.management.base import BaseCommand
+from apps.carbon_intensity.models import CarbonIntensity, PackedCarbonIntensity
+
+
+class Command(BaseCommand):
+    help = "Pack stored half-hourly carbon intensity rows into month-per-row arrays"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--start-date",
+            type=str,
+            default=None,
+            help="Start month in YYYY-MM format (default: earliest stored row)",
+        )
+        parser.add_argument(
+            "--end-date",
+            type=str,
+            default=None,
+            help="End month in YYYY-MM format (default: latest stored row)",
+        )
+
+    def handle(self, *args, **options):
+        rows = CarbonIntensity.objects.filter(postcode_prefix__isnull=True)
+        if not rows.exists():
+            self.stdout.write("No carbon intensity data to pack")
+            return
+
+        start = (
+            datetime.strptime(options["start_date"], "%Y-%m")
+            if options["start_date"]
+            else rows.order_by("from_datetime").first().from_datetime
+        )
+        end = (
+            datetime.strptime(options["end_date"], "%Y-%m")
+            if options["end_date"]
+            else rows.order_by("-from_datetime").first().from_datetime
+        )
+
+        region_ids = rows.order_by().values_list("region_id", flat=True).distinct()
+        total = 0
+        for region_id in region_ids:
+            written = PackedCarbonIntensity.objects.pack_period(start, end, region_id)
+            self.stdout.write(
+                f"Packed {written} month(s) for {region_id or 'national'} data"
+            )
+            total += written
+
+        self.stdout.write(self.style.SUCCESS(f"Successfully packed {total} month(s)"))
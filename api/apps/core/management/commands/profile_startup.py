@@ -0,0 +1,118 @@
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from typing import List, Tuple
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Run in a fresh interpreter so nothing is already imported. Reports the wall
+# time of each stage on stdout, -X importtime writes per-module costs to stderr.
+STARTUP_SCRIPT = """
+import json, sys, time
+timings = {}
+start = time.perf_counter()
+import django
+django.setup()
+timings["django.setup()"] = time.perf_counter() - start
+for module in sys.argv[1:]:
+    start = time.perf_counter()
+    __import__(module)
+    timings[f"import {module}"] = time.perf_counter() - start
+print(json.dumps(timings))
+"""
+
+
+def parse_importtime(output: str) -> List[Tuple[str, int, int]]:
+    """``(module, self us, cumulative us)`` from ``-X importtime`` output."""
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, module = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            # The header line.
+            continue
+        rows.append((module.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+class Command(BaseCommand):
+    help = "Report what Django startup spends importing, per module and package"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=25,
+            help="Number of modules and packages to list (default: 25)",
+        )
+        parser.add_argument(
+            "--sort",
+            choices=["cumulative", "self"],
+            default="cumulative",
+            help="Order modules by cumulative or self import time",
+        )
+        parser.add_argument(
+            "--urls",
+            action="store_true",
+            help="Also load the URLconf, as the first request does",
+        )
+        parser.add_argument(
+            "--module",
+            action="append",
+            default=[],
+            help="Also import this module (repeatable)",
+        )
+
+    def handle(self, *args, **options):
+        modules = list(options["module"])
+        if options["urls"]:
+            modules.insert(0, settings.ROOT_URLCONF)
+
+        env = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": os.environ.get(
+                "DJANGO_SETTINGS_MODULE", "api.settings"
+            ),
+        }
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", STARTUP_SCRIPT, *modules],
+            capture_output=True,
+            text=True,
+            env=env,
+            cwd=settings.BASE_DIR,
+        )
+        if process.returncode:
+            raise CommandError(
+                f"Startup failed:\n{process.stderr.strip().splitlines()[-1]}"
+            )
+        timings = json.loads(process.stdout.strip().splitlines()[-1])
+        rows = parse_importtime(process.stderr)
+
+        self.stdout.write("Stages (wall time):")
+        for stage, seconds in timings.items():
+            self.stdout.write(f"  {seconds * 1000:9.1f} ms  {stage}")
+        total = sum(self_us for _, self_us, _ in rows)
+        self.stdout.write(f"\n{len(rows)} modules imported in {total / 1000:.1f} ms")
+
+        column = 2 if options["sort"] == "cumulative" else 1
+        self.stdout.write(f"\nSlowest modules by {options['sort']} time:")
+        self.stdout.write(f"  {'cumulative':>12} {'self':>10}  module")
+        for module, self_us, cumulative_us in sorted(
+            rows, key=lambda row: row[column], reverse=True
+        )[: options["limit"]]:
+            self.stdout.write(
+                f"  {cumulative_us / 1000:9.1f} ms {self_us / 1000:7.1f} ms  {module}"
+            )
+
+        packages = defaultdict(int)
+        for module, self_us, _ in rows:
+            packages[module.split(".")[0]] += self_us
+        self.stdout.write("\nSlowest top-level packages (self time of all modules):")
+        for package, self_us in sorted(
+            packages.items(), key=lambda item: item[1], reverse=True
+        )[: options["limit"]]:
+            self.stdout.write(f"  {self_us / 1000:9.1f} ms  {package}")
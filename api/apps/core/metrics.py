@@ -0,0 +1,51 @@
+"""Database connection metrics for this process, served on ``/metrics/db/``.
+
+The path is outside ``/api/`` so the ingress doesn't expose it, it is meant
+for in-cluster scraping and debugging.
+"""
+
+from django.conf import settings
+from django.db import connections
+from django.http import JsonResponse
+
+SERVER_CONNECTIONS_SQL = """
+    SELECT state, count(*) FROM pg_stat_activity
+    WHERE datname = current_database()
+    GROUP BY state
+"""
+
+
+def get_pool_stats(connection) -> dict:
+    stats = {
+        "vendor": connection.vendor,
+        "conn_max_age": connection.settings_dict["CONN_MAX_AGE"],
+        "health_checks": connection.settings_dict["CONN_HEALTH_CHECKS"],
+        "server_side_cursors": not connection.settings_dict.get(
+            "DISABLE_SERVER_SIDE_CURSORS", False
+        ),
+        # Whether this thread currently holds a connection.
+        "connected": connection.connection is not None,
+        "pool": None,
+    }
+    pool = getattr(connection, "pool", None)
+    if pool is not None:
+        stats["pool"] = pool.get_stats()
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(SERVER_CONNECTIONS_SQL)
+            stats["server_connections"] = {
+                state or "unknown": count for state, count in cursor.fetchall()
+            }
+    return stats
+
+
+def db_metrics(request):
+    return JsonResponse(
+        {
+            "pgbouncer": settings.DATABASE_PGBOUNCER,
+            "databases": {
+                connection.alias: get_pool_stats(connection)
+                for connection in connections.all()
+            },
+        }
+    )
@@ -0,0 +1,119 @@
+import base64
+import binascii
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset pagination over ``(from_datetime, id)`` for time series.
+
+    Each page seeks past the last row of the previous one through the index,
+    so the cost of a page does not depend on how far into the table it is.
+    Pages stay bare lists to keep existing clients working; the next page is
+    advertised in a ``Link: <url>; rel="next"`` header with an opaque
+    ``cursor``. Every response is capped at ``TIME_SERIES_MAX_PAGE_SIZE`` rows.
+
+    Rows that are not read from a table (e.g. unpacked from packed storage)
+    are paged with ``paginate_rows``; their cursors carry no id and seek past
+    every row of the last ``from_datetime``, so either kind of cursor can be
+    followed on either path.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    invalid_cursor_message = "Invalid cursor"
+
+    def get_page_size(self, request) -> int:
+        try:
+            page_size = int(
+                request.query_params.get(
+                    self.page_size_query_param, settings.TIME_SERIES_PAGE_SIZE
+                )
+            )
+        except ValueError:
+            page_size = settings.TIME_SERIES_PAGE_SIZE
+        return max(min(page_size, settings.TIME_SERIES_MAX_PAGE_SIZE), 1)
+
+    def encode_cursor(self, position) -> str:
+        from_datetime, pk = position
+        raw = f"{from_datetime.isoformat()}|{'' if pk is None else pk}".encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+            from_datetime, pk = raw.decode().split("|")
+            from_datetime = parse_datetime(from_datetime)
+            pk = int(pk) if pk else None
+        except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if from_datetime is None:
+            raise NotFound(self.invalid_cursor_message)
+        return from_datetime, pk
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        The page's rows as a list, read in a single query.
+
+        Rows may be model instances or ``values_list(..., named=True)`` rows,
+        either way they need ``from_datetime`` and ``id``.
+        """
+        self.request = request
+        page_size = self.get_page_size(request)
+
+        queryset = queryset.order_by("from_datetime", "id")
+        position = self.decode_cursor(request)
+        if position is not None:
+            from_datetime, pk = position
+            after = Q(from_datetime__gt=from_datetime)
+            if pk is not None:
+                after |= Q(from_datetime=from_datetime, id__gt=pk)
+            queryset = queryset.filter(after)
+
+        # One row past the page only tells whether there is a next page.
+        rows = list(queryset[: page_size + 1])
+        self.next_position = None
+        if len(rows) > page_size:
+            last = rows[page_size - 1]
+            self.next_position = (last.from_datetime, last.id)
+        return rows[:page_size]
+
+    def paginate_rows(self, rows, request, get_from_datetime):
+        """
+        The page of rows already read past the cursor, in ``from_datetime`` order.
+
+        ``rows`` should hold up to one row more than a page, that row only
+        tells whether there is a next page.
+        """
+        self.request = request
+        page_size = self.get_page_size(request)
+        self.next_position = None
+        if len(rows) > page_size:
+            self.next_position = (get_from_datetime(rows[page_size - 1]), None)
+        return rows[:page_size]
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.encode_cursor(self.next_position),
+        )
+
+    def get_paginated_response(self, data):
+        headers = {}
+        next_link = self.get_next_link()
+        if next_link:
+            headers["Link"] = f'<{next_link}>; rel="next"'
+        return Response(data, headers=headers)
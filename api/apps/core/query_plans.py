@@ -0,0 +1,78 @@
+"""EXPLAIN the queries the API runs and report where they miss an index.
+
+Apps list the queries their managers and viewsets run as "query shapes":
+``settings.QUERY_SHAPES`` holds dotted paths to callables taking
+``(from_dt, to_dt, region_id)`` and returning ``(name, queryset)`` pairs.
+``explain_queries`` explains each one and reports full table scans and
+sorts the indexes don't serve.
+
+On Postgres sequential scans are disabled while explaining, otherwise the
+planner scans small development tables whatever indexes exist. A sequential
+scan left in the plan then means no index can serve the query.
+"""
+
+import json
+import re
+from typing import List, Tuple
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import QuerySet
+from django.utils.module_loading import import_string
+
+SQLITE_INDEX = re.compile(r"USING (?:COVERING )?INDEX (\S+)")
+SQLITE_FULL_SCAN = re.compile(r"\bSCAN (\S+)$")
+
+
+def get_query_shapes(from_dt, to_dt, region_id) -> List[Tuple[str, QuerySet]]:
+    shapes = []
+    for path in settings.QUERY_SHAPES:
+        shapes.extend(import_string(path)(from_dt, to_dt, region_id))
+    return shapes
+
+
+def explain(queryset: QuerySet, analyze: bool = False):
+    """The plan: parsed JSON on Postgres, ``EXPLAIN QUERY PLAN`` text on SQLite."""
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return queryset.explain()
+    with transaction.atomic(using=queryset.db):
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        options = {"format": "json"}
+        if analyze:
+            options.update(analyze=True, buffers=True)
+        plan = queryset.explain(**options)
+    return json.loads(plan) if isinstance(plan, str) else plan
+
+
+def _plan_nodes(node: dict):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+def analyse_plan(plan, vendor: str) -> dict:
+    """The indexes a plan uses and the scans and sorts no index serves."""
+    indexes, misses = [], []
+    if vendor == "postgresql":
+        for node in _plan_nodes(plan[0]["Plan"]):
+            kind = node["Node Type"]
+            if "Index Name" in node:
+                indexes.append(node["Index Name"])
+            if kind == "Seq Scan":
+                misses.append(f"Seq Scan on {node['Relation Name']}")
+            elif kind in ("Sort", "Incremental Sort"):
+                misses.append(f"{kind} on {', '.join(node.get('Sort Key', []))}")
+            elif kind == "Index Scan" and "Filter" in node:
+                misses.append(f"Filter after {node['Index Name']}: {node['Filter']}")
+    else:
+        for line in plan.splitlines():
+            match = SQLITE_INDEX.search(line)
+            if match:
+                indexes.append(match.group(1))
+            elif SQLITE_FULL_SCAN.search(line):
+                misses.append(f"Full scan of {SQLITE_FULL_SCAN.search(line).group(1)}")
+            if "USE TEMP B-TREE" in line:
+                misses.append(line[line.index("USE TEMP B-TREE") :])
+    return {"indexes": list(dict.fromkeys(indexes)), "misses": misses}
@@ -0,0 +1,196 @@
+import msgpack
+import orjson
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils import encoders
+
+from .columnar import BOOL, FLOAT, INT, STRING, TIMESTAMP, to_columns
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson.
+
+    Output is byte-identical to JSONRenderer for compact responses: datetimes,
+    decimals and other non-native types are handed back to DRF's encoder.
+    Indented output (e.g. for the browsable API) still goes through ``json``.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            data is None
+            or not self.compact
+            or self.ensure_ascii
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(
+            data,
+            default=encoders.JSONEncoder().default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME
+            | orjson.OPT_PASSTHROUGH_DATACLASS
+            # json writes int, float, bool and None keys as strings too.
+            | orjson.OPT_NON_STR_KEYS,
+        )
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
+
+
+class ColumnarRenderer(BaseRenderer):
+    """
+    Base for binary renderers that send list responses column by column.
+
+    Views can set ``columnar_schema = {column: type}`` to pin column types,
+    see ``apps.core.columnar``.
+    """
+
+    charset = None
+
+    def get_columns(self, data, renderer_context):
+        view = (renderer_context or {}).get("view")
+        return to_columns(data, getattr(view, "columnar_schema", None))
+
+
+class MessagePackRenderer(ColumnarRenderer):
+    """``{"length": n, "columns": [{"name", "type", "values"}]}`` as MessagePack"""
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        columns = self.get_columns(data, renderer_context)
+        return msgpack.packb(
+            {
+                "length": len(columns[0].values) if columns else 0,
+                "columns": [
+                    {"name": column.name, "type": column.type, "values": column.values}
+                    for column in columns
+                ],
+            },
+            use_bin_type=True,
+        )
+
+
+def _build_protobuf_table():
+    """Message class for apps/core/protos/columnar.proto, built at runtime."""
+    # Imported here, protobuf and pyarrow are slow to import and most
+    # processes never render either.
+    from google.protobuf import descriptor_pb2, descriptor_pool, message_factory
+
+    field = descriptor_pb2.FieldDescriptorProto
+    file_proto = descriptor_pb2.FileDescriptorProto(
+        name="energy_dashboard/columnar.proto",
+        package="energy_dashboard",
+        syntax="proto3",
+    )
+    column = file_proto.message_type.add(name="Column")
+    for number, (name, field_type, label) in enumerate(
+        [
+            ("name", field.TYPE_STRING, field.LABEL_OPTIONAL),
+            ("type", field.TYPE_STRING, field.LABEL_OPTIONAL),
+            ("int_values", field.TYPE_SINT64, field.LABEL_REPEATED),
+            ("float_values", field.TYPE_DOUBLE, field.LABEL_REPEATED),
+            ("string_values", field.TYPE_STRING, field.LABEL_REPEATED),
+            ("bool_values", field.TYPE_BOOL, field.LABEL_REPEATED),
+            ("null_positions", field.TYPE_UINT32, field.LABEL_REPEATED),
+        ],
+        start=1,
+    ):
+        column.field.add(name=name, number=number, type=field_type, label=label)
+    table = file_proto.message_type.add(name="Table")
+    table.field.add(
+        name="length", number=1, type=field.TYPE_UINT32, label=field.LABEL_OPTIONAL
+    )
+    table.field.add(
+        name="columns",
+        number=2,
+        type=field.TYPE_MESSAGE,
+        label=field.LABEL_REPEATED,
+        type_name=".energy_dashboard.Column",
+    )
+
+    pool = descriptor_pool.DescriptorPool()
+    pool.Add(file_proto)
+    return message_factory.GetMessageClass(
+        pool.FindMessageTypeByName("energy_dashboard.Table")
+    )
+
+
+class ProtobufRenderer(ColumnarRenderer):
+    """``energy_dashboard.Table`` from apps/core/protos/columnar.proto"""
+
+    media_type = "application/x-protobuf"
+    format = "protobuf"
+
+    VALUE_FIELDS = {
+        TIMESTAMP: ("int_values", 0),
+        INT: ("int_values", 0),
+        FLOAT: ("float_values", 0.0),
+        STRING: ("string_values", ""),
+        BOOL: ("bool_values", False),
+    }
+    _table_class = None
+
+    @classmethod
+    def get_table_class(cls):
+        if cls._table_class is None:
+            cls._table_class = _build_protobuf_table()
+        return cls._table_class
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        columns = self.get_columns(data, renderer_context)
+        table = self.get_table_class()(length=len(columns[0].values) if columns else 0)
+        for column in columns:
+            message = table.columns.add(name=column.name, type=column.type)
+            field_name, zero = self.VALUE_FIELDS[column.type]
+            getattr(message, field_name).extend(
+                zero if value is None else value for value in column.values
+            )
+            message.null_positions.extend(
+                position
+                for position, value in enumerate(column.values)
+                if value is None
+            )
+        return table.SerializeToString()
+
+
+class ArrowRenderer(ColumnarRenderer):
+    """Arrow IPC stream holding the response as one record batch"""
+
+    media_type = "application/vnd.apache.arrow.stream"
+    format = "arrow"
+
+    @staticmethod
+    def arrow_type(column_type):
+        import pyarrow
+
+        return {
+            TIMESTAMP: pyarrow.timestamp("ms", tz="UTC"),
+            INT: pyarrow.int64(),
+            FLOAT: pyarrow.float64(),
+            STRING: pyarrow.string(),
+            BOOL: pyarrow.bool_(),
+        }[column_type]
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        import pyarrow
+        import pyarrow.ipc
+
+        columns = self.get_columns(data, renderer_context)
+        table = pyarrow.table(
+            {
+                column.name: pyarrow.array(
+                    column.values, type=self.arrow_type(column.type)
+                )
+                for column in columns
+            }
+        )
+        sink = pyarrow.BufferOutputStream()
+        with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+
+# Binary renderers for the time series viewsets.
+TIME_SERIES_RENDERERS = [ProtobufRenderer, MessagePackRenderer, ArrowRenderer]
@@ -15,3 +15,256 @@
 #         self.assertIsInstance(data['data'][0]['regions'][0], dict)
 
 #         pprint(data)
+
+
+import shutil  # noqa: E402
+import tempfile  # noqa: E402
+from io import StringIO  # noqa: E402
+from unittest.mock import MagicMock, call, patch  # noqa: E402
+
+from django.core.cache.backends.filebased import FileBasedCache  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.test import SimpleTestCase, TestCase, override_settings  # noqa: E402
+
+from api.prefork import RecyclingApplication  # noqa: E402
+from apps.carbon_intensity.models import CarbonIntensity  # noqa: E402
+from apps.core import db_router, query_plans, warmup  # noqa: E402
+from apps.core.utils import data_versions  # noqa: E402
+from apps.petition.models import Petition  # noqa: E402
+from apps.core.management.commands.bootstrap_db import (  # noqa: E402
+    MIGRATION_LOCK_KEY,
+    Command as BootstrapDbCommand,
+)
+from apps.core.management.commands.profile_startup import (  # noqa: E402
+    parse_importtime,
+)
+
+
+class RecyclingApplicationTests(SimpleTestCase):
+    def setUp(self):
+        self.recycled = 0
+
+    def app(self, environ, start_response):
+        start_response("200 OK", [])
+        return [b"ok"]
+
+    def request(self, app):
+        result = app({}, lambda status, headers: None)
+        self.assertEqual(list(result), [b"ok"])
+        if hasattr(result, "close"):
+            result.close()
+
+    def test_recycles_after_max_requests(self):
+        app = RecyclingApplication(self.app, max_requests=2, on_recycle=self.on_recycle)
+        self.request(app)
+        self.assertEqual(self.recycled, 0)
+        self.request(app)
+        self.assertEqual(self.recycled, 1)
+
+    def test_recycles_on_rss_growth_since_first_request(self):
+        app = RecyclingApplication(
+            self.app, max_rss_growth_mb=64, on_recycle=self.on_recycle
+        )
+        with patch("api.prefork.get_rss_mb", return_value=300):
+            self.request(app)
+            self.request(app)
+        self.assertEqual(self.recycled, 0)
+        with patch("api.prefork.get_rss_mb", return_value=365):
+            self.request(app)
+        self.assertEqual(self.recycled, 1)
+
+    def test_disabled_by_default(self):
+        app = RecyclingApplication(self.app, on_recycle=self.on_recycle)
+        self.assertFalse(app.enabled)
+        for _ in range(3):
+            self.request(app)
+        self.assertEqual(self.recycled, 0)
+
+    def on_recycle(self):
+        self.recycled += 1
+
+
+class BootstrapDbTests(TestCase):
+    def test_current_schema_is_left_alone(self):
+        out = StringIO()
+        call_command("bootstrap_db", "--check", stdout=out)
+        self.assertIn("Schema is current", out.getvalue())
+
+    def test_lock_is_session_level(self):
+        # Held across migrate's own transactions, then released explicitly.
+        connection = MagicMock(vendor="postgresql")
+        cursor = connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = (True,)
+        command = BootstrapDbCommand()
+        command.acquire_lock(connection, timeout=1)
+        command.release_lock(connection)
+        self.assertEqual(
+            cursor.execute.call_args_list,
+            [
+                call("SELECT pg_try_advisory_lock(%s)", [MIGRATION_LOCK_KEY]),
+                call("SELECT pg_advisory_unlock(%s)", [MIGRATION_LOCK_KEY]),
+            ],
+        )
+
+
+class ParseImporttimeTests(SimpleTestCase):
+    def test_parses_rows_and_skips_header(self):
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   django.utils\n"
+            "import time:       467 |        587 | django.conf\n"
+        )
+        self.assertEqual(
+            parse_importtime(output),
+            [("django.utils", 120, 120), ("django.conf", 467, 587)],
+        )
+
+
+# Without the upstream connection step, tests don't touch the network.
+@override_settings(
+    WARMUP_STEPS=[
+        "apps.core.warmup.warm_database",
+        "apps.core.warmup.warm_urls",
+        "apps.core.warmup.warm_datasets",
+        "apps.carbon_intensity.warmup.warm_regions",
+        "apps.carbon_intensity.warmup.warm_latest",
+    ]
+)
+class WarmupTests(TestCase):
+    def setUp(self):
+        warmup.reset()
+        self.addCleanup(warmup.reset)
+
+    def test_ready_only_after_warm_up(self):
+        with patch("apps.core.warmup.start_warm_up") as start_warm_up:
+            self.assertEqual(self.client.get("/ready").status_code, 503)
+        start_warm_up.assert_called_once()
+        self.assertEqual(self.client.get("/health").status_code, 200)
+
+        self.assertTrue(warmup.warm_up())
+        self.assertEqual(self.client.get("/ready").status_code, 200)
+
+    def test_failed_step_is_reported(self):
+        with self.settings(WARMUP_STEPS=["apps.core.warmup.missing_step"]):
+            self.assertFalse(warmup.warm_up())
+        state = warmup.get_state()
+        self.assertEqual(state["status"], warmup.FAILED)
+        self.assertIn("error", state["steps"]["apps.core.warmup.missing_step"])
+
+
+class DbMetricsTests(TestCase):
+    def test_reports_each_database(self):
+        response = self.client.get("/metrics/db/")
+        self.assertEqual(response.status_code, 200)
+        stats = response.json()["databases"]["default"]
+        self.assertEqual(stats["vendor"], "sqlite")
+        self.assertIsNone(stats["pool"])
+
+
+@override_settings(DATABASE_REPLICAS=["replica_0"], REPLICA_MAX_LAG=30)
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = db_router.ReplicaRouter()
+        lag = patch("apps.core.db_router.get_replica_lag", return_value=0).start()
+        self.lag = lag
+        self.addCleanup(patch.stopall)
+
+    def test_reads_replica_only_within_replica_requests(self):
+        self.assertIsNone(self.router.db_for_read(CarbonIntensity))
+        with db_router.replica_reads():
+            self.assertEqual(self.router.db_for_read(CarbonIntensity), "replica_0")
+            # Other apps stay on the primary.
+            self.assertIsNone(self.router.db_for_read(Petition))
+
+    def test_reads_after_a_write_use_primary(self):
+        with db_router.replica_reads():
+            self.router.db_for_write(CarbonIntensity)
+            self.assertIsNone(self.router.db_for_read(CarbonIntensity))
+
+    def test_lagging_replica_is_skipped(self):
+        self.lag.return_value = 120
+        with db_router.replica_reads():
+            self.assertIsNone(self.router.db_for_read(CarbonIntensity))
+
+    def test_sticky_after_ingest_write(self):
+        self.assertFalse(db_router.recently_written())
+        db_router.record_write()
+        self.addCleanup(db_router.cache.delete, db_router.LAST_WRITE_CACHE_KEY)
+        self.assertTrue(db_router.recently_written())
+
+
+class QueryPlanTests(TestCase):
+    def test_postgres_seq_scan_and_sort_are_misses(self):
+        plan = [
+            {
+                "Plan": {
+                    "Node Type": "Sort",
+                    "Sort Key": ["from_datetime"],
+                    "Plans": [
+                        {
+                            "Node Type": "Seq Scan",
+                            "Relation Name": "carbon_intensity_carbonintensity",
+                        }
+                    ],
+                }
+            }
+        ]
+        result = query_plans.analyse_plan(plan, "postgresql")
+        self.assertEqual(
+            result["misses"],
+            [
+                "Sort on from_datetime",
+                "Seq Scan on carbon_intensity_carbonintensity",
+            ],
+        )
+
+    def test_postgres_index_only_scan(self):
+        plan = [
+            {
+                "Plan": {
+                    "Node Type": "Index Only Scan",
+                    "Index Name": "carbon_inte_national_idx",
+                }
+            }
+        ]
+        result = query_plans.analyse_plan(plan, "postgresql")
+        self.assertEqual(result["indexes"], ["carbon_inte_national_idx"])
+        self.assertEqual(result["misses"], [])
+
+    def test_period_pages_use_the_period_index(self):
+        out = StringIO()
+        call_command("explain_queries", "--date", "2025-01-01", stdout=out)
+        self.assertIn(
+            "OK   CarbonIntensityViewSet.list (national page)", out.getvalue()
+        )
+        self.assertIn(
+            "OK   CarbonIntensityViewSet.list (regional page)", out.getvalue()
+        )
+
+
+class SharedCacheTests(SimpleTestCase):
+    def setUp(self):
+        # Two cache instances sharing nothing in memory, like two processes
+        # using the same Redis.
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        backend = "django.core.cache.backends.filebased.FileBasedCache"
+        self.web = FileBasedCache(location, {"BACKEND": backend})
+        self.worker = FileBasedCache(location, {"BACKEND": backend})
+
+    def test_bump_in_another_process_is_seen(self):
+        with patch.object(data_versions, "cache", self.web):
+            before = data_versions.get_data_version("carbon_intensity")
+        with patch.object(data_versions, "cache", self.worker):
+            data_versions.bump_data_version("carbon_intensity")
+        with patch.object(data_versions, "cache", self.web):
+            self.assertEqual(
+                data_versions.get_data_version("carbon_intensity"), before + 1
+            )
+
+    @override_settings(DATABASE_REPLICAS=["replica_0"])
+    def test_write_in_another_process_pins_reads(self):
+        with patch.object(db_router, "cache", self.worker):
+            db_router.record_write()
+        with patch.object(db_router, "cache", self.web):
+            self.assertTrue(db_router.recently_written())
@@ -2,7 +2,7 @@ from datetime import datetime
 from django.conf import settings
 import logging
 import requests
-from typing import Dict
+from typing import Dict, Optional
 from tenacity import (
     retry,
     stop_after_attempt,
@@ -11,6 +11,7 @@ from tenacity import (
 )
 
 from apps.core.utils.base_client import (
+    AsyncServiceMixin,
     BaseService,
     ExternalAPIError,
     RateLimitError,
@@ -188,6 +189,10 @@ class CarbonIntensityService(BaseService):
         )
 
 
+class AsyncCarbonIntensityService(AsyncServiceMixin, CarbonIntensityService):
+    """CarbonIntensityService whose endpoint methods return coroutines."""
+
+
 class BMRSService(BaseService):
     class BMRSAPIError(ExternalAPIError):
         """BMRS-specific errors"""
@@ -195,10 +200,13 @@ class BMRSService(BaseService):
     class BMRSRateLimitError(RateLimitError):
         """BMRS-specific rate limiting error"""
 
-    def __init__(self, api_key: str = settings.BMRS_API_KEY):
+    def __init__(self, api_key: Optional[str] = None):
         super().__init__(
             base_url="https://data.elexon.co.uk/bmrs/api/v1", logger_name="BMRS Service"
         )
+        # Read here rather than as the default so importing this module
+        # doesn't require configured settings.
+        api_key = api_key or settings.BMRS_API_KEY
         if not api_key:
             raise ValueError("BMRS API key is required")
         self.api_key = api_key
@@ -1629,3 +1637,7 @@ class OctopusService(BaseService):
             f"products/AGILE-FLEX-22-11-25/electricity-tariffs/E-1R-AGILE-FLEX-22-11-25-{gsp}/standard-unit-rates/?period_from={datetime.today().replace(hour=0, minute=0, second=0, microsecond=0).isoformat()}Z&period_to={datetime.now().replace(second=0, microsecond=0).isoformat()}Z",
             params=params,
         )
+
+
+class AsyncOctopusService(AsyncServiceMixin, OctopusService):
+    """OctopusService whose pass-through endpoint methods return coroutines."""
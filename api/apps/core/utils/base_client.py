@@ -1,4 +1,8 @@
+import asyncio
 import logging
+import os
+import weakref
+import httpx
 import requests
 from typing import Type, Optional, Dict, Any, TypeVar
 from tenacity import (
@@ -42,6 +46,23 @@ class InvalidResponseError(ExternalAPIError):
     """Base class for response validation errors"""
 
 
+_sessions: Dict[int, requests.Session] = {}
+
+
+def get_shared_session() -> requests.Session:
+    """
+    Process-wide session, so every service instance reuses pooled upstream
+    connections. Keyed by pid: a forked worker must not use its parent's
+    sockets.
+    """
+    pid = os.getpid()
+    session = _sessions.get(pid)
+    if session is None:
+        _sessions.clear()
+        session = _sessions[pid] = requests.Session()
+    return session
+
+
 class BaseService:
     """
     Base service class for API clients with common error handling and retry logic
@@ -71,7 +92,7 @@ class BaseService:
         self.retry_attempts = retry_attempts
         self.timeout = timeout
         self.logger = logging.getLogger(logger_name)
-        self.session = requests.Session()
+        self.session = get_shared_session()
 
     @staticmethod
     def _get_retry_policy(
@@ -195,3 +216,81 @@ class BaseService:
         data: Optional[Dict] = None,
     ) -> T:
         return self._make_request("POST", endpoint, response_model, data=data)
+
+
+class AsyncServiceMixin:
+    """
+    Issues a service's requests through a shared ``httpx.AsyncClient``
+
+    Mixed in ahead of a BaseService subclass, every endpoint method that
+    returns ``self._get(...)`` returns a coroutine instead, so the same
+    endpoint definitions serve async views::
+
+        class AsyncCarbonIntensityService(AsyncServiceMixin, CarbonIntensityService):
+            pass
+
+        data = await AsyncCarbonIntensityService().get_current_intensity()
+
+    One client (and connection pool) is kept per event loop.
+    """
+
+    MAX_CONNECTIONS = 200
+    MAX_KEEPALIVE_CONNECTIONS = 50
+
+    _clients = weakref.WeakKeyDictionary()
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = AsyncServiceMixin._clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.MAX_CONNECTIONS,
+                    max_keepalive_connections=self.MAX_KEEPALIVE_CONNECTIONS,
+                )
+            )
+            AsyncServiceMixin._clients[loop] = client
+        return client
+
+    @retry(
+        stop=stop_after_attempt(BaseService.DEFAULT_RETRY_ATTEMPTS),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        retry=retry_if_exception_type((NetworkError, ServiceUnavailableError)),
+        reraise=True,
+    )
+    async def _make_request(
+        self,
+        method: str,
+        endpoint: str,
+        response_model: Type[T],
+        params: Optional[Dict] = None,
+        data: Optional[Dict] = None,
+    ) -> T:
+        """Async counterpart of ``BaseService._make_request``"""
+        url = f"{self.base_url}{endpoint}"
+        params = {k: v for k, v in params.items() if v is not None} if params else {}
+
+        try:
+            self.logger.info(f"Making async {method} request to {url}")
+            response = await self._get_async_client().request(
+                method,
+                url,
+                params=params,
+                json=data,
+                headers=self._get_headers(),
+                timeout=self.timeout,
+            )
+        except httpx.TransportError as e:
+            self.logger.error(f"Network error: {str(e)}")
+            raise NetworkError(f"Network connection failed {str(e)}") from e
+
+        if response.is_error:
+            self._handle_error_response(response)
+
+        try:
+            response_data = response.json()
+        except ValueError as e:
+            raise InvalidResponseError(f"Response is not valid JSON {str(e)}") from e
+        if response_model is None:
+            return response_data
+        return self._validate_response(response_data, response_model)
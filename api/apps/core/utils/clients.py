@@ -0,0 +1,31 @@
+"""Upstream service classes, imported on first use.
+
+``api_clients`` pulls in requests, tenacity, pydantic and httpx, which most
+requests and management commands never need. Modules loaded at startup
+(models, viewsets, URLconfs) reach the services through this module instead::
+
+    from apps.core.utils import clients
+
+    service = clients.CarbonIntensityService()
+
+Lookups are not cached, so patching ``apps.core.utils.api_clients`` in tests
+still takes effect.
+"""
+
+from importlib import import_module
+
+SERVICES_MODULE = "apps.core.utils.api_clients"
+
+SERVICES = {
+    "AsyncCarbonIntensityService",
+    "AsyncOctopusService",
+    "BMRSService",
+    "CarbonIntensityService",
+    "OctopusService",
+}
+
+
+def __getattr__(name):
+    if name not in SERVICES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(SERVICES_MODULE), name)
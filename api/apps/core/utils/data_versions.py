@@ -0,0 +1,33 @@
+"""Version counters for stored datasets, shared between processes via the cache.
+
+Writers bump a dataset's version whenever its rows change. Readers holding
+derived in-process state compare versions to know when to refresh it. Celery
+writes and web workers read, so the counters live in the default cache, which
+is Redis outside development (see ``CACHES``). Nothing is memoised in-process.
+"""
+
+import time
+
+from django.core.cache import cache
+
+
+def _cache_key(name: str) -> str:
+    return f"data_version_{name}"
+
+
+def get_data_version(name: str) -> int:
+    # A missing (or evicted) counter restarts from a value no reader can hold.
+    return cache.get_or_set(_cache_key(name), time.time_ns, None)
+
+
+def bump_data_version(name: str) -> int:
+    # Imported here, the router imports the database machinery.
+    from apps.core.db_router import record_write
+
+    record_write()
+    try:
+        return cache.incr(_cache_key(name))
+    except ValueError:
+        version = time.time_ns()
+        cache.set(_cache_key(name), version, None)
+        return version
@@ -0,0 +1,36 @@
+"""Static JSON datasets shipped in ``api/data``.
+
+Each file is parsed once per process and shared by every request. The
+launcher calls ``preload_datasets()`` before forking workers so the parsed
+objects live in pages the workers share copy-on-write. Callers must treat the
+returned data as read-only.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+DATA_DIR = Path(__file__).resolve().parent.parent.parent.parent / "data"
+
+QUARTERLY_PRICES = "octopus_prices/energy_prices_gsp_quarters.json"
+MONTHLY_GENERATION_AVERAGES = "generationmix/monthly_generation_averages.json"
+
+STATIC_DATASETS = [QUARTERLY_PRICES, MONTHLY_GENERATION_AVERAGES]
+
+_datasets: Dict[str, Any] = {}
+
+
+def load_dataset(name: str) -> Optional[Any]:
+    """The parsed contents of ``data/<name>``, or ``None`` if it doesn't exist."""
+    if name not in _datasets:
+        path = DATA_DIR / name
+        if not path.exists():
+            return None
+        with open(path, "r") as f:
+            _datasets[name] = json.load(f)
+    return _datasets[name]
+
+
+def preload_datasets():
+    for name in STATIC_DATASETS:
+        load_dataset(name)
@@ -0,0 +1,121 @@
+"""Warm-up run before a process reports ready.
+
+``settings.WARMUP_STEPS`` lists dotted paths to callables that load whatever
+the first requests would otherwise pay for: the database connection, the
+URLconf, process-wide registries and indexes, cached latest data and pooled
+upstream connections. ``warm_up()`` runs them in order and records how each
+went. ``/ready`` reports 200 once every step has succeeded (``/health`` only
+says the process is alive).
+
+run.py warms every worker before it serves. Other entry points (runserver,
+ASGI) start the warm-up in a background thread on the first ``/ready``.
+"""
+
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.urls import get_resolver
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+RUNNING = "running"
+READY = "ready"
+FAILED = "failed"
+
+_state = {"status": PENDING, "steps": {}}
+_lock = threading.Lock()
+
+
+def warm_database():
+    from apps.core.db_router import healthy_replicas
+
+    with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+        cursor.execute("SELECT 1")
+    # Connects to and lag-checks the replicas, which are optional: the
+    # router falls back to the primary.
+    healthy_replicas()
+
+
+def warm_urls():
+    # Imports every view module.
+    get_resolver().url_patterns
+
+
+def warm_datasets():
+    from apps.core.utils.datasets import preload_datasets
+
+    preload_datasets()
+
+
+def warm_http():
+    """Open pooled connections to the upstream APIs the proxy endpoints call."""
+    import requests
+
+    from apps.core.utils import clients
+    from apps.core.utils.base_client import get_shared_session
+
+    session = get_shared_session()
+    for service in (clients.CarbonIntensityService(), clients.OctopusService()):
+        try:
+            session.head(service.base_url, timeout=service.timeout)
+        except requests.RequestException as e:
+            # Upstream being slow or down mustn't keep the pod out of service.
+            logger.warning(f"Could not reach {service.base_url}: {e}")
+
+
+def warm_up() -> bool:
+    """Run every warm-up step, returning whether the process is ready."""
+    with _lock:
+        if _state["status"] in (RUNNING, READY):
+            return _state["status"] == READY
+        _state["status"] = RUNNING
+        _state["steps"] = {}
+
+    status = READY
+    for path in settings.WARMUP_STEPS:
+        started = time.perf_counter()
+        try:
+            import_string(path)()
+        except Exception as e:
+            logger.exception(f"Warm-up step {path} failed")
+            _state["steps"][path] = {"error": str(e)}
+            status = FAILED
+            break
+        _state["steps"][path] = {"seconds": round(time.perf_counter() - started, 3)}
+    _state["status"] = status
+    return status == READY
+
+
+def _warm_up_in_background():
+    try:
+        warm_up()
+    finally:
+        # This thread's connections would never be reused.
+        connections.close_all()
+
+
+def start_warm_up():
+    """Warm up in the background unless it is running or already succeeded."""
+    if _state["status"] in (PENDING, FAILED):
+        threading.Thread(
+            target=_warm_up_in_background, name="warm-up", daemon=True
+        ).start()
+
+
+def is_ready() -> bool:
+    return _state["status"] == READY
+
+
+def get_state() -> dict:
+    return {"status": _state["status"], "steps": dict(_state["steps"])}
+
+
+def reset():
+    with _lock:
+        _state["status"] = PENDING
+        _state["steps"] = {}
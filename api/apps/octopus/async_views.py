@@ -0,0 +1,72 @@
+"""Async counterparts of the GSPPriceViewSet upstream proxy endpoints.
+
+Routed ahead of the viewset when ``settings.ASYNC_PROXY_VIEWS`` is on (ASGI
+mode). The aggregated prices for all 14 GSP groups are fetched concurrently.
+"""
+
+import asyncio
+from datetime import datetime
+
+from apps.core.async_views import check_throttles, json_response
+from apps.core.utils import clients
+
+from .serializers import GSPPriceSerializer
+from .viewsets import GSPPriceViewSet
+
+PRICE_DATE_FORMAT = "%Y-%m-%dT%H:%MZ"
+
+
+def _price_period(request):
+    try:
+        return (
+            datetime.strptime(request.GET["from_date"], PRICE_DATE_FORMAT),
+            datetime.strptime(request.GET["to_date"], PRICE_DATE_FORMAT),
+        )
+    except (KeyError, ValueError):
+        return None
+
+
+def _invalid_period():
+    return json_response(
+        {"error": "Invalid date format. Use ISO format (e.g., 2024-05-30T00:00Z)"},
+        status=400,
+    )
+
+
+async def _prices(service, gsp, from_date, to_date):
+    price_data = await service.get_gsp_price(gsp, from_date, to_date)
+    return GSPPriceSerializer(price_data.get("results", []), many=True).data
+
+
+async def prices(request):
+    throttled = await check_throttles(request)
+    if throttled:
+        return throttled
+    period = _price_period(request)
+    if period is None:
+        return _invalid_period()
+
+    gsp = request.GET.get("gsp", "1")
+    # Convert GSP to alphabetical format (GSP Group ID)
+    if gsp.isdigit():
+        gsp = GSPPriceViewSet.gsp_conversion_table.get(int(gsp), gsp)
+    return json_response(await _prices(clients.AsyncOctopusService(), gsp, *period))
+
+
+async def aggregated_prices(request):
+    throttled = await check_throttles(request)
+    if throttled:
+        return throttled
+    period = _price_period(request)
+    if period is None:
+        return _invalid_period()
+
+    service = clients.AsyncOctopusService()
+    groups = list(GSPPriceViewSet.gsp_conversion_table.items())
+    results = await asyncio.gather(
+        *(_prices(service, gsp, *period) for _, gsp in groups)
+    )
+    # JSON object keys are strings, as DRF's JSONRenderer would write them.
+    return json_response(
+        {str(number): prices for (number, _), prices in zip(groups, results)}
+    )
@@ -0,0 +1,63 @@
+import asyncio
+import json
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+from apps.core.utils.base_client import AsyncServiceMixin, httpx
+from apps.octopus import async_views
+from apps.octopus.viewsets import GSPPriceViewSet
+
+PRICES = {
+    "results": [
+        {
+            "value_exc_vat": 20.0,
+            "value_inc_vat": 21.0,
+            "valid_from": "2024-05-30T00:00:00Z",
+            "valid_to": "2024-05-30T00:30:00Z",
+        }
+    ]
+}
+PERIOD = {"from_date": "2024-05-30T00:00Z", "to_date": "2024-05-30T01:00Z"}
+
+
+class AsyncPriceViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.requested = []
+
+    def handler(self, request):
+        self.requested.append(request.url.path)
+        return httpx.Response(200, json=PRICES)
+
+    async def call(self, view, **params):
+        # Stand in for the shared client the mixin would open for this loop.
+        AsyncServiceMixin._clients[asyncio.get_running_loop()] = httpx.AsyncClient(
+            transport=httpx.MockTransport(self.handler)
+        )
+        return await view(RequestFactory().get("/", params))
+
+    async def test_prices_converts_gsp_number(self):
+        response = await self.call(async_views.prices, gsp="1", **PERIOD)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.requested), 1)
+        self.assertTrue(self.requested[0].endswith("-A/standard-unit-rates/"))
+        self.assertEqual(json.loads(response.content)[0]["value_inc_vat"], 21.0)
+
+    async def test_prices_invalid_date(self):
+        response = await self.call(async_views.prices, from_date="30-05-2024")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.requested, [])
+
+    async def test_aggregated_prices_keyed_by_gsp_number(self):
+        response = await self.call(async_views.aggregated_prices, **PERIOD)
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual(
+            list(data), [str(number) for number in GSPPriceViewSet.gsp_conversion_table]
+        )
+        self.assertEqual(data["1"][0]["value_exc_vat"], 20.0)
+        self.assertEqual(len(self.requested), len(GSPPriceViewSet.gsp_conversion_table))
+
+    async def test_aggregated_prices_invalid_date(self):
+        response = await self.call(async_views.aggregated_prices)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.requested, [])
@@ -1,6 +1,7 @@
+from django.urls import path
 from rest_framework.routers import SimpleRouter
 
-from . import viewsets
+from . import async_views, viewsets
 
 router = SimpleRouter()
 
@@ -14,3 +15,9 @@ router.register(
 )
 
 urlpatterns = router.urls
+
+# Served ahead of the router in ASGI mode, see settings.ASYNC_PROXY_VIEWS
+async_urlpatterns = [
+    path("grid-supply-point-price/", async_views.prices),
+    path("grid-supply-point-price/aggregated-prices/", async_views.aggregated_prices),
+]
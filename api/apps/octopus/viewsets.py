@@ -1,13 +1,14 @@
 from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from apps.core.utils.api_clients import OctopusService
+from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
+from apps.core import columnar
+from apps.core.renderers import TIME_SERIES_RENDERERS
+from apps.core.utils import clients
+from apps.core.utils.datasets import QUARTERLY_PRICES, load_dataset
 from .serializers import GridSupplyPointSerializer, GSPPriceSerializer
 from datetime import datetime
 
-import os
-import json
-
 
 class GridSupplyPointViewSet(viewsets.ViewSet):
     """
@@ -15,7 +16,7 @@ class GridSupplyPointViewSet(viewsets.ViewSet):
     """
 
     def list(self, request):
-        service = OctopusService()
+        service = clients.OctopusService()
         gsp_data = service.get_grid_supply_points(format="json")
         serializer = GridSupplyPointSerializer(gsp_data.get("results", []), many=True)
         return Response(serializer.data)
@@ -23,7 +24,7 @@ class GridSupplyPointViewSet(viewsets.ViewSet):
     @action(detail=False, methods=["get"], url_path="by-postcode")
     def by_postcode(self, request):
         postcode = request.query_params.get("postcode", "SW1A1AA")
-        service = OctopusService()
+        service = clients.OctopusService()
         group_id = service.get_grid_supply_point_by_postcode(postcode=postcode)
         return Response({"group_id": group_id})
 
@@ -33,6 +34,14 @@ class GSPPriceViewSet(viewsets.ViewSet):
     ViewSet for GSP-specific energy prices.
     """
 
+    renderer_classes = [JSONRenderer, BrowsableAPIRenderer, *TIME_SERIES_RENDERERS]
+    columnar_schema = {
+        "value_exc_vat": columnar.FLOAT,
+        "value_inc_vat": columnar.FLOAT,
+        "valid_from": columnar.TIMESTAMP,
+        "valid_to": columnar.TIMESTAMP,
+    }
+
     gsp_conversion_table = {
         1: "A",
         2: "B",
@@ -76,7 +85,7 @@ class GSPPriceViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        service = OctopusService()
+        service = clients.OctopusService()
         print("Okay all good up to here")
         price_data = service.get_gsp_price(gsp, from_date, to_date)
         serializer = GSPPriceSerializer(price_data.get("results", []), many=True)
@@ -102,7 +111,7 @@ class GSPPriceViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        service = OctopusService()
+        service = clients.OctopusService()
 
         results = {}
         for gsp in self.gsp_conversion_table.values():
@@ -143,21 +152,12 @@ class GSPPriceViewSet(viewsets.ViewSet):
         end_date = datetime(year, end_month, 1)
 
         # Get data from api/data/octopus_prices
-        # get module path to avoid missing file error
-        module_path = os.path.dirname(__file__)
-        file_path = os.path.join(
-            module_path, "../../data/octopus_prices/energy_prices_gsp_quarters.json"
-        )
-        # Check if the file exists
-        print(file_path)
-        if not os.path.exists(file_path):
+        data = load_dataset(QUARTERLY_PRICES)
+        if data is None:
             return Response(
                 {"error": "Data file not found."},
                 status=status.HTTP_404_NOT_FOUND,
             )
-        # Load the data from the JSON file
-        with open(file_path, "r") as f:
-            data = json.load(f)
 
         # Filter the data for the specified quarter and year
         filtered_data = {}
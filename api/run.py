@@ -1,12 +1,38 @@
 #!/usr/bin/env python3
 """26/03/2025 - This file is used to run the server using Bjoern."""
 
-from bjoern import run
+import bjoern
 from api.wsgi import application
+import gc
 import os
 import sys
 
 
+def preload():
+    """Warm up before forking so workers share what was loaded."""
+    from django.db import connections
+    from apps.core import warmup
+
+    warmup.warm_up()
+    # Workers must open their own connections (and pools, whose threads
+    # don't survive the fork).
+    connections.close_all()
+    for connection in connections.all():
+        if getattr(connection, "pool", None) is not None:
+            connection.close_pool()
+    # Keep the collector from touching (and so copying) the preloaded objects.
+    gc.freeze()
+
+
+def run_worker():
+    """Warm up this worker's own connections, then serve."""
+    from apps.core import warmup
+
+    warmup.reset()
+    warmup.warm_up()
+    bjoern.run()
+
+
 def main():
     """Poetry's script configuration requires a function to call."""
     _, *args = sys.argv
@@ -18,11 +44,11 @@ def main():
         )
         exit(1)
 
-    print("Updating the database")
+    # Migrations are applied before the server starts by
+    # `manage.py bootstrap_db` (an init container in k8s).
     os.environ.setdefault("DJANGO_SETTINGS_MODULE", "api.settings")
-    from django.core.management import call_command
-
-    call_command("migrate", interactive=False)
+    from django.conf import settings
+    from api.prefork import PreforkServer, RecyclingApplication
 
     # TODO: Fix Read-only File System preventing static files being collected
     # call_command("collectstatic", verbosity=0, interactive=False)
@@ -31,7 +57,23 @@ def main():
     # Bjoern can't handle port numbers that aren't of integer type.
     if len(args) > 1:
         args[1] = int(args[1])
-    run(application, *args)
+
+    app = RecyclingApplication(
+        application,
+        max_requests=settings.WORKER_MAX_REQUESTS,
+        max_requests_jitter=settings.WORKER_MAX_REQUESTS_JITTER,
+        max_rss_growth_mb=settings.WORKER_MAX_RSS_GROWTH_MB,
+    )
+    if settings.WORKERS <= 1 and not app.enabled:
+        from apps.core import warmup
+
+        warmup.warm_up()
+        bjoern.run(application, *args)
+        return
+
+    preload()
+    bjoern.listen(app, *args)
+    PreforkServer(run_worker, settings.WORKERS).run()
 
 
 if __name__ == "__main__":
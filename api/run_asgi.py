@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""This file is used to run the server under ASGI using Uvicorn."""
+
+import os
+import sys
+
+import uvicorn
+
+
+def main():
+    """Same arguments as run.py: a unix socket path or an IP address and port."""
+    _, *args = sys.argv
+    print("Args:", *args)
+    if len(args) == 0:
+        print(
+            "You must specify a unix socket path (e.g. unix:/path/to/socket) or an IP address and port (e.g. 0.0.0.0 8000).",
+            file=sys.stderr,
+        )
+        exit(1)
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "api.settings")
+    # Routes the upstream proxy endpoints to their async views.
+    os.environ.setdefault("APP_ASGI", "true")
+
+    # Migrations are applied before the server starts by
+    # `manage.py bootstrap_db`.
+    print("Starting the server")
+    if args[0].startswith("unix:"):
+        bind = {"uds": args[0][len("unix:") :]}
+    else:
+        bind = {"host": args[0], "port": int(args[1]) if len(args) > 1 else 8000}
+    uvicorn.run(
+        "api.asgi:application",
+        lifespan="off",
+        workers=int(os.environ.get("APP_ASGI_WORKERS", "1")),
+        **bind,
+    )
+
+
+if __name__ == "__main__":
+    main()